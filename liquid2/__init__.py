@@ -34,6 +34,12 @@ from .ast import BlockNode
 from .ast import ConditionalBlockNode
 from .ast import Node
 from .context import RenderContext
+from .drop import Drop
+from .lazy import AsyncLazyValue
+from .lazy import LazyMapping
+from .lazy import LazyValue
+from .lazy import lazy
+from .lazy import lazy_async
 from .unescape import unescape
 from .environment import Environment
 from .lexer import tokenize
@@ -46,6 +52,8 @@ from .builtin import CachingFileSystemLoader
 from .builtin import FileSystemLoader
 from .builtin import PackageLoader
 from .builtin import CachingLoaderMixin
+from .builtin import CacheEvent
+from .builtin import CacheStats
 from .loader import TemplateSource
 from .undefined import StrictUndefined
 from .undefined import Undefined
@@ -57,7 +65,13 @@ from .messages import extract_from_template
 
 from .__about__ import __version__
 
-DEFAULT_ENVIRONMENT = Environment()
+
+class _DefaultEnvironment(Environment):
+    # `parse()` and `render()` are often called with the same source text.
+    parse_cache_size = 300
+
+
+DEFAULT_ENVIRONMENT: Environment = _DefaultEnvironment()
 
 
 def parse(
@@ -149,8 +163,11 @@ def extract_liquid(
 
 __all__ = (
     "__version__",
+    "AsyncLazyValue",
     "BlockCommentToken",
     "BlockNode",
+    "CacheEvent",
+    "CacheStats",
     "CachingChoiceLoader",
     "CachingDictLoader",
     "CachingFileSystemLoader",
@@ -161,6 +178,7 @@ __all__ = (
     "ContentToken",
     "DEFAULT_ENVIRONMENT",
     "DictLoader",
+    "Drop",
     "Environment",
     "Expression",
     "extract_liquid",
@@ -177,6 +195,10 @@ __all__ = (
     "is_tag_token",
     "is_template_string_token",
     "is_token_type",
+    "lazy",
+    "lazy_async",
+    "LazyMapping",
+    "LazyValue",
     "LinesToken",
     "Node",
     "OutputToken",
@@ -0,0 +1,79 @@
+"""Liquid command line interface.
+
+```
+python -m liquid2 precompile templates/ --pattern "sections/*.liquid"
+```
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from fnmatch import fnmatchcase
+from typing import Sequence
+
+from .builtin import FileSystemLoader
+from .environment import Environment
+
+
+def _precompile(args: argparse.Namespace) -> int:
+    env = Environment(loader=FileSystemLoader(args.path))
+    names = [
+        name for name in env.loader.list_templates() if fnmatchcase(name, args.pattern)
+    ]
+
+    start = time.perf_counter()
+    errors = env.warm(names, workers=args.workers)
+    elapsed = time.perf_counter() - start
+
+    for name, err in errors.items():
+        print(f"{name}: {err}", file=sys.stderr)  # noqa: T201
+
+    print(  # noqa: T201
+        f"parsed {len(names)} template{'' if len(names) == 1 else 's'} "
+        f"with {len(errors)} error{'' if len(errors) == 1 else 's'} "
+        f"in {elapsed:.3f}s"
+    )
+
+    return 1 if errors else 0
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Run the Liquid command line interface with arguments _argv_.
+
+    Returns:
+        The exit status, 0 on success or 1 if any templates failed to load.
+    """
+    parser = argparse.ArgumentParser(prog="liquid2")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    precompile = commands.add_parser(
+        "precompile",
+        help="Parse templates to find syntax errors before deployment.",
+        description="Parse all templates in one or more directories, in parallel, "
+        "and report any errors.",
+    )
+    precompile.add_argument(
+        "path", nargs="+", help="A directory to search for templates."
+    )
+    precompile.add_argument(
+        "--pattern",
+        default="*.liquid",
+        help="Only parse templates with names matching this glob pattern. "
+        "Defaults to '*.liquid'.",
+    )
+    precompile.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="The number of worker processes to use. Defaults to the number of CPUs.",
+    )
+    precompile.set_defaults(func=_precompile)
+
+    args = parser.parse_args(argv)
+    return args.func(args)  # type: ignore
+
+
+if __name__ == "__main__":
+    sys.exit(main())
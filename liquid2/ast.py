@@ -8,6 +8,7 @@ from dataclasses import dataclass
 from enum import Enum
 from enum import auto
 from typing import TYPE_CHECKING
+from typing import ClassVar
 from typing import Iterable
 from typing import TextIO
 
@@ -15,6 +16,8 @@ from liquid2.expression import Expression
 
 from .context import RenderContext
 from .exceptions import DisabledTagError
+from .exceptions import LiquidError
+from .expression_cache import anchor_error
 from .output import NullIO
 from .token import TagToken
 from .token import is_tag_token
@@ -32,6 +35,13 @@ class Node(ABC):
 
     __slots__ = ("token", "blank")
 
+    propagates_interrupts: ClassVar[bool] = False
+    """If True, indicates that this node renders its children using the same render
+    context, and stops rendering as soon as `RenderContext.interrupt` is set. `break`
+    and `continue` tags are only allowed to set `RenderContext.interrupt`, rather
+    than raising an exception, if every node between them and their loop propagates
+    interrupts."""
+
     def __init__(self, token: TokenT) -> None:
         self.token = token
 
@@ -47,13 +57,27 @@ class Node(ABC):
         """Write this node's content to _buffer_."""
         if context.disabled_tags:
             self.raise_for_disabled(context.disabled_tags)
-        return self.render_to_output(context, buffer)
+        try:
+            if context.profiler:
+                return context.profiler.render_node(self, context, buffer)
+            return self.render_to_output(context, buffer)
+        except LiquidError as err:
+            # Errors from shared expressions are positioned relative to their
+            # markup. See `liquid2.expression_cache`.
+            anchor_error(err, self.token)
+            raise
 
     async def render_async(self, context: RenderContext, buffer: TextIO) -> int:
         """Write this node's content to _buffer_."""
         if context.disabled_tags:
             self.raise_for_disabled(context.disabled_tags)
-        return await self.render_to_output_async(context, buffer)
+        try:
+            if context.profiler:
+                return await context.profiler.render_node_async(self, context, buffer)
+            return await self.render_to_output_async(context, buffer)
+        except LiquidError as err:
+            anchor_error(err, self.token)
+            raise
 
     @abstractmethod
     def render_to_output(self, context: RenderContext, buffer: TextIO) -> int:
@@ -140,6 +164,8 @@ class BlockNode(Node):
 
     __slots__ = ("nodes",)
 
+    propagates_interrupts = True
+
     def __init__(self, token: TokenT, nodes: list[Node]) -> None:
         super().__init__(token)
         self.nodes = nodes
@@ -154,8 +180,16 @@ class BlockNode(Node):
             buf = NullIO()
             for node in self.nodes:
                 node.render(context, buf)
+                if context.interrupt:
+                    break
             return 0
-        return sum(node.render(context, buffer) for node in self.nodes)
+
+        count = 0
+        for node in self.nodes:
+            count += node.render(context, buffer)
+            if context.interrupt:
+                break
+        return count
 
     async def render_to_output_async(
         self, context: RenderContext, buffer: TextIO
@@ -165,8 +199,16 @@ class BlockNode(Node):
             buf = NullIO()
             for node in self.nodes:
                 await node.render_async(context, buf)
+                if context.interrupt:
+                    break
             return 0
-        return sum([await node.render_async(context, buffer) for node in self.nodes])
+
+        count = 0
+        for node in self.nodes:
+            count += await node.render_async(context, buffer)
+            if context.interrupt:
+                break
+        return count
 
     def children(
         self,
@@ -183,6 +225,8 @@ class ConditionalBlockNode(Node):
 
     __slots__ = ("block", "expression")
 
+    propagates_interrupts = True
+
     def __init__(
         self,
         token: TokenT,
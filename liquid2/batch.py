@@ -0,0 +1,145 @@
+"""Render one template with many data sets, optionally using a process pool."""
+
+from __future__ import annotations
+
+import os
+import pickle
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import Future
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from itertools import islice
+from typing import TYPE_CHECKING
+from typing import Iterable
+from typing import Iterator
+from typing import Mapping
+from typing import NamedTuple
+
+from .exceptions import LiquidError
+
+if TYPE_CHECKING:
+    from .template import Template
+
+
+class RenderResult(NamedTuple):
+    """The result of rendering one item from a batch.
+
+    Exactly one of `output` and `error` will be `None`.
+    """
+
+    position: int
+    """The position of the input data in the batch, starting from zero."""
+
+    output: str | None
+    """The rendered template, or `None` if rendering failed."""
+
+    error: Exception | None
+    """The exception raised while rendering this item, or `None` on success."""
+
+
+# The template each worker process renders. Set once by `_init_worker`.
+_worker_template: Template | None = None
+
+
+def _init_worker(template: Template) -> None:
+    global _worker_template  # noqa: PLW0603
+    _worker_template = template
+
+
+def _render_chunk(start: int, chunk: list[Mapping[str, object]]) -> list[RenderResult]:
+    assert _worker_template is not None
+    results = _render_items(_worker_template, start, chunk)
+
+    # Results are pickled on their way back to the parent process. Replace any
+    # error that can't be pickled with a plain `LiquidError` using the same
+    # message, so one bad item doesn't fail its whole chunk.
+    for i, result in enumerate(results):
+        if result.error is not None:
+            try:
+                pickle.dumps(result.error)
+            except Exception:  # noqa: BLE001
+                error = LiquidError(
+                    f"{result.error.__class__.__name__}: {result.error}", token=None
+                )
+                results[i] = result._replace(error=error)
+
+    return results
+
+
+def _render_items(
+    template: Template, start: int, items: Iterable[Mapping[str, object]]
+) -> list[RenderResult]:
+    results: list[RenderResult] = []
+    for position, data in enumerate(items, start):
+        try:
+            results.append(RenderResult(position, template.render(data), None))
+        except Exception as err:  # noqa: BLE001
+            results.append(RenderResult(position, None, err))
+    return results
+
+
+def _chunks(
+    data: Iterable[Mapping[str, object]], size: int
+) -> Iterator[tuple[int, list[Mapping[str, object]]]]:
+    it = iter(data)
+    start = 0
+    while chunk := list(islice(it, size)):
+        yield start, chunk
+        start += len(chunk)
+
+
+def render_many(
+    template: Template,
+    data: Iterable[Mapping[str, object]],
+    *,
+    workers: int | None = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+) -> Iterator[RenderResult]:
+    """Render _template_ once for each mapping in _data_.
+
+    See [Environment.render_many][liquid2.Environment.render_many].
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be greater than zero")
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    if workers < 2:  # noqa: PLR2004
+        for start, chunk in _chunks(data, chunksize):
+            yield from _render_items(template, start, chunk)
+        return
+
+    # Limit the number of chunks in flight so we don't consume all of _data_ up
+    # front or buffer an unbounded number of results.
+    max_pending = workers * 2
+    chunks = _chunks(data, chunksize)
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(template,)
+    ) as executor:
+        if ordered:
+            queue: deque[Future[list[RenderResult]]] = deque(
+                executor.submit(_render_chunk, start, chunk)
+                for start, chunk in islice(chunks, max_pending)
+            )
+
+            while queue:
+                results = queue.popleft().result()
+                for start, chunk in islice(chunks, 1):
+                    queue.append(executor.submit(_render_chunk, start, chunk))
+                yield from results
+        else:
+            pending = {
+                executor.submit(_render_chunk, start, chunk)
+                for start, chunk in islice(chunks, max_pending)
+            }
+
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for start, chunk in islice(chunks, len(done)):
+                    pending.add(executor.submit(_render_chunk, start, chunk))
+                for future in done:
+                    yield from future.result()
@@ -9,6 +9,7 @@ from .comment import Comment
 from .content import Content
 from .expressions import Blank
 from .expressions import BooleanExpression
+from .expressions import ConstantExpression
 from .expressions import Continue
 from .expressions import Empty
 from .expressions import EqExpression
@@ -117,6 +118,8 @@ from .loaders.choice_loader import ChoiceLoader
 from .loaders.dict_loader import CachingDictLoader
 from .loaders.dict_loader import DictLoader
 from .loaders.file_system_loader import FileSystemLoader
+from .loaders.mixins import CacheEvent
+from .loaders.mixins import CacheStats
 from .loaders.mixins import CachingLoaderMixin
 from .loaders.package_loader import PackageLoader
 from .output import Output
@@ -167,6 +170,7 @@ __all__ = (
     "ceil",
     "ChoiceLoader",
     "Comment",
+    "ConstantExpression",
     "Content",
     "Continue",
     "ContinueTag",
@@ -244,6 +248,8 @@ __all__ = (
     "Parameter",
     "WithTag",
     "JSON",
+    "CacheEvent",
+    "CacheStats",
     "CachingLoaderMixin",
     "BaseTranslateFilter",
 )
@@ -24,7 +24,7 @@ if TYPE_CHECKING:
 class ContentNode(Node):
     """The built-in implementation of the text content node."""
 
-    __slots__ = ("text", "left_trim", "right_trim")
+    __slots__ = ("text", "left_trim", "right_trim", "trimmed")
 
     def __init__(
         self,
@@ -33,6 +33,7 @@ class ContentNode(Node):
         *,
         left_trim: WhitespaceControl,
         right_trim: WhitespaceControl,
+        trimmed: str | None = None,
     ) -> None:
         super().__init__(token)
         self.text = text
@@ -40,15 +41,19 @@ class ContentNode(Node):
         self.right_trim = right_trim
         self.blank = not text or text.isspace()
 
+        self.trimmed = trimmed
+        """_text_ after applying whitespace control, or `None` if it is to be
+        computed the first time this node is rendered."""
+
     def __str__(self) -> str:
+        # NOTE: We keep untrimmed text for the benefit of template serialization.
         return self.text
 
     def render_to_output(self, context: RenderContext, buffer: TextIO) -> int:
         """Render the node to the output buffer."""
-        # NOTE: Trimming at render time for the benefit of template serialization.
-        return buffer.write(
-            context.env.trim(self.text, self.left_trim, self.right_trim)
-        )
+        if self.trimmed is None:
+            self.trimmed = context.env.trim(self.text, self.left_trim, self.right_trim)
+        return buffer.write(self.trimmed)
 
 
 class Content(Tag):
@@ -80,4 +85,5 @@ class Content(Tag):
             token.text,
             left_trim=left_trim,
             right_trim=right_trim,
+            trimmed=self.env.trim(token.text, left_trim, right_trim),
         )
@@ -8,6 +8,7 @@ from decimal import Decimal
 from itertools import islice
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import Callable
 from typing import Collection
 from typing import Generic
 from typing import Iterable
@@ -32,18 +33,19 @@ from liquid2 import is_path_token
 from liquid2 import is_range_token
 from liquid2 import is_template_string_token
 from liquid2 import is_token_type
+from liquid2.exceptions import ExpressionDepthLimitError
 from liquid2.exceptions import LiquidSyntaxError
 from liquid2.exceptions import LiquidTypeError
 from liquid2.exceptions import UnknownFilterError
 from liquid2.expression import Expression
 from liquid2.limits import to_int
+from liquid2.undefined import Undefined
 from liquid2.unescape import unescape
 
 if TYPE_CHECKING:
     from liquid2 import Environment
     from liquid2 import OutputToken
     from liquid2 import PathT
-    from liquid2 import RenderContext
     from liquid2 import TokenT
 
 
@@ -249,6 +251,67 @@ class FloatLiteral(Literal[float]):
         return hash(self.value)
 
 
+class ConstantExpression(Literal[object]):
+    """An expression that was evaluated once, when its template was parsed.
+
+    The original _expression_ is kept for the benefit of template serialization and
+    static analysis, and is evaluated instead of using _value_ if any of _filters_,
+    the `(name, callable)` pairs called to get _value_, would not be called now.
+    """
+
+    __slots__ = ("expression", "filters")
+
+    def __init__(
+        self,
+        expression: Expression,
+        value: object,
+        filters: tuple[tuple[str, Callable[..., object]], ...] = (),
+    ) -> None:
+        super().__init__(expression.token, value)
+        self.expression = expression
+        self.filters = filters
+
+    def evaluate(self, context: RenderContext) -> object:
+        if self.filters and not filters_unchanged(self.filters, context):
+            return self.expression.evaluate(context)
+        return self.value
+
+    async def evaluate_async(self, context: RenderContext) -> object:
+        if self.filters and not filters_unchanged(self.filters, context):
+            return await self.expression.evaluate_async(context)
+        return self.value
+
+    def __str__(self) -> str:
+        return str(self.expression)
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, ConstantExpression)
+            and self.expression == other.expression
+        )
+
+    def __hash__(self) -> int:
+        return hash(self.expression)
+
+    def children(self) -> list[Expression]:
+        return [self.expression]
+
+
+def filters_unchanged(
+    filters: Iterable[tuple[str, Callable[..., object]]], context: RenderContext
+) -> bool:
+    """Return `True` if _context_ would call the same filters as _filters_.
+
+    _filters_ are `(name, callable)` pairs, as registered in `Environment.filters`
+    when an expression was evaluated ahead of time. Render contexts that override
+    `RenderContext.filter()` might wrap or deny any filter, so are never the same.
+    """
+    if type(context).filter is not RenderContext.filter:
+        return False
+    registered = context.env.filters
+    return all(registered.get(name) is func for name, func in filters)
+
+
 class RangeLiteral(Expression):
     __slots__ = ("start", "stop")
 
@@ -503,7 +566,7 @@ Segments: TypeAlias = tuple[Union[str, int, "Segments"], ...]
 
 
 class Path(Expression):
-    __slots__ = ("path",)
+    __slots__ = ("path", "static_path", "undefined_cache")
 
     def __init__(self, token: TokenT, path: PathT) -> None:
         super().__init__(token=token)
@@ -516,6 +579,19 @@ class Path(Expression):
             else:
                 self.path.append(segment)
 
+        self.static_path: tuple[int | str, ...] | None = (
+            None
+            if any(isinstance(segment, Path) for segment in self.path)
+            else tuple(self.path)  # type: ignore
+        )
+        """This path's segments as a tuple, or `None` if the path contains nested
+        paths that must be evaluated first."""
+
+        self.undefined_cache: dict[int, Undefined] | None = (
+            None if self.static_path is None else {}
+        )
+        """Default undefined instances shared between renders of this path."""
+
     def __str__(self) -> str:
         it = iter(self.path)
         buf = [str(next(it))]
@@ -541,12 +617,24 @@ class Path(Expression):
         return super().__sizeof__() + sys.getsizeof(self.path)
 
     def evaluate(self, context: RenderContext) -> object:
+        if self.static_path is not None:
+            return context.get(
+                self.static_path,
+                token=self.token,
+                undefined_cache=self.undefined_cache,
+            )
         return context.get(
             [p.evaluate(context) if isinstance(p, Path) else p for p in self.path],
             token=self.token,
         )
 
     async def evaluate_async(self, context: RenderContext) -> object:
+        if self.static_path is not None:
+            return await context.get_async(
+                self.static_path,
+                token=self.token,
+                undefined_cache=self.undefined_cache,
+            )
         return await context.get_async(
             [
                 await p.evaluate_async(context) if isinstance(p, Path) else p
@@ -808,7 +896,15 @@ class TernaryFilteredExpression(Expression):
 
 
 class Filter:
-    __slots__ = ("name", "args", "token")
+    __slots__ = (
+        "name",
+        "args",
+        "token",
+        "_func",
+        "_with_context",
+        "_with_environment",
+        "_literal_args",
+    )
 
     def __init__(
         self,
@@ -821,6 +917,13 @@ class Filter:
         self.name = name
         self.args = arguments
 
+        # The filter callable, how to call it and its pre-evaluated arguments are
+        # all set the first time this filter is evaluated. See `_bind()`.
+        self._func: Callable[..., object] | None = None
+        self._with_context = False
+        self._with_environment = False
+        self._literal_args: tuple[tuple[object, ...], dict[str, object]] | None = None
+
         if env.validate_filter_arguments:
             self.validate_filter_arguments(env)
 
@@ -829,6 +932,20 @@ class Filter:
             return f"{self.name}: {''.join(str(arg) for arg in self.args)}"
         return self.name
 
+    def __getstate__(
+        self,
+    ) -> tuple[str, list[KeywordArgument | PositionalArgument], TokenT]:
+        return (self.name, self.args, self.token)
+
+    def __setstate__(
+        self, state: tuple[str, list[KeywordArgument | PositionalArgument], TokenT]
+    ) -> None:
+        self.name, self.args, self.token = state
+        self._func = None
+        self._with_context = False
+        self._with_environment = False
+        self._literal_args = None
+
     def validate_filter_arguments(self, env: Environment) -> None:
         try:
             func = env.filters[self.name]
@@ -840,29 +957,143 @@ class Filter:
         if hasattr(func, "validate"):
             func.validate(env, self.token, self.name, self.args)
 
-    def evaluate(self, left: object, context: RenderContext) -> object:
-        func = context.filter(self.name, token=self.token)
-        positional_args, keyword_args = self.evaluate_args(context)
+    def _bind(self, context: RenderContext) -> Callable[..., object]:
+        """Resolve and classify this filter's callable.
+
+        This is called the first time the filter is evaluated, and again if the
+        environment's filter register maps our name to a different callable.
+        """
         try:
-            return func(left, *positional_args, **keyword_args)
-        except TypeError as err:
-            raise LiquidTypeError(str(err), token=self.token) from err
-        except LiquidTypeError as err:
-            err.token = self.token
-            raise err
+            func = context.env.filters[self.name]
+        except KeyError as err:
+            raise UnknownFilterError(
+                f"unknown filter '{self.name}'", token=self.token
+            ) from err
 
-    async def evaluate_async(self, left: object, context: RenderContext) -> object:
-        func = context.filter(self.name, token=self.token)
-        positional_args, keyword_args = await self.evaluate_args_async(context)
+        self._with_context = bool(getattr(func, "with_context", False))
+        self._with_environment = bool(getattr(func, "with_environment", False))
 
+        if self._literal_args is None and all(
+            isinstance(arg.value, (Literal, Null))
+            and not getattr(arg.value, "filters", None)
+            for arg in self.args
+        ):
+            positional_args, keyword_args = self.evaluate_args(context)
+            self._literal_args = (tuple(positional_args), keyword_args)
+
+        self._func = func
+        return func
+
+    def _call(
+        self,
+        func: Callable[..., object],
+        left: object,
+        args: Sequence[object],
+        kwargs: dict[str, object],
+        context: RenderContext,
+        *,
+        bound: bool = False,
+        sync: bool = True,
+    ) -> object:
         try:
-            return func(left, *positional_args, **keyword_args)
+            if bound:
+                # From `RenderContext.filter()`, with context and environment
+                # arguments already bound.
+                return func(left, *args, **kwargs)
+            if self._with_context:
+                if self._with_environment:
+                    return func(
+                        left, *args, context=context, environment=context.env, **kwargs
+                    )
+                return func(left, *args, context=context, **kwargs)
+            if self._with_environment:
+                return func(left, *args, environment=context.env, **kwargs)
+            return func(left, *args, **kwargs)
         except TypeError as err:
-            raise LiquidTypeError(f"{self.name}: {err}", token=self.token) from err
+            raise LiquidTypeError(
+                str(err) if sync else f"{self.name}: {err}", token=self.token
+            ) from err
         except LiquidTypeError as err:
             err.token = self.token
             raise err
 
+    def _profile_call(
+        self,
+        func: Callable[..., object],
+        left: object,
+        args: Sequence[object],
+        kwargs: dict[str, object],
+        context: RenderContext,
+        *,
+        bound: bool = False,
+        sync: bool = True,
+    ) -> object:
+        assert context.profiler
+        profiler = context.profiler
+        frame = profiler.enter(profiler.filter_record(self.name))
+        try:
+            return self._call(func, left, args, kwargs, context, bound=bound, sync=sync)
+        finally:
+            profiler.exit(frame)
+
+    def evaluate(self, left: object, context: RenderContext) -> object:
+        if type(context).filter is not RenderContext.filter:
+            # A render context that wraps, restricts or audits filters.
+            filter_func = context.filter(self.name, token=self.token)
+            positional_args, keyword_args = self.evaluate_args(context)
+            if context.profiler:
+                return self._profile_call(
+                    filter_func,
+                    left,
+                    positional_args,
+                    keyword_args,
+                    context,
+                    bound=True,
+                )
+            return self._call(
+                filter_func, left, positional_args, keyword_args, context, bound=True
+            )
+
+        func = self._func
+        if context.env.filters.get(self.name) is not func or func is None:
+            func = self._bind(context)
+        args, kwargs = self._literal_args or self.evaluate_args(context)
+        if context.profiler:
+            return self._profile_call(func, left, args, kwargs, context)
+        return self._call(func, left, args, kwargs, context)
+
+    async def evaluate_async(self, left: object, context: RenderContext) -> object:
+        if type(context).filter is not RenderContext.filter:
+            filter_func = context.filter(self.name, token=self.token)
+            positional_args, keyword_args = await self.evaluate_args_async(context)
+            if context.profiler:
+                return self._profile_call(
+                    filter_func,
+                    left,
+                    positional_args,
+                    keyword_args,
+                    context,
+                    bound=True,
+                    sync=False,
+                )
+            return self._call(
+                filter_func,
+                left,
+                positional_args,
+                keyword_args,
+                context,
+                bound=True,
+                sync=False,
+            )
+
+        func = self._func
+        if context.env.filters.get(self.name) is not func or func is None:
+            func = self._bind(context)
+        args, kwargs = self._literal_args or await self.evaluate_args_async(context)
+        if context.profiler:
+            return self._profile_call(func, left, args, kwargs, context, sync=False)
+        return self._call(func, left, args, kwargs, context, sync=False)
+
     def evaluate_args(
         self, context: RenderContext
     ) -> tuple[list[object], dict[str, object]]:
@@ -1079,10 +1310,10 @@ class BooleanExpression(Expression):
         return _str(self.expression, 0)
 
     def evaluate(self, context: RenderContext) -> object:
-        return is_truthy(self.expression.evaluate(context))
+        return _is_truthy(self.expression, context)
 
     async def evaluate_async(self, context: RenderContext) -> object:
-        return is_truthy(await self.expression.evaluate_async(context))
+        return await _is_truthy_async(self.expression, context)
 
     @staticmethod
     def parse(
@@ -1141,10 +1372,32 @@ BINARY_OPERATORS = frozenset(
 )
 
 
-def parse_boolean_primitive(  # noqa: PLR0912
+def parse_boolean_primitive(
     env: Environment, stream: TokenStream, precedence: int = PRECEDENCE_LOWEST
 ) -> Expression:
     """Parse a Boolean expression from tokens in _stream_."""
+    limit = env.expression_depth_limit
+    if limit is None:
+        return _parse_boolean_primitive(env, stream, precedence)
+
+    # Groups, `not` and the right hand side of infix operators recurse, so
+    # nesting depth is the depth of this function on the call stack.
+    state = env.parser.state
+    if state.expression_depth >= limit:
+        raise ExpressionDepthLimitError(
+            "expression depth limit reached", token=stream.current()
+        )
+
+    state.expression_depth += 1
+    try:
+        return _parse_boolean_primitive(env, stream, precedence)
+    finally:
+        state.expression_depth -= 1
+
+
+def _parse_boolean_primitive(  # noqa: PLR0912
+    env: Environment, stream: TokenStream, precedence: int
+) -> Expression:
     left: Expression
     token = stream.next()
 
@@ -1298,10 +1551,10 @@ class LogicalNotExpression(Expression):
         return f"not {self.expression}"
 
     def evaluate(self, context: RenderContext) -> object:
-        return not is_truthy(self.expression.evaluate(context))
+        return not _is_truthy(self.expression, context)
 
     async def evaluate_async(self, context: RenderContext) -> object:
-        return not is_truthy(await self.expression.evaluate_async(context))
+        return not await _is_truthy_async(self.expression, context)
 
     @staticmethod
     def parse(env: Environment, stream: TokenStream) -> Expression:
@@ -1324,13 +1577,11 @@ class LogicalAndExpression(Expression):
         return f"{self.left} and {self.right}"
 
     def evaluate(self, context: RenderContext) -> object:
-        return is_truthy(self.left.evaluate(context)) and is_truthy(
-            self.right.evaluate(context)
-        )
+        return _is_truthy(self.left, context) and _is_truthy(self.right, context)
 
     async def evaluate_async(self, context: RenderContext) -> object:
-        return is_truthy(await self.left.evaluate_async(context)) and is_truthy(
-            await self.right.evaluate_async(context)
+        return await _is_truthy_async(self.left, context) and await _is_truthy_async(
+            self.right, context
         )
 
     def children(self) -> list[Expression]:
@@ -1349,13 +1600,11 @@ class LogicalOrExpression(Expression):
         return f"{self.left} or {self.right}"
 
     def evaluate(self, context: RenderContext) -> object:
-        return is_truthy(self.left.evaluate(context)) or is_truthy(
-            self.right.evaluate(context)
-        )
+        return _is_truthy(self.left, context) or _is_truthy(self.right, context)
 
     async def evaluate_async(self, context: RenderContext) -> object:
-        return is_truthy(await self.left.evaluate_async(context)) or is_truthy(
-            await self.right.evaluate_async(context)
+        return await _is_truthy_async(self.left, context) or await _is_truthy_async(
+            self.right, context
         )
 
     def children(self) -> list[Expression]:
@@ -1856,6 +2105,13 @@ class Identifier(str):
     def __hash__(self) -> int:
         return super().__hash__()
 
+    def __reduce__(self) -> tuple[object, ...]:
+        return (_rebuild_identifier, (str(self), self.token))
+
+
+def _rebuild_identifier(value: str, token: TokenT) -> Identifier:
+    return Identifier(value, token=token)
+
 
 def parse_identifier(token: TokenT) -> Identifier:
     """Parse _token_ as an identifier."""
@@ -2027,6 +2283,39 @@ def is_truthy(obj: object) -> bool:
     return not (obj is False or obj is None)
 
 
+def _is_truthy(expression: Expression, context: RenderContext) -> bool:
+    """Evaluate _expression_ and return _True_ if the result is Liquid truthy.
+
+    Instances of the default `Undefined` type are always falsy, so there's no need
+    to construct one just to test it. We resolve simple paths with a default of
+    `None` instead.
+    """
+    if (
+        type(expression) is Path
+        and expression.static_path is not None
+        and context.env.undefined is Undefined
+    ):
+        return is_truthy(
+            context.get(expression.static_path, token=expression.token, default=None)
+        )
+    return is_truthy(expression.evaluate(context))
+
+
+async def _is_truthy_async(expression: Expression, context: RenderContext) -> bool:
+    """An async version of `_is_truthy()`."""
+    if (
+        type(expression) is Path
+        and expression.static_path is not None
+        and context.env.undefined is Undefined
+    ):
+        return is_truthy(
+            await context.get_async(
+                expression.static_path, token=expression.token, default=None
+            )
+        )
+    return is_truthy(await expression.evaluate_async(context))
+
+
 def _eq(left: object, right: object) -> bool:
     if hasattr(left, "__liquid__"):
         left = left.__liquid__()
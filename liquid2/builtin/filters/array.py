@@ -19,8 +19,10 @@ from markupsafe import Markup
 from liquid2.builtin import Null
 from liquid2.exceptions import LiquidTypeError
 from liquid2.filter import decimal_arg
+from liquid2.filter import pure
 from liquid2.filter import sequence_filter
 from liquid2.filter import with_environment
+from liquid2.lazy import resolve_lazy
 from liquid2.limits import to_int
 from liquid2.stringify import to_liquid_string
 from liquid2.undefined import is_undefined
@@ -55,13 +57,14 @@ def _getitem(sequence: Any, key: object, default: object = None) -> Any:
     in sequence.
     """
     try:
-        return getitem(sequence, key)
+        item = getitem(sequence, key)
     except (KeyError, IndexError):
         return default
     except TypeError:
         if not hasattr(sequence, "__getitem__"):
             raise
         return default
+    return resolve_lazy(item)
 
 
 def _lower(obj: Any) -> str:
@@ -72,6 +75,7 @@ def _lower(obj: Any) -> str:
         return ""
 
 
+@pure
 @with_environment
 @sequence_filter
 def join(
@@ -90,6 +94,7 @@ def join(
     return separator.join(to_liquid_string(item) for item in sequence)
 
 
+@pure
 def first(obj: Any) -> object:
     """Return the first item of collection _obj_."""
     if isinstance(obj, str):
@@ -104,6 +109,7 @@ def first(obj: Any) -> object:
         return None
 
 
+@pure
 def last(obj: Sequence[Any]) -> object:
     """Return the last item of array-like object _obj_."""
     if isinstance(obj, str):
@@ -115,6 +121,7 @@ def last(obj: Sequence[Any]) -> object:
         return None
 
 
+@pure
 @sequence_filter
 def concat(sequence: Sequence[object], other: Sequence[object]) -> list[object]:
     """Return the concatenation of _sequence_ and _second_array_."""
@@ -139,6 +146,7 @@ def map_(sequence: Sequence[object], key: object) -> list[object]:
         raise LiquidTypeError("can't map sequence", token=None) from err
 
 
+@pure
 @sequence_filter
 def reverse(array: Sequence[object]) -> list[object]:
     """Reverses the order of the items in an array."""
@@ -12,6 +12,7 @@ from liquid2.builtin import PositionalArgument
 from liquid2.builtin.expressions import is_truthy
 from liquid2.exceptions import LiquidTypeError
 from liquid2.filter import sequence_arg
+from liquid2.lazy import resolve_lazy
 from liquid2.undefined import is_undefined
 
 if TYPE_CHECKING:
@@ -29,7 +30,7 @@ def _getitem(sequence: Any, key: object, default: object = None) -> Any:
     behavior.
     """
     try:
-        return getitem(sequence, key)
+        item = getitem(sequence, key)
     except (KeyError, IndexError):
         return default
     except TypeError:
@@ -38,6 +39,7 @@ def _getitem(sequence: Any, key: object, default: object = None) -> Any:
         if isinstance(sequence, int) and isinstance(key, int):
             return sequence == key
         return default
+    return resolve_lazy(item)
 
 
 class FindFilter:
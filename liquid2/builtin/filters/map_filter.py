@@ -13,6 +13,7 @@ from liquid2.builtin import Path
 from liquid2.builtin import PositionalArgument
 from liquid2.exceptions import LiquidTypeError
 from liquid2.filter import sequence_arg
+from liquid2.lazy import resolve_lazy
 from liquid2.undefined import is_undefined
 
 if TYPE_CHECKING:
@@ -42,13 +43,14 @@ def _getitem(obj: Any, key: object, default: object = None) -> Any:
     in obj.
     """
     try:
-        return getitem(obj, key)
+        item = getitem(obj, key)
     except (KeyError, IndexError):
         return default
     except TypeError:
         if not hasattr(obj, "__getitem__"):
             raise
         return default
+    return resolve_lazy(item)
 
 
 class MapFilter:
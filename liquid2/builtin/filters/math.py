@@ -6,33 +6,39 @@ import math
 from liquid2.exceptions import LiquidTypeError
 from liquid2.filter import math_filter
 from liquid2.filter import num_arg
+from liquid2.filter import pure
 from liquid2.undefined import is_undefined
 
 
+@pure
 @math_filter
 def abs_(left: float | int) -> float | int:
     """Return the absolute value of number _num_."""
     return abs(left)
 
 
+@pure
 @math_filter
 def at_most(left: float | int, arg: float | int) -> float | int:
     """Return _val_ or _other_, whichever is smaller."""
     return min(left, num_arg(arg, default=0))
 
 
+@pure
 @math_filter
 def at_least(left: float | int, arg: float | int) -> float | int:
     """Return _val_ or _other_, whichever is greater."""
     return max(left, num_arg(arg, default=0))
 
 
+@pure
 @math_filter
 def ceil(left: float | int) -> float | int:
     """Return _num_ rounded up to the next integer."""
     return math.ceil(left)
 
 
+@pure
 @math_filter
 def divided_by(left: float | int, right: object) -> float | int:
     """Return the result of dividing _num_ by _other_.
@@ -49,12 +55,14 @@ def divided_by(left: float | int, right: object) -> float | int:
         raise LiquidTypeError(f"can't divide by {right}", token=None) from err
 
 
+@pure
 @math_filter
 def floor(left: float | int) -> float | int:
     """Return _num_ rounded down to the next integer."""
     return math.floor(left)
 
 
+@pure
 @math_filter
 def minus(left: float | int, right: float | int) -> float | int:
     """Return the result of subtracting _other_ from _num_."""
@@ -65,6 +73,7 @@ def minus(left: float | int, right: float | int) -> float | int:
     return float(decimal.Decimal(str(left)) - decimal.Decimal(str(right)))
 
 
+@pure
 @math_filter
 def plus(left: float | int, right: float | int) -> float | int:
     """Return the result of adding _other_ to _num_."""
@@ -75,6 +84,7 @@ def plus(left: float | int, right: float | int) -> float | int:
     return float(decimal.Decimal(str(left)) + decimal.Decimal(str(right)))
 
 
+@pure
 @math_filter
 def round_(left: float | int, digits: int | None = None) -> float | int:
     """Returns the result of rounding _num_ to _digits_ decimal digits."""
@@ -98,6 +108,7 @@ def round_(left: float | int, digits: int | None = None) -> float | int:
     return round(left, _digits)
 
 
+@pure
 @math_filter
 def times(left: float | int, right: float | int) -> float | int:
     """Return the result of multiplying _num_ by _other_."""
@@ -108,6 +119,7 @@ def times(left: float | int, right: float | int) -> float | int:
     return float(decimal.Decimal(str(left)) * decimal.Decimal(str(right)))
 
 
+@pure
 @math_filter
 def modulo(left: float | int, right: float | int) -> float | int:
     """Return the remainder of dividing _num_ by _other_."""
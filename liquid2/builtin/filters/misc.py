@@ -16,13 +16,17 @@ from markupsafe import Markup
 from liquid2.builtin import is_empty
 from liquid2.exceptions import LiquidTypeError
 from liquid2.filter import int_arg
+from liquid2.filter import pure
 from liquid2.filter import with_environment
+from liquid2.lazy import LazyMapping
+from liquid2.lazy import LazyValue
 from liquid2.undefined import is_undefined
 
 if TYPE_CHECKING:
     from liquid2 import Environment
 
 
+@pure
 def size(obj: Any) -> int:
     """Return the length of _obj_.
 
@@ -34,6 +38,7 @@ def size(obj: Any) -> int:
         return 0
 
 
+@pure
 def default(obj: Any, default_: object = "", *, allow_false: bool = False) -> Any:
     """Return _obj_, or _default_ if _obj_ is nil, false, or empty."""
     _obj = obj
@@ -137,6 +142,18 @@ class JSON:
         """Apply this filter to _left_ and return the result."""
         indent = int_arg(indent) if indent else None
         try:
-            return json.dumps(left, default=self.default, indent=indent)
+            return json.dumps(left, default=self._default, indent=indent)
         except TypeError as err:
             raise LiquidTypeError(str(err), token=None) from err
+
+    def _default(self, obj: object) -> object:
+        # Lazy values are computed and lazy mappings are serialized as objects.
+        if isinstance(obj, LazyValue):
+            return obj.resolve()
+        if isinstance(obj, LazyMapping):
+            return dict(obj)
+        if self.default:
+            return self.default(obj)
+        raise TypeError(
+            f"Object of type {obj.__class__.__name__} is not JSON serializable"
+        )
@@ -16,6 +16,7 @@ from liquid2.builtin import Path
 from liquid2.builtin import PositionalArgument
 from liquid2.exceptions import LiquidTypeError
 from liquid2.filter import sequence_arg
+from liquid2.lazy import resolve_lazy
 from liquid2.limits import to_int
 from liquid2.undefined import is_undefined
 
@@ -36,13 +37,14 @@ def _getitem(obj: Any, key: object, default: object = None) -> Any:
     in obj.
     """
     try:
-        return getitem(obj, key)
+        item = getitem(obj, key)
     except (KeyError, IndexError):
         return default
     except TypeError:
         if not hasattr(obj, "__getitem__"):
             raise
         return default
+    return resolve_lazy(item)
 
 
 def _lower(obj: Any) -> str:
@@ -166,9 +168,10 @@ class SortNumericFilter(SortFilter):
 def _get_numeric_item(sequence: Any, key: object, default: object = None) -> Any:
     """Item getter for the `sort_numeric` filter."""
     try:
-        return getitem(sequence, key)
+        item = getitem(sequence, key)
     except (KeyError, IndexError, TypeError):
         return default
+    return resolve_lazy(item)
 
 
 def _ints(obj: object) -> tuple[int | float | Decimal, ...]:
@@ -13,6 +13,7 @@ from markupsafe import Markup
 from markupsafe import escape as markupsafe_escape
 
 from liquid2.exceptions import LiquidTypeError
+from liquid2.filter import pure
 from liquid2.filter import string_filter
 from liquid2.filter import with_environment
 from liquid2.limits import to_int
@@ -25,6 +26,7 @@ if TYPE_CHECKING:
     from liquid2 import Environment
 
 
+@pure
 @string_filter
 def append(val: str, arg: object) -> str:
     """Return a copy of _val_ concatenated with _arg_.
@@ -36,18 +38,21 @@ def append(val: str, arg: object) -> str:
     return val + arg
 
 
+@pure
 @string_filter
 def capitalize(val: str) -> str:
     """Return _val_ with the first character in uppercase and the rest lowercase."""
     return val.capitalize()
 
 
+@pure
 @string_filter
 def downcase(val: str) -> str:
     """Return a copy of _val_ with all characters converted to lowercase."""
     return val.lower()
 
 
+@pure
 @with_environment
 @string_filter
 def escape(val: str, *, environment: Environment) -> str:
@@ -57,6 +62,7 @@ def escape(val: str, *, environment: Environment) -> str:
     return html.escape(val)
 
 
+@pure
 @with_environment
 @string_filter
 def escape_once(val: str, *, environment: Environment) -> str:
@@ -70,6 +76,7 @@ def escape_once(val: str, *, environment: Environment) -> str:
     return html.escape(html.unescape(val))
 
 
+@pure
 @string_filter
 def lstrip(val: str) -> str:
     """Return a copy of _val_ with leading whitespace removed."""
@@ -79,6 +86,7 @@ def lstrip(val: str) -> str:
 RE_LINETERM = re.compile(r"\r?\n")
 
 
+@pure
 @with_environment
 @string_filter
 def newline_to_br(val: str, *, environment: Environment) -> str:
@@ -89,24 +97,28 @@ def newline_to_br(val: str, *, environment: Environment) -> str:
     return RE_LINETERM.sub("<br />\n", val)
 
 
+@pure
 @string_filter
 def prepend(val: str, arg: str) -> str:
     """Return a copy of _arg_ concatenated with _val_."""
     return to_liquid_string(arg) + val
 
 
+@pure
 @string_filter
 def remove(val: str, arg: str) -> str:
     """Return a copy of _val_ with all occurrences of _arg_ removed."""
     return val.replace(to_liquid_string(arg), "")
 
 
+@pure
 @string_filter
 def remove_first(val: str, arg: str) -> str:
     """Return a copy of _val_ with the first occurrence of _arg_ removed."""
     return val.replace(to_liquid_string(arg), "", 1)
 
 
+@pure
 @string_filter
 def remove_last(val: str, arg: str) -> str:
     """Return a copy of _val_ with last occurrence of _arg_ removed."""
@@ -120,18 +132,21 @@ def remove_last(val: str, arg: str) -> str:
     return val
 
 
+@pure
 @string_filter
 def replace(val: str, seq: str, sub: str = "") -> str:
     """Return a copy of _val_ with each occurrence of _seq_ replaced with _sub_."""
     return val.replace(to_liquid_string(seq), to_liquid_string(sub))
 
 
+@pure
 @string_filter
 def replace_first(val: str, seq: str, sub: str = "") -> str:
     """Return a copy of _val_ with the first occurrence of _seq_ replaced with _sub_."""
     return val.replace(to_liquid_string(seq), to_liquid_string(sub), 1)
 
 
+@pure
 @string_filter
 def replace_last(val: str, seq: str, sub: str) -> str:
     """Return a copy of _val_ with the last occurrence of _seq_ replaced with _sub_."""
@@ -145,6 +160,7 @@ def replace_last(val: str, seq: str, sub: str) -> str:
     return val
 
 
+@pure
 @string_filter
 def upcase(val: str) -> str:
     """Return a copy of _val_ with all characters converted to uppercase."""
@@ -174,6 +190,7 @@ def _slice_arg(val: Any) -> int:
     return max(rv, MIN_SLICE_ARG)
 
 
+@pure
 def slice_(val: Any, start: Any, length: Any = 1) -> str | list[object]:
     """Return the subsequence of _val_ starting at _start_ with up to _length_ chars.
 
@@ -206,6 +223,7 @@ def slice_(val: Any, start: Any, length: Any = 1) -> str | list[object]:
     return list(val[_start:end])
 
 
+@pure
 @string_filter
 def split(val: str, sep: str) -> list[str]:
     """Split string _val_ on delimiter _sep_.
@@ -223,18 +241,21 @@ def split(val: str, sep: str) -> list[str]:
     return val.split(sep)
 
 
+@pure
 @string_filter
 def strip(val: str) -> str:
     """Return a copy of _val_ with leading and trailing whitespace removed."""
     return val.strip()
 
 
+@pure
 @string_filter
 def rstrip(val: str) -> str:
     """Return a copy of _val_ with trailing whitespace removed."""
     return val.rstrip()
 
 
+@pure
 @with_environment
 @string_filter
 def strip_html(val: str, *, environment: Environment) -> str:
@@ -245,6 +266,7 @@ def strip_html(val: str, *, environment: Environment) -> str:
     return stripped
 
 
+@pure
 @with_environment
 @string_filter
 def strip_newlines(val: str, *, environment: Environment) -> str:
@@ -255,6 +277,7 @@ def strip_newlines(val: str, *, environment: Environment) -> str:
     return RE_LINETERM.sub("", val)
 
 
+@pure
 @string_filter
 def truncate(val: str, num: Any = 50, end: str = "...") -> str:
     """Return a copy of _val_ truncated to _num_ characters."""
@@ -279,6 +302,7 @@ def truncate(val: str, num: Any = 50, end: str = "...") -> str:
 MAX_TRUNC_WORDS = (1 << 31) - 1
 
 
+@pure
 @string_filter
 def truncatewords(val: str, num: Any = 15, end: str = "...") -> str:
     """Return a copy of _val_ truncated to at most _num_ words."""
@@ -313,6 +337,7 @@ def truncatewords(val: str, num: Any = 15, end: str = "...") -> str:
     return " ".join(words[:num]) + end
 
 
+@pure
 @with_environment
 @string_filter
 def url_encode(val: str, *, environment: Environment) -> str:
@@ -322,6 +347,7 @@ def url_encode(val: str, *, environment: Environment) -> str:
     return urllib.parse.quote_plus(val)
 
 
+@pure
 @string_filter
 def url_decode(val: str) -> str:
     """Return a copy of _val_ after decoding percent-encoded sequences."""
@@ -329,6 +355,7 @@ def url_decode(val: str) -> str:
     return urllib.parse.unquote_plus(val)
 
 
+@pure
 @with_environment
 @string_filter
 def safe(val: str, *, environment: Environment) -> str:
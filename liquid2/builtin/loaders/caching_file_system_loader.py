@@ -11,6 +11,9 @@ from .mixins import CachingLoaderMixin
 
 if TYPE_CHECKING:
     from pathlib import Path
+    from typing import Callable
+
+    from .mixins import CacheEvent
 
 
 class CachingFileSystemLoader(CachingLoaderMixin, FileSystemLoader):
@@ -30,6 +33,8 @@ class CachingFileSystemLoader(CachingLoaderMixin, FileSystemLoader):
             arranged in folders named for each `uid` inside the search path.
         capacity: The maximum number of templates to hold in the cache before removing
             the least recently used template.
+        stats_callback: An optional function that is called with a `CacheEvent` for
+            every cache hit, miss, reload and eviction.
     """
 
     def __init__(
@@ -41,11 +46,13 @@ class CachingFileSystemLoader(CachingLoaderMixin, FileSystemLoader):
         auto_reload: bool = True,
         namespace_key: str = "",
         capacity: int = 300,
+        stats_callback: Callable[[CacheEvent], None] | None = None,
     ):
         super().__init__(
             auto_reload=auto_reload,
             namespace_key=namespace_key,
             capacity=capacity,
+            stats_callback=stats_callback,
         )
 
         FileSystemLoader.__init__(
@@ -11,9 +11,13 @@ from liquid2.loader import TemplateSource
 from .mixins import CachingLoaderMixin
 
 if TYPE_CHECKING:
+    from typing import Callable
+
     from liquid2 import Environment
     from liquid2 import RenderContext
 
+    from .mixins import CacheEvent
+
 
 class ChoiceLoader(BaseLoader):
     """A template loader that delegates to other template loaders.
@@ -62,6 +66,12 @@ class ChoiceLoader(BaseLoader):
 
         raise TemplateNotFoundError(template_name)
 
+    def list_templates(self) -> list[str]:
+        """Return the names of all templates found by any of this loader's loaders."""
+        return sorted(
+            {name for loader in self.loaders for name in loader.list_templates()}
+        )
+
 
 class CachingChoiceLoader(CachingLoaderMixin, ChoiceLoader):
     """A `ChoiceLoader` that caches parsed templates in memory.
@@ -74,6 +84,8 @@ class CachingChoiceLoader(CachingLoaderMixin, ChoiceLoader):
             argument that resolves to the current loader "namespace" or "scope".
         capacity: The maximum number of templates to hold in the cache before removing
             the least recently used template.
+        stats_callback: An optional function that is called with a `CacheEvent` for
+            every cache hit, miss, reload and eviction.
     """
 
     def __init__(
@@ -83,11 +95,13 @@ class CachingChoiceLoader(CachingLoaderMixin, ChoiceLoader):
         auto_reload: bool = True,
         namespace_key: str = "",
         capacity: int = 300,
+        stats_callback: Callable[[CacheEvent], None] | None = None,
     ):
         super().__init__(
             auto_reload=auto_reload,
             namespace_key=namespace_key,
             capacity=capacity,
+            stats_callback=stats_callback,
         )
 
         ChoiceLoader.__init__(self, loaders)
@@ -11,9 +11,13 @@ from liquid2.loader import TemplateSource
 from .mixins import CachingLoaderMixin
 
 if TYPE_CHECKING:
+    from typing import Callable
+
     from liquid2 import Environment
     from liquid2.context import RenderContext
 
+    from .mixins import CacheEvent
+
 
 class DictLoader(BaseLoader):
     """A loader that loads templates from a dictionary.
@@ -42,9 +46,25 @@ class DictLoader(BaseLoader):
 
         return TemplateSource(source, template_name, None)
 
+    def list_templates(self) -> list[str]:
+        """Return the names of all templates in this loader's dictionary."""
+        return sorted(self.templates)
+
 
 class CachingDictLoader(CachingLoaderMixin, DictLoader):
-    """A `DictLoader` that caches parsed templates in memory."""
+    """A `DictLoader` that caches parsed templates in memory.
+
+    Args:
+        templates: A dictionary mapping template names to template source strings.
+        auto_reload: If `True`, automatically reload a cached template if it has been
+            updated.
+        namespace_key: The name of a global render context variable or loader keyword
+            argument that resolves to the current loader "namespace" or "scope".
+        capacity: The maximum number of templates to hold in the cache before removing
+            the least recently used template.
+        stats_callback: An optional function that is called with a `CacheEvent` for
+            every cache hit, miss, reload and eviction.
+    """
 
     def __init__(
         self,
@@ -53,11 +73,13 @@ class CachingDictLoader(CachingLoaderMixin, DictLoader):
         auto_reload: bool = True,
         namespace_key: str = "",
         capacity: int = 300,
+        stats_callback: Callable[[CacheEvent], None] | None = None,
     ):
         super().__init__(
             auto_reload=auto_reload,
             namespace_key=namespace_key,
             capacity=capacity,
+            stats_callback=stats_callback,
         )
 
         DictLoader.__init__(self, templates)
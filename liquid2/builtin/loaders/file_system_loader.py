@@ -64,6 +64,21 @@ class FileSystemLoader(BaseLoader):
             return source_path
         raise TemplateNotFoundError(template_name)
 
+    def list_templates(self) -> list[str]:
+        """Return the names of all files in this loader's search path.
+
+        Names use forward slashes and include file extensions. If this loader has
+        a default extension, only files with that extension are listed.
+        """
+        names: set[str] = set()
+        for path in self.search_path:
+            names.update(
+                source_path.relative_to(path).as_posix()
+                for source_path in path.rglob(f"*{self.ext or ''}")
+                if source_path.is_file()
+            )
+        return sorted(names)
+
     def _read(self, source_path: Path) -> tuple[str, float]:
         with source_path.open(encoding=self.encoding) as fd:
             source = fd.read()
@@ -2,13 +2,23 @@
 
 from __future__ import annotations
 
+import math
+import time
 from abc import ABC
+from bisect import bisect_left
+from contextlib import AbstractContextManager
+from contextlib import nullcontext
 from contextlib import suppress
+from dataclasses import dataclass
+from dataclasses import field
 from functools import partial
+from threading import Lock
 from typing import TYPE_CHECKING
 from typing import Awaitable
 from typing import Callable
+from typing import Literal
 from typing import Mapping
+from typing import NamedTuple
 
 from typing_extensions import Protocol
 
@@ -47,11 +57,104 @@ class _CachingLoaderProtocol(Protocol):
     ) -> Template: ...
 
 
+CacheEventKind = Literal["hit", "miss", "reload", "eviction"]
+
+
+class CacheEvent(NamedTuple):
+    """A template cache lookup, load or eviction, as passed to a stats callback.
+
+    Attributes:
+        kind: One of `"hit"`, `"miss"`, `"reload"` or `"eviction"`. A reload is a
+            cache hit for a template that was found to be out of date.
+        key: The cache key of the template that was looked up. Eviction events
+            have the key of the template that caused the eviction.
+        load_time: Seconds spent loading and parsing the template for misses and
+            reloads, `0.0` otherwise.
+        source_bytes: The size of the template source text in bytes, UTF-8 encoded,
+            for misses and reloads, `0` otherwise.
+    """
+
+    kind: CacheEventKind
+    key: str
+    load_time: float = 0.0
+    source_bytes: int = 0
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Template cache statistics, as returned by `CachingLoaderMixin.cache_stats()`."""
+
+    hits: int = 0
+    """The number of templates served from the cache."""
+
+    misses: int = 0
+    """The number of templates that were not in the cache."""
+
+    reloads: int = 0
+    """The number of cached templates that were out of date and reloaded."""
+
+    evictions: int = 0
+    """The number of templates removed from the cache to make room for others."""
+
+    uptodate_checks: int = 0
+    """The number of times a cached template was checked for changes."""
+
+    source_bytes: int = 0
+    """Total size of template source text loaded and parsed, in bytes."""
+
+    load_time: float = 0.0
+    """Total seconds spent loading and parsing templates."""
+
+    load_time_histogram: dict[float, int] = field(default_factory=dict)
+    """A mapping of histogram bucket upper bounds, in seconds, to the number of
+    loads that took longer than the previous bound and no longer than this one. The
+    last bound is `math.inf`."""
+
+    size: int = 0
+    """The number of templates currently in the cache."""
+
+    capacity: int = 0
+    """The maximum number of templates the cache can hold."""
+
+    @property
+    def hit_rate(self) -> float:
+        """Hits as a proportion of all lookups, or `0.0` if there have been none."""
+        lookups = self.hits + self.misses + self.reloads
+        return self.hits / lookups if lookups else 0.0
+
+
 class CachingLoaderMixin(ABC, _CachingLoaderProtocol):
-    """A mixin class that adds caching to a template loader."""
+    """A mixin class that adds caching to a template loader.
+
+    Args:
+        auto_reload: If `True`, automatically reload a cached template if it has been
+            updated.
+        namespace_key: The name of a global render context variable or loader keyword
+            argument that resolves to the current loader "namespace" or "scope".
+        capacity: The maximum number of templates to hold in the cache before removing
+            the least recently used template.
+        thread_safe: If `True`, use a cache that can be shared between threads.
+        stats_callback: An optional function that is called with a `CacheEvent` for
+            every cache hit, miss, reload and eviction.
+    """
 
     caching_loader = True
 
+    load_time_buckets: tuple[float, ...] = (
+        0.001,
+        0.0025,
+        0.005,
+        0.01,
+        0.025,
+        0.05,
+        0.1,
+        0.25,
+        0.5,
+        1.0,
+    )
+    """Upper bounds, in seconds, of load time histogram buckets. A final bucket
+    of `math.inf` is implied."""
+
     def __init__(
         self,
         *,
@@ -59,14 +162,123 @@ class CachingLoaderMixin(ABC, _CachingLoaderProtocol):
         namespace_key: str = "",
         capacity: int = 300,
         thread_safe: bool = False,
+        stats_callback: Callable[[CacheEvent], None] | None = None,
     ):
         self.auto_reload = auto_reload
-        self.cache = (
-            ThreadSafeLRUCache[str, "Template"](capacity=capacity)
+        # NOTE: Subscripting generic cache classes at runtime would give each
+        # instance an `__orig_class__` that can't be pickled.
+        self.cache: LRUCache[str, Template] = (
+            ThreadSafeLRUCache(capacity=capacity)
             if thread_safe
-            else LRUCache[str, "Template"](capacity=capacity)
+            else LRUCache(capacity=capacity)
         )
         self.namespace_key = namespace_key
+        self.stats_callback = stats_callback
+        self._stats_lock: AbstractContextManager[object] = (
+            Lock() if thread_safe else nullcontext()
+        )
+        self._reset_counters()
+
+    def __getstate__(self) -> dict[str, object]:
+        # Locks can't be pickled. A new one is created when unpickling.
+        state = self.__dict__.copy()
+        state["_stats_lock"] = not isinstance(self._stats_lock, nullcontext)
+        return state
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._stats_lock = Lock() if state["_stats_lock"] else nullcontext()
+
+    def _reset_counters(self) -> None:
+        self._hits = 0
+        self._misses = 0
+        self._reloads = 0
+        self._uptodate_checks = 0
+        self._source_bytes = 0
+        self._load_time = 0.0
+        self._load_time_counts = [0] * (len(self.load_time_buckets) + 1)
+        self._evictions_offset = self.cache.evictions
+
+    def cache_stats(self) -> CacheStats:
+        """Return a snapshot of this loader's cache statistics."""
+        with self._stats_lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                reloads=self._reloads,
+                evictions=self.cache.evictions - self._evictions_offset,
+                uptodate_checks=self._uptodate_checks,
+                source_bytes=self._source_bytes,
+                load_time=self._load_time,
+                load_time_histogram=dict(
+                    zip(
+                        (*self.load_time_buckets, math.inf),
+                        self._load_time_counts,
+                        strict=True,
+                    )
+                ),
+                size=len(self.cache),
+                capacity=self.cache.capacity,
+            )
+
+    def reset_cache_stats(self) -> None:
+        """Set all cache statistics counters back to zero."""
+        with self._stats_lock:
+            self._reset_counters()
+
+    def cache_template(
+        self,
+        name: str,
+        template: Template,
+        *,
+        load_time: float = 0.0,
+        context: RenderContext | None = None,
+        **kwargs: object,
+    ) -> None:
+        """Add _template_ to the cache, as if it had been loaded with _name_.
+
+        This is used by `Environment.warm()` to store templates parsed in other
+        processes. _template_ is counted as a cache miss taking _load_time_
+        seconds.
+        """
+        self._store("miss", self.cache_key(name, context, kwargs), template, load_time)
+
+    def _hit(self, cache_key: str, *, checked: bool) -> None:
+        with self._stats_lock:
+            self._hits += 1
+            self._uptodate_checks += checked
+
+        if self.stats_callback:
+            self.stats_callback(CacheEvent("hit", cache_key))
+
+    def _store(
+        self,
+        kind: Literal["miss", "reload"],
+        cache_key: str,
+        template: Template,
+        load_time: float,
+    ) -> None:
+        source_bytes = _source_bytes(template)
+
+        with self._stats_lock:
+            if kind == "miss":
+                self._misses += 1
+            else:
+                self._reloads += 1
+                self._uptodate_checks += 1
+
+            self._source_bytes += source_bytes
+            self._load_time += load_time
+            self._load_time_counts[bisect_left(self.load_time_buckets, load_time)] += 1
+
+            evictions = self.cache.evictions
+            self.cache[cache_key] = template
+            evicted = self.cache.evictions > evictions
+
+        if self.stats_callback:
+            self.stats_callback(CacheEvent(kind, cache_key, load_time, source_bytes))
+            if evicted:
+                self.stats_callback(CacheEvent("eviction", cache_key))
 
     def _check_cache(
         self,
@@ -78,15 +290,19 @@ class CachingLoaderMixin(ABC, _CachingLoaderProtocol):
         try:
             cached_template = self.cache[cache_key]
         except KeyError:
+            start = time.perf_counter()
             template = load_func()
-            self.cache[cache_key] = template
+            self._store("miss", cache_key, template, time.perf_counter() - start)
             return template
 
         if self.auto_reload and not cached_template.is_up_to_date():
+            start = time.perf_counter()
             template = load_func()
-            self.cache[cache_key] = template
+            self._store("reload", cache_key, template, time.perf_counter() - start)
             return template
 
+        self._hit(cache_key, checked=self.auto_reload)
+
         if globals:
             cached_template.global_data = globals
         return cached_template
@@ -101,15 +317,19 @@ class CachingLoaderMixin(ABC, _CachingLoaderProtocol):
         try:
             cached_template = self.cache[cache_key]
         except KeyError:
+            start = time.perf_counter()
             template = await load_func()
-            self.cache[cache_key] = template
+            self._store("miss", cache_key, template, time.perf_counter() - start)
             return template
 
         if self.auto_reload and not await cached_template.is_up_to_date_async():
+            start = time.perf_counter()
             template = await load_func()
-            self.cache[cache_key] = template
+            self._store("reload", cache_key, template, time.perf_counter() - start)
             return template
 
+        self._hit(cache_key, checked=self.auto_reload)
+
         if globals:
             cached_template.global_data = globals
         return cached_template
@@ -150,12 +370,12 @@ class CachingLoaderMixin(ABC, _CachingLoaderProtocol):
         cache_key = self.cache_key(name, context, kwargs)
         return await self._check_cache_async(
             env,
-            name,
+            cache_key,
             globals,
             partial(
                 super().load_async,  # type: ignore
                 env,
-                cache_key,
+                name,
                 globals=globals,
                 context=context,
                 **kwargs,
@@ -182,3 +402,10 @@ class CachingLoaderMixin(ABC, _CachingLoaderProtocol):
             return f"{context.globals[self.namespace_key]}/{name}"
         except KeyError:
             return name
+
+
+def _source_bytes(template: Template) -> int:
+    # All of a template's tokens share its source text.
+    for node in template.nodes:
+        return len(node.token.source.encode())
+    return 0
@@ -8,6 +8,7 @@ from importlib.resources import files
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Iterable
+from typing import Iterator
 
 from liquid2.exceptions import TemplateNotFoundError
 from liquid2.loader import BaseLoader
@@ -70,6 +71,20 @@ class PackageLoader(BaseLoader):
 
         raise TemplateNotFoundError(template_name)
 
+    def list_templates(self) -> list[str]:
+        """Return the names of all files with this loader's default extension in
+        its package paths.
+
+        Names use forward slashes and include file extensions.
+        """  # noqa: D205
+        names: set[str] = set()
+        for path in self.paths:
+            if path.is_dir():
+                names.update(
+                    name for name in _list_files(path, "") if name.endswith(self.ext)
+                )
+        return sorted(names)
+
     def get_source(
         self,
         env: Environment,  # noqa: ARG002
@@ -114,3 +129,11 @@ class PackageLoader(BaseLoader):
             name=str(source_path),
             uptodate=None,
         )
+
+
+def _list_files(path: Traversable, prefix: str) -> Iterator[str]:
+    for child in path.iterdir():
+        if child.is_dir():
+            yield from _list_files(child, f"{prefix}{child.name}/")
+        elif child.is_file():
+            yield f"{prefix}{child.name}"
@@ -12,6 +12,7 @@ from liquid2 import Tag
 from liquid2 import TokenStream
 from liquid2.builtin import FilteredExpression
 from liquid2.exceptions import LiquidSyntaxError
+from liquid2.expression_cache import parse_expression
 from liquid2.stringify import to_liquid_string
 
 if TYPE_CHECKING:
@@ -74,5 +75,5 @@ class Output(Tag):
             raise LiquidSyntaxError("missing expression", token=token)
 
         return self.node_class(
-            token, FilteredExpression.parse(self.env, TokenStream(token.expression))
+            token, parse_expression(self.env, token, FilteredExpression.parse)
         )
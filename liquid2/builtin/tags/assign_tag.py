@@ -16,10 +16,13 @@ from liquid2.builtin import FilteredExpression
 from liquid2.builtin import Identifier
 from liquid2.builtin import parse_identifier
 from liquid2.exceptions import LiquidSyntaxError
+from liquid2.expression_cache import parse_expression
 
 if TYPE_CHECKING:
+    from liquid2 import Environment
     from liquid2 import RenderContext
     from liquid2 import TokenT
+    from liquid2.builtin import TernaryFilteredExpression
     from liquid2.expression import Expression
 
 
@@ -78,13 +81,14 @@ class AssignTag(Tag):
         if not token.expression:
             raise LiquidSyntaxError("missing expression", token=token)
 
-        expr_stream = TokenStream(token.expression)
-        name = parse_identifier(expr_stream.next())
-        expr_stream.expect(TokenType.ASSIGN)
-        expr_stream.next()
+        name, expression = parse_expression(self.env, token, _parse_assignment)
+        return self.node_class(token, name=name, expression=expression)
 
-        return self.node_class(
-            token,
-            name=name,
-            expression=FilteredExpression.parse(self.env, expr_stream),
-        )
+
+def _parse_assignment(
+    env: Environment, stream: TokenStream
+) -> tuple[Identifier, FilteredExpression | TernaryFilteredExpression]:
+    name = parse_identifier(stream.next())
+    stream.expect(TokenType.ASSIGN)
+    stream.next()
+    return name, FilteredExpression.parse(env, stream)
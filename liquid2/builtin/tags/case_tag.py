@@ -34,6 +34,8 @@ class CaseNode(Node):
         "end_tag_token",
     )
 
+    propagates_interrupts = True
+
     def __init__(
         self,
         token: TokenT,
@@ -78,6 +80,8 @@ class CaseNode(Node):
         count = 0
         for when in self.whens:
             count += when.render(context, buffer)
+            if context.interrupt:
+                return count
 
         if not count and self.default is not None:
             count += self.default.render(context, buffer)
@@ -91,6 +95,8 @@ class CaseNode(Node):
         count = 0
         for when in self.whens:
             count += await when.render_async(context, buffer)
+            if context.interrupt:
+                return count
 
         if not count and self.default is not None:
             count += await self.default.render_async(context, buffer)
@@ -239,6 +245,8 @@ class MultiExpressionBlockNode(Node):
 
     __slots__ = ("block", "expression")
 
+    propagates_interrupts = True
+
     def __init__(
         self,
         token: TokenT,
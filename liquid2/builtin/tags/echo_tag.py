@@ -12,6 +12,7 @@ from liquid2 import TagToken
 from liquid2 import TokenStream
 from liquid2.builtin import FilteredExpression
 from liquid2.exceptions import LiquidSyntaxError
+from liquid2.expression_cache import parse_expression
 from liquid2.stringify import to_liquid_string
 
 if TYPE_CHECKING:
@@ -73,8 +74,6 @@ class EchoTag(Tag):
         if not token.expression:
             raise LiquidSyntaxError("missing expression", token=token)
 
-        expr_stream = TokenStream(token.expression)
-        expr = FilteredExpression.parse(self.env, expr_stream)
-        expr_stream.expect_eos()
-
-        return self.node_class(token, expr)
+        return self.node_class(
+            token, parse_expression(self.env, token, FilteredExpression.parse)
+        )
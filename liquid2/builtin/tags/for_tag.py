@@ -12,24 +12,30 @@ from typing import TextIO
 from liquid2 import BlockNode
 from liquid2 import Expression
 from liquid2 import Node
+from liquid2 import RenderContext
 from liquid2 import Tag
 from liquid2 import TagToken
 from liquid2 import TokenStream
 from liquid2.builtin import Identifier
 from liquid2.builtin import LoopExpression
+from liquid2.context import Interrupt
 from liquid2.exceptions import BreakLoop
 from liquid2.exceptions import ContinueLoop
 from liquid2.exceptions import LiquidSyntaxError
+from liquid2.prefetch import batch_load
+from liquid2.prefetch import batch_load_async
+from liquid2.prefetch import loop_keys
+from liquid2.prefetch import peek_batchable
 
 if TYPE_CHECKING:
+    from liquid2 import Environment
     from liquid2 import TokenT
-    from liquid2.context import RenderContext
 
 
 class ForNode(Node):
     """The standard _for_ tag."""
 
-    __slots__ = ("expression", "block", "default", "end_tag_token")
+    __slots__ = ("expression", "block", "default", "end_tag_token", "_batch_keys")
 
     def __init__(
         self,
@@ -46,6 +52,10 @@ class ForNode(Node):
         self.end_tag_token = end_tag_token
         self.blank = block.blank and (not default or default.blank)
 
+        # Properties of the loop variable accessed by the loop body. Found the
+        # first time the loop is rendered. See `liquid2.prefetch`.
+        self._batch_keys: tuple[str, ...] | None = None
+
     def __str__(self) -> str:
         assert isinstance(self.token, TagToken)
         default = ""
@@ -73,6 +83,11 @@ class ForNode(Node):
             name = self.expression.identifier
             token = self.expression.token
 
+            if keys := self.batch_keys(context):
+                it, items = peek_batchable(it)
+                if items:
+                    batch_load(items, keys)
+
             forloop = ForLoop(
                 name=f"{name}-{self.expression.iterable}",
                 it=it,
@@ -97,6 +112,12 @@ class ForNode(Node):
                     except BreakLoop:
                         break
 
+                    if context.interrupt:
+                        interrupt = context.interrupt
+                        context.interrupt = None
+                        if interrupt is Interrupt.BREAK:
+                            break
+
             return character_count
 
         return self.default.render(context, buffer) if self.default else 0
@@ -112,6 +133,11 @@ class ForNode(Node):
             name = self.expression.identifier
             token = self.expression.token
 
+            if keys := self.batch_keys(context):
+                it, items = peek_batchable(it)
+                if items:
+                    await batch_load_async(items, keys)
+
             forloop = ForLoop(
                 name=f"{name}-{self.expression.iterable}",
                 it=it,
@@ -138,10 +164,24 @@ class ForNode(Node):
                     except BreakLoop:
                         break
 
+                    if context.interrupt:
+                        interrupt = context.interrupt
+                        context.interrupt = None
+                        if interrupt is Interrupt.BREAK:
+                            break
+
             return character_count
 
         return await self.default.render_async(context, buffer) if self.default else 0
 
+    def batch_keys(self, static_context: RenderContext) -> tuple[str, ...]:
+        """Return properties of the loop variable accessed by the loop body."""
+        if self._batch_keys is None:
+            self._batch_keys = loop_keys(
+                self.expression.identifier, [self.block], static_context
+            )
+        return self._batch_keys
+
     def children(
         self,
         static_context: RenderContext,  # noqa: ARG002
@@ -170,6 +210,12 @@ class ForTag(Tag):
     node_class = ForNode
     end_block = frozenset(["endfor", "else"])
 
+    def __init__(self, env: Environment):
+        super().__init__(env)
+        # Built the first time we parse a loop, then reused for every loop parsed by
+        # this environment.
+        self._static_context: RenderContext | None = None
+
     def parse(self, stream: TokenStream) -> Node:
         """Parse tokens from _stream_ into an AST node."""
         token = stream.next()
@@ -185,6 +231,7 @@ class ForTag(Tag):
         block_token = stream.current()
         assert block_token is not None
         block = BlockNode(block_token, parse_block(stream, end=self.end_block))
+        signal_interrupts(block, self._get_static_context())
 
         default: BlockNode | None = None
 
@@ -206,6 +253,12 @@ class ForTag(Tag):
             end_tag_token,
         )
 
+    def _get_static_context(self) -> RenderContext:
+        """Return a render context for walking nodes at parse time."""
+        if self._static_context is None:
+            self._static_context = RenderContext(self.env.template_class(self.env, []))
+        return self._static_context
+
 
 class ForLoop(Mapping[str, object]):
     """Loop helper variables."""
@@ -307,29 +360,68 @@ class ForLoop(Mapping[str, object]):
 class BreakNode(Node):
     """Parse tree node for the standard _break_ tag."""
 
-    __slots__ = ()
+    __slots__ = ("signal",)
+
+    def __init__(self, token: TokenT) -> None:
+        super().__init__(token)
+        self.signal = False
+        """If True, set `RenderContext.interrupt` instead of raising `BreakLoop`."""
 
     def __str__(self) -> str:
         assert isinstance(self.token, TagToken)
         return f"{{%{self.token.wc[0]} break {self.token.wc[1]}%}}"
 
-    def render_to_output(self, _context: RenderContext, _buffer: TextIO) -> int:
+    def render_to_output(self, context: RenderContext, _buffer: TextIO) -> int:
         """Render the node to the output buffer."""
+        if self.signal:
+            context.interrupt = Interrupt.BREAK
+            return 0
         raise BreakLoop("break")
 
 
 class ContinueNode(Node):
     """Parse tree node for the standard _continue_ tag."""
 
+    __slots__ = ("signal",)
+
+    def __init__(self, token: TokenT) -> None:
+        super().__init__(token)
+        self.signal = False
+        """If True, set `RenderContext.interrupt` instead of raising `ContinueLoop`."""
+
     def __str__(self) -> str:
         assert isinstance(self.token, TagToken)
         return f"{{%{self.token.wc[0]} continue {self.token.wc[1]}%}}"
 
-    def render_to_output(self, _context: RenderContext, _buffer: TextIO) -> int:
+    def render_to_output(self, context: RenderContext, _buffer: TextIO) -> int:
         """Render the node to the output buffer."""
+        if self.signal:
+            context.interrupt = Interrupt.CONTINUE
+            return 0
         raise ContinueLoop("continue")
 
 
+def signal_interrupts(block: BlockNode, static_context: RenderContext) -> None:
+    """Allow `break` and `continue` nodes in a loop's _block_ to signal the loop.
+
+    `break` and `continue` nodes found by descending through nodes that propagate
+    interrupts will set `RenderContext.interrupt` instead of raising an exception.
+    Any other node, including a nested loop, might not know about interrupts, so
+    `break` and `continue` nodes beneath it continue to raise `BreakLoop` and
+    `ContinueLoop`.
+
+    Loops using this must check and clear `RenderContext.interrupt` after rendering
+    _block_ for each iteration.
+    """
+    stack: list[Node] = [block]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (BreakNode, ContinueNode)):
+            node.signal = True
+        elif node.propagates_interrupts:
+            stack.extend(node.children(static_context, include_partials=False))
+
+
 class BreakTag(Tag):
     """The built-in "break" tag."""
 
@@ -15,6 +15,7 @@ from liquid2 import TagToken
 from liquid2 import TokenStream
 from liquid2.builtin import BooleanExpression
 from liquid2.exceptions import LiquidSyntaxError
+from liquid2.expression_cache import parse_expression as parse_shared_expression
 
 if TYPE_CHECKING:
     from liquid2 import RenderContext
@@ -26,6 +27,8 @@ class IfNode(Node):
 
     __slots__ = ("condition", "consequence", "alternatives", "default", "end_tag_token")
 
+    propagates_interrupts = True
+
     def __init__(
         self,
         token: TokenT,
@@ -133,7 +136,7 @@ class IfTag(Tag):
         if not token.expression:
             raise LiquidSyntaxError("missing expression", token=token)
 
-        condition = parse_expression(self.env, TokenStream(token.expression))
+        condition = parse_shared_expression(self.env, token, parse_expression)
 
         block_token = stream.current()
         assert block_token is not None
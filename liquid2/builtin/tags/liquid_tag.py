@@ -22,6 +22,8 @@ class LiquidNode(Node):
 
     __slots__ = ("block",)
 
+    propagates_interrupts = True
+
     def __init__(
         self,
         token: TokenT,
@@ -18,8 +18,6 @@ from liquid2.builtin import Identifier
 from liquid2.builtin import parse_parameters
 from liquid2.builtin import parse_positional_and_keyword_arguments
 from liquid2.builtin import parse_string_or_identifier
-from liquid2.undefined import Undefined
-from liquid2.undefined import is_undefined
 
 if TYPE_CHECKING:
     from liquid2 import RenderContext
@@ -129,7 +127,7 @@ class MacroTag(Tag):
 class CallNode(Node):
     """The built-in _call_ tag."""
 
-    __slots__ = ("name", "args", "kwargs")
+    __slots__ = ("name", "args", "kwargs", "_bound_args")
     disabled_tags = {"include", "block"}
 
     def __init__(
@@ -145,6 +143,10 @@ class CallNode(Node):
         self.kwargs = kwargs
         self.blank = False
 
+        # The most recently called macro's arguments and the result of binding this
+        # call's arguments to them. Macros are usually the same for every call.
+        self._bound_args: tuple[dict[str, Parameter], BoundArgs] | None = None
+
     def __str__(self) -> str:
         assert isinstance(self.token, TagToken)
         args = " " + ", ".join(
@@ -154,14 +156,12 @@ class CallNode(Node):
 
     def render_to_output(self, context: RenderContext, buffer: TextIO) -> int:
         """Render the node to the output buffer."""
-        macro: Macro | Undefined = context.tag_namespace["macros"].get(
-            self.name, context.env.undefined(self.name, token=self.token)
-        )
+        macro: Macro | None = context.tag_namespace["macros"].get(self.name)
 
-        if isinstance(macro, Undefined):
-            return buffer.write(str(macro))
+        if macro is None:
+            return buffer.write(str(context.env.undefined(self.name, token=self.token)))
 
-        args = self.macro_args(macro)
+        args = self._bind(macro)
 
         namespace: dict[str, object] = {
             "args": [expr.evaluate(context) for expr in args.excess_args],
@@ -192,15 +192,12 @@ class CallNode(Node):
         buffer: TextIO,
     ) -> int:
         """Render the node to the output buffer."""
-        macro: Macro | Undefined = context.tag_namespace["macros"].get(
-            self.name, context.env.undefined(self.name, token=self.token)
-        )
+        macro: Macro | None = context.tag_namespace["macros"].get(self.name)
 
-        if is_undefined(macro):
-            return buffer.write(str(macro))
+        if macro is None:
+            return buffer.write(str(context.env.undefined(self.name, token=self.token)))
 
-        assert isinstance(macro, Macro)
-        args = self.macro_args(macro)
+        args = self._bind(macro)
 
         namespace: dict[str, object] = {
             "args": [await expr.evaluate_async(context) for expr in args.excess_args],
@@ -225,6 +222,12 @@ class CallNode(Node):
 
         return await macro.block.render_async(macro_context, buffer)
 
+    def _bind(self, macro: Macro) -> BoundArgs:
+        bound = self._bound_args
+        if bound is None or bound[0] is not macro.args:
+            bound = self._bound_args = (macro.args, self.macro_args(macro))
+        return bound[1]
+
     def macro_args(self, macro: Macro) -> BoundArgs:
         """Bind this call's arguments to macro parameter names."""
         args: dict[str, Expression | None] = {
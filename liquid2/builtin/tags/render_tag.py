@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 from typing import TYPE_CHECKING
+from typing import Any
 from typing import Iterable
 from typing import Sequence
 from typing import TextIO
+from weakref import ref
 
 from liquid2 import Node
 from liquid2 import Tag
@@ -23,6 +25,9 @@ from liquid2.builtin import parse_primitive
 from liquid2.builtin import parse_string_or_identifier
 from liquid2.exceptions import LiquidSyntaxError
 from liquid2.exceptions import TemplateNotFoundError
+from liquid2.prefetch import batch_load
+from liquid2.prefetch import batch_load_async
+from liquid2.prefetch import loop_keys
 
 from .for_tag import ForLoop
 
@@ -31,12 +36,13 @@ if TYPE_CHECKING:
     from liquid2.builtin import KeywordArgument
     from liquid2.context import RenderContext
     from liquid2.expression import Expression
+    from liquid2.template import Template
 
 
 class RenderNode(Node):
     """The standard _render_ tag."""
 
-    __slots__ = ("name", "name", "loop", "var", "alias", "args")
+    __slots__ = ("name", "name", "loop", "var", "alias", "args", "_batch_keys")
 
     tag = "render"
     disabled = set(["include"])  # noqa: C405
@@ -59,6 +65,35 @@ class RenderNode(Node):
         self.args = args or []
         self.blank = False
 
+        # A weak reference to the last partial template rendered in a loop, the
+        # loop variable name and properties of the loop variable accessed by that
+        # template. See `liquid2.prefetch`.
+        self._batch_keys: tuple[ref[Template], str, tuple[str, ...]] | None = None
+
+    def __getstate__(self) -> tuple[Any, ...]:
+        # Weak references can't be pickled, and batch keys are cheap to find again.
+        return (
+            self.token,
+            self.blank,
+            self.name,
+            self.loop,
+            self.var,
+            self.alias,
+            self.args,
+        )
+
+    def __setstate__(self, state: tuple[Any, ...]) -> None:
+        (
+            self.token,
+            self.blank,
+            self.name,
+            self.loop,
+            self.var,
+            self.alias,
+            self.args,
+        ) = state
+        self._batch_keys = None
+
     def __str__(self) -> str:
         assert isinstance(self.token, TagToken)
         var = ""
@@ -108,6 +143,13 @@ class RenderNode(Node):
 
             if self.loop and isinstance(val, Sequence) and not isinstance(val, str):
                 context.raise_for_loop_limit(len(val))
+                if (
+                    val
+                    and hasattr(val[0], "__liquid_batch__")
+                    and (keys := self.batch_keys(template, key, context))
+                ):
+                    batch_load(val, keys)
+
                 forloop = ForLoop(
                     name=key,
                     it=iter(val),
@@ -170,6 +212,13 @@ class RenderNode(Node):
 
             if self.loop and isinstance(val, Sequence) and not isinstance(val, str):
                 context.raise_for_loop_limit(len(val))
+                if (
+                    val
+                    and hasattr(val[0], "__liquid_batch__")
+                    and (keys := self.batch_keys(template, key, context))
+                ):
+                    await batch_load_async(val, keys)
+
                 forloop = ForLoop(
                     name=key,
                     it=iter(val),
@@ -197,6 +246,21 @@ class RenderNode(Node):
 
         return character_count
 
+    def batch_keys(
+        self, template: Template, name: str, static_context: RenderContext
+    ) -> tuple[str, ...]:
+        """Return properties of loop variable _name_ accessed by _template_."""
+        # Partial templates are held weakly, so an evicted template, and its syntax
+        # tree, are not kept alive by every template that renders it.
+        if (
+            self._batch_keys is None
+            or self._batch_keys[0]() is not template
+            or self._batch_keys[1] != name
+        ):
+            keys = loop_keys(name, template.nodes, static_context)
+            self._batch_keys = (ref(template), name, keys)
+        return self._batch_keys[2]
+
     def children(
         self, static_context: RenderContext, *, include_partials: bool = True
     ) -> Iterable[Node]:
@@ -7,7 +7,10 @@ import itertools
 import re
 import sys
 from collections import defaultdict
+from collections import deque
 from contextlib import contextmanager
+from enum import Enum
+from enum import auto
 from functools import partial
 from functools import reduce
 from io import StringIO
@@ -15,6 +18,7 @@ from operator import mul
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
+from typing import ClassVar
 from typing import Iterator
 from typing import Mapping
 from typing import Sequence
@@ -27,16 +31,18 @@ from .exceptions import ContextDepthError
 from .exceptions import LocalNamespaceLimitError
 from .exceptions import LoopIterationLimitError
 from .exceptions import UnknownFilterError
+from .lazy import LazyValue
 from .output import LimitedStringIO
 from .undefined import UNDEFINED
+from .undefined import Undefined
 from .utils import ReadOnlyChainMap
 
 if TYPE_CHECKING:
     from liquid2 import TokenT
     from liquid2.builtin.tags.for_tag import ForLoop
 
+    from .profiler import RenderProfiler
     from .template import Template
-    from .undefined import Undefined
 
 
 class RenderContext:
@@ -57,8 +63,19 @@ class RenderContext:
         "env",
         "tag_namespace",
         "loops",
+        "interrupt",
+        "profiler",
     )
 
+    _plain_keys: ClassVar[frozenset[type]] = frozenset((str, int))
+    """Types of path segments that can be used to look up items directly, without
+    calling `get_item()`. Empty if a subclass overrides `get_item()`."""
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.get_item is not RenderContext.get_item:
+            cls._plain_keys = frozenset()
+
     def __init__(
         self,
         template: Template,
@@ -91,17 +108,57 @@ class RenderContext:
         self.auto_escape = self.env.auto_escape
 
         # A namespace supporting stateful tags. Such as `cycle`, `increment`,
-        # `decrement` and `ifchanged`.
-        self.tag_namespace: dict[str, Any] = {
-            "cycles": {},
-            "stopindex": {},
-            "extends": defaultdict(list),
-            "macros": {},
-        }
+        # `decrement` and `ifchanged`. Built-in tag namespaces are created on
+        # first use.
+        self.tag_namespace: dict[str, Any] = TagNamespace()
 
         # As stack of forloop objects. Used for populating forloop.parentloop.
         self.loops: list[ForLoop] = []
 
+        # Set by `break` and `continue` nodes that signal their enclosing loop
+        # without raising an exception. See `Interrupt`.
+        self.interrupt: Interrupt | None = None
+
+        # Records render timings, if profiling is enabled. See `liquid2.profiler`.
+        self.profiler: RenderProfiler | None = self.env.profiler
+
+    def reset(
+        self,
+        template: Template,
+        *,
+        global_data: Mapping[str, object] | None = None,
+        disabled_tags: set[str] | None = None,
+    ) -> None:
+        """Prepare this context for rendering _template_ with _global_data_.
+
+        State from any previous render is discarded. See
+        [RenderContextPool][liquid2.context.RenderContextPool].
+        """
+        self.template = template
+        self.globals = global_data or {}
+        self.disabled_tags = disabled_tags or set()
+        self.parent = None
+        self._copy_depth = 0
+        self.loop_iteration_carry = 1
+        self.local_namespace_carry = 0
+
+        self.locals.clear()
+        self.counters.clear()
+        self.tag_namespace.clear()
+        self.loops.clear()
+        self.interrupt = None
+
+        self.scope = ReadOnlyChainMap(
+            self.locals,
+            self.globals,
+            builtin,
+            self.counters,
+        )
+
+        self.env = template.env
+        self.auto_escape = self.env.auto_escape
+        self.profiler = self.env.profiler
+
     def assign(self, key: str, val: object) -> None:
         """Add _key_ to the local namespace with value _val_."""
         self.locals[key] = val
@@ -113,48 +170,67 @@ class RenderContext:
 
     def get(
         self,
-        path: list[object],
+        path: Sequence[object],
         *,
         token: TokenT | None,
         default: object = UNDEFINED,
+        undefined_cache: dict[int, Undefined] | None = None,
     ) -> object:
-        """Resolve the variable _path_ in the current namespace."""
+        """Resolve the variable _path_ in the current namespace.
+
+        If _path_ can't be resolved, _default_ is returned. If _default_ is not
+        given, an instance of the environment's undefined type is returned instead.
+
+        _undefined_cache_ is an optional dictionary, owned by a single call site
+        with a fixed _path_ and _token_, used to share instances of the default
+        `Undefined` type between calls.
+        """
         it = iter(path)
         root = next(it)
         assert isinstance(root, str)
 
         try:
-            obj = self.scope[root]
+            obj: Any = self.scope[root]
         except (KeyError, TypeError, IndexError):
-            if default == UNDEFINED:
-                hint = f"{root!r} is undefined"
-                return self.env.undefined(root, hint=hint, token=token)
+            if default is UNDEFINED:
+                return self._undefined(path, 1, token, undefined_cache)
             return default
 
+        # Plain string and integer keys don't need any of the special handling
+        # in `get_item()`, unless `get_item()` has been overridden.
+        plain_keys = self._plain_keys
+
         for i, segment in enumerate(it):
             try:
-                obj = self.get_item(obj, segment)
+                if segment.__class__ in plain_keys and segment not in _SPECIAL_KEYS:
+                    obj = obj[segment]
+                else:
+                    obj = self.get_item(obj, segment)
             except (KeyError, TypeError):
-                if default == UNDEFINED:
-                    hint = f"{_segments_str(path[: i + 2])} is undefined"
-                    return self.env.undefined(root, hint=hint, token=token)
+                if default is UNDEFINED:
+                    return self._undefined(path, i + 2, token, undefined_cache)
                 return default
             except IndexError:
-                if default == UNDEFINED:
-                    hint = "index out of range"
-                    return self.env.undefined(root, hint=hint, token=token)
+                if default is UNDEFINED:
+                    return self._undefined(path, 0, token, undefined_cache)
                 return default
 
+        if isinstance(obj, LazyValue):
+            return obj.resolve()
         return obj
 
     async def get_async(
         self,
-        path: list[object],
+        path: Sequence[object],
         *,
         token: TokenT,
         default: object = UNDEFINED,
+        undefined_cache: dict[int, Undefined] | None = None,
     ) -> object:
-        """Asynchronously resolve the variable _path_ in the current namespace."""
+        """Asynchronously resolve the variable _path_ in the current namespace.
+
+        See `get()`.
+        """
         it = iter(path)
         root = next(it)
         assert isinstance(root, str)
@@ -162,36 +238,77 @@ class RenderContext:
         try:
             obj = self.scope[root]
         except (KeyError, TypeError, IndexError):
-            if default == UNDEFINED:
-                hint = f"{root!r} is undefined"
-                return self.env.undefined(root, hint=hint, token=token)
+            if default is UNDEFINED:
+                return self._undefined(path, 1, token, undefined_cache)
             return default
 
         for i, segment in enumerate(it):
             try:
                 obj = await self.get_item_async(obj, segment)
             except (KeyError, TypeError):
-                if default == UNDEFINED:
-                    hint = f"{_segments_str(path[: i + 2])} is undefined"
-                    return self.env.undefined(root, hint=hint, token=token)
+                if default is UNDEFINED:
+                    return self._undefined(path, i + 2, token, undefined_cache)
                 return default
             except IndexError:
-                if default == UNDEFINED:
-                    hint = "index out of range"
-                    return self.env.undefined(root, hint=hint, token=token)
+                if default is UNDEFINED:
+                    return self._undefined(path, 0, token, undefined_cache)
                 return default
 
+        if isinstance(obj, LazyValue):
+            return await obj.resolve_async()
         return obj
 
+    def _undefined(
+        self,
+        path: Sequence[object],
+        stop: int,
+        token: TokenT | None,
+        cache: dict[int, Undefined] | None,
+    ) -> Undefined:
+        """Return an undefined object for _path_, which failed at segment _stop_.
+
+        A _stop_ of zero means an index was out of range. Hints are formatted
+        lazily, only if the undefined type asks for them.
+        """
+        root = path[0]
+        assert isinstance(root, str)
+
+        undefined = self.env.undefined
+
+        # Instances of the default undefined type have no state other than their
+        # path, token and hint, which are fixed for a given call site and _stop_.
+        # So we can share them between calls.
+        if cache is not None and undefined is Undefined:
+            try:
+                return cache[stop]
+            except KeyError:
+                pass
+
+        if stop == 0:
+            hint: str | Callable[[], str] = "index out of range"
+        elif stop == 1:
+            hint = f"{root!r} is undefined"
+        else:
+            hint = partial(_undefined_hint, path, stop)
+
+        rv = undefined(root, hint=hint, token=token)
+        if cache is not None and undefined is Undefined:
+            cache[stop] = rv
+        return rv
+
     def resolve(self, name: str, default: object = UNDEFINED) -> object:
         """Resolve variable _name_ in the current scope."""
         try:
-            return self.scope[name]
+            obj = self.scope[name]
         except (KeyError, TypeError, IndexError):
-            if default == UNDEFINED:
+            if default is UNDEFINED:
                 return self.env.undefined(name, token=None)
             return default
 
+        if isinstance(obj, LazyValue):
+            return obj.resolve()
+        return obj
+
     def get_item(self, obj: Any, key: Any) -> Any:
         """An item getter used when resolving a Liquid path.
 
@@ -200,6 +317,9 @@ class RenderContext:
         if hasattr(key, "__liquid__"):
             key = key.__liquid__()
 
+        if isinstance(obj, LazyValue):
+            obj = obj.resolve()
+
         if key == "size":
             try:
                 return obj["size"]
@@ -237,6 +357,9 @@ class RenderContext:
         if hasattr(key, "__liquid__"):
             key = key.__liquid__()
 
+        if isinstance(obj, LazyValue):
+            obj = await obj.resolve_async()
+
         if key == "size":
             try:
                 return await _get_item(obj, "size")
@@ -349,7 +472,10 @@ class RenderContext:
                 token=token,
             )
 
-        if carry_loop_iterations:
+        # Carried loop iteration counts and local namespace sizes are only used by
+        # their respective resource limits, so we don't compute them unless the
+        # limit is enabled.
+        if carry_loop_iterations and self.env.loop_iteration_limit:
             loop_iteration_carry = reduce(
                 mul,
                 (loop.length for loop in self.loops),
@@ -358,31 +484,29 @@ class RenderContext:
         else:
             loop_iteration_carry = 1
 
+        local_namespace_carry = (
+            self.get_size_of_locals() if self.env.local_namespace_limit else 0
+        )
+
+        ctx = self.__class__(
+            template or self.template,
+            global_data=ReadOnlyChainMap(
+                namespace, self.scope if block_scope else self.globals
+            ),
+            disabled_tags=disabled_tags,
+            copy_depth=self._copy_depth + 1,
+            parent=self,
+            loop_iteration_carry=loop_iteration_carry,
+            local_namespace_carry=local_namespace_carry,
+        )
+
+        ctx.profiler = self.profiler
+
         if block_scope:
-            ctx = self.__class__(
-                template or self.template,
-                global_data=ReadOnlyChainMap(namespace, self.scope),
-                disabled_tags=disabled_tags,
-                copy_depth=self._copy_depth + 1,
-                parent=self,
-                loop_iteration_carry=loop_iteration_carry,
-                local_namespace_carry=self.get_size_of_locals(),
-            )
             # This might need to be generalized so the caller can specify which
             # tag namespaces need to be copied.
             ctx.tag_namespace["extends"] = self.tag_namespace["extends"]
-        else:
-            ctx = self.__class__(
-                template or self.template,
-                global_data=ReadOnlyChainMap(namespace, self.globals),
-                disabled_tags=disabled_tags,
-                copy_depth=self._copy_depth + 1,
-                parent=self,
-                loop_iteration_carry=loop_iteration_carry,
-                local_namespace_carry=self.get_size_of_locals(),
-            )
 
-        ctx.template = template or self.template
         return ctx
 
     def stopindex(self, key: str, index: int | None = None) -> int:
@@ -406,6 +530,8 @@ class RenderContext:
                 yield context
             finally:
                 self.loops.pop()
+                if self.profiler:
+                    self.profiler.count_iterations(min(forloop.index, forloop.length))
 
     def parentloop(self, token: TokenT) -> Undefined | object:
         """Return the last ForLoop object from the loop stack."""
@@ -459,6 +585,98 @@ class RenderContext:
         return val
 
 
+class Interrupt(Enum):
+    """Loop control flow signals.
+
+    When a `break` or `continue` tag is known to be inside a loop, with only nodes
+    that propagate interrupts between the two, it sets `RenderContext.interrupt`
+    instead of raising `BreakLoop` or `ContinueLoop`. Nodes that propagate
+    interrupts stop rendering as soon as `interrupt` is set, and the loop clears it.
+    """
+
+    BREAK = auto()
+    CONTINUE = auto()
+
+
+class TagNamespace(dict[str, Any]):
+    """A dictionary of tag namespaces that creates built-in namespaces on demand.
+
+    Most templates never use `cycle`, `extends` or `macro`, so we avoid allocating
+    their namespaces until a tag asks for one.
+    """
+
+    __slots__ = ()
+
+    def __missing__(self, key: str) -> Any:
+        try:
+            factory = _TAG_NAMESPACE_FACTORIES[key]
+        except KeyError:
+            raise KeyError(key) from None
+
+        namespace = self[key] = factory()
+        return namespace
+
+
+_TAG_NAMESPACE_FACTORIES: dict[str, Callable[[], object]] = {
+    "cycles": dict,
+    "stopindex": dict,
+    "extends": partial(defaultdict, list),
+    "macros": dict,
+}
+
+
+class RenderContextPool:
+    """A bounded pool of reusable render contexts.
+
+    Contexts are taken from the pool by `acquire()` and must be given back with
+    `release()` once rendering is complete. A context is used by one render at a
+    time, so a pool can be shared between threads and async tasks.
+
+    Args:
+        size: The maximum number of idle contexts kept by the pool. If _size_ is
+            zero, contexts are never reused.
+    """
+
+    __slots__ = ("size", "_contexts")
+
+    def __init__(self, size: int):
+        self.size = size
+        self._contexts: deque[RenderContext] = deque(maxlen=size)
+
+    def __getstate__(self) -> dict[str, object]:
+        # Idle contexts are not pickled.
+        return {"size": self.size}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.size = state["size"]
+        self._contexts = deque(maxlen=self.size)
+
+    def __len__(self) -> int:
+        return len(self._contexts)
+
+    def acquire(
+        self,
+        template: Template,
+        *,
+        global_data: Mapping[str, object] | None = None,
+    ) -> RenderContext:
+        """Return a render context for _template_, reusing an idle one if possible."""
+        try:
+            context = self._contexts.pop()
+        except IndexError:
+            return RenderContext(template, global_data=global_data)
+
+        context.reset(template, global_data=global_data)
+        return context
+
+    def release(self, context: RenderContext) -> None:
+        """Return _context_ to the pool so it can be reused by another render."""
+        if self.size:
+            # Don't keep render data alive while the context is idle.
+            context.reset(context.template)
+            self._contexts.append(context)
+
+
 class BuiltIn(Mapping[str, object]):
     """Mapping-like object for resolving built-in, dynamic objects."""
 
@@ -485,7 +703,11 @@ builtin = BuiltIn()
 RE_PROPERTY = re.compile(r"[\u0080-\uFFFFa-zA-Z_][\u0080-\uFFFFa-zA-Z0-9_-]*")
 
 
-def _segments_str(segments: list[object]) -> str:
+# Path segments with special meaning. See `RenderContext.get_item()`.
+_SPECIAL_KEYS = frozenset(("size", "first", "last"))
+
+
+def _segments_str(segments: Sequence[object]) -> str:
     it = iter(segments)
     buf = [str(next(it))]
     for segment in it:
@@ -495,3 +717,7 @@ def _segments_str(segments: list[object]) -> str:
             else:
                 buf.append(f"[{segment!r}]")
     return "".join(buf)
+
+
+def _undefined_hint(segments: Sequence[object], stop: int) -> str:
+    return f"{_segments_str(segments[:stop])} is undefined"
@@ -0,0 +1,68 @@
+"""A base class for exposing selected attributes of Python objects to templates."""
+
+from __future__ import annotations
+
+from operator import attrgetter
+from typing import Any
+from typing import Callable
+from typing import ClassVar
+from typing import Iterable
+
+
+class Drop:
+    """A base class for objects that expose some of their attributes to templates.
+
+    List the names of attributes, properties and cached properties that template
+    authors can access in `__liquid_attributes__`. Attribute names declared by base
+    classes are inherited.
+
+    Each subclass gets a table of accessors, built once when the class is defined,
+    so resolving a path segment is a single dictionary lookup and a call to an
+    [attrgetter](https://docs.python.org/3/library/operator.html#operator.attrgetter).
+    Names that are not listed, or that can't be read from an instance, are
+    undefined.
+
+    ```python
+    from dataclasses import dataclass
+
+    from liquid2 import Drop
+
+
+    @dataclass
+    class Product(Drop):
+        __liquid_attributes__ = ("title", "price", "on_sale")
+
+        title: str
+        price: float
+        cost: float
+
+        @property
+        def on_sale(self) -> bool:
+            return self.price < self.cost
+    ```
+    """
+
+    __slots__ = ()
+
+    __liquid_attributes__: ClassVar[Iterable[str]] = ()
+    """Names of attributes available to template authors."""
+
+    _liquid_accessors: ClassVar[dict[str, Callable[[Any], object]]] = {}
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        accessors: dict[str, Callable[[Any], object]] = {}
+        for klass in reversed(cls.__mro__):
+            for name in klass.__dict__.get("__liquid_attributes__", ()):
+                accessors[name] = attrgetter(name)
+        cls._liquid_accessors = accessors
+
+    def __getitem__(self, key: str) -> object:
+        try:
+            return self._liquid_accessors[key](self)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    # Drops are not sequences. Without this, Python would try to iterate a drop by
+    # calling `__getitem__()` with integers.
+    __iter__ = None
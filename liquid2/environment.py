@@ -2,27 +2,42 @@
 
 from __future__ import annotations
 
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Callable
 from typing import ClassVar
+from typing import Iterable
+from typing import Iterator
 from typing import Mapping
 from typing import Type
 
+from .batch import render_many
 from .builtin import DictLoader
 from .builtin import register_default_tags_and_filters
+from .context import RenderContextPool
 from .exceptions import LiquidError
+from .expression_cache import ExpressionCache
 from .lexer import Lexer
+from .optimize import fold_constants
+from .optimize import freeze_nodes
 from .parser import Parser
+from .profiler import profile_load
+from .syntax_tree_store import SyntaxTreeStore
 from .template import Template
 from .token import WhitespaceControl
 from .undefined import Undefined
+from .utils import ThreadSafeLRUCache
+from .warm import warm
 
 if TYPE_CHECKING:
     from .ast import Node
+    from .batch import RenderResult
     from .context import RenderContext
     from .loader import BaseLoader
+    from .profiler import RenderProfiler
+    from .profiler import SlowRender
     from .tag import Tag
     from .token import TokenT
 
@@ -70,6 +85,47 @@ class Environment:
     """Maximum number of bytes that can be written to a template's output stream before
     raising an `OutputStreamLimitError`."""
 
+    source_size_limit: ClassVar[int | None] = None
+    """Maximum number of characters in template source text before a
+    `SourceSizeLimitError` is raised, without scanning the source."""
+
+    token_limit: ClassVar[int | None] = None
+    """Maximum number of markup and expression tokens the lexer will produce for one
+    template before raising a `TokenLimitError`."""
+
+    block_depth_limit: ClassVar[int | None] = None
+    """Maximum nesting depth of blocks, like those of `if` and `for` tags, before a
+    `BlockDepthLimitError` is raised."""
+
+    expression_depth_limit: ClassVar[int | None] = None
+    """Maximum nesting depth of groups, logical operators, bracketed variable paths
+    and template strings in an expression before an `ExpressionDepthLimitError` is
+    raised."""
+
+    node_limit: ClassVar[int | None] = None
+    """Maximum number of nodes in one template's syntax tree before a
+    `NodeLimitError` is raised."""
+
+    context_pool_size: ClassVar[int] = 0
+    """Maximum number of idle render contexts kept for reuse by `Template.render()`
+    and `Template.render_async()`. The default of `0` disables render context
+    pooling."""
+
+    expression_cache_size: ClassVar[int] = 0
+    """Maximum number of parsed expressions shared between output statements and
+    `assign`, `echo`, `if` and `unless` tags with identical markup. The default of
+    `0` disables expression sharing."""
+
+    parse_cache_size: ClassVar[int] = 0
+    """Maximum number of parsed templates kept by `from_string()`, keyed by source
+    text, template name and path, so parsing the same source again reuses the
+    existing syntax tree. The default of `0` disables the parse cache."""
+
+    share_syntax_trees: ClassVar[bool] = False
+    """If True, templates parsed from identical source text share one syntax tree,
+    whatever their name, path or loader namespace, for as long as any of them is in
+    use. The default is `False`."""
+
     suppress_blank_control_flow_blocks: bool = True
     """If True (the default), indicates that blocks rendering to whitespace only will
     not be output."""
@@ -78,6 +134,39 @@ class Environment:
     """If True, array indexes can be separated by dots without enclosing square
     brackets. The default is `False`."""
 
+    constant_folding: bool = False
+    """If True, expressions made up of literals and pure filters are evaluated once,
+    when a template is parsed, rather than every time it is rendered. The default
+    is `False`."""
+
+    compact_ast: bool = False
+    """If True, templates are frozen after they are parsed, reducing the memory
+    used by their syntax trees. See `Template.freeze()`. The default is `False`."""
+
+    profiler: RenderProfiler | None = None
+    """An optional [RenderProfiler][liquid2.profiler.RenderProfiler] recording render
+    timings for templates rendered with this environment. The default is `None`,
+    meaning profiling is disabled."""
+
+    slow_render_threshold: float | None = None
+    """If set, `Template.render()` and `Template.render_async()` calls taking longer
+    than this many seconds are reported to `slow_render_callback`. The default is
+    `None`, meaning slow renders are not reported."""
+
+    slow_render_callback: Callable[[SlowRender], None] | None = None
+    """A function called with a [SlowRender][liquid2.profiler.SlowRender] for every
+    render taking longer than `slow_render_threshold`. When set as a class attribute,
+    the function is not bound to the environment. Exceptions raised by the callback
+    are logged, not raised."""
+
+    slow_render_sample_rate: float = 0.1
+    """The proportion of renders, between `0.0` and `1.0`, that are profiled while
+    `slow_render_threshold` is set. Only profiled renders report their slowest
+    nodes, partial templates and loops. The default is `0.1`."""
+
+    slow_render_top_nodes: int = 10
+    """The maximum number of nodes included in a slow render report."""
+
     lexer_class = Lexer
     """The lexer class to use when scanning template source text."""
 
@@ -113,6 +202,26 @@ class Environment:
         self.tags: dict[str, Tag] = {}
         """The environment's tag register, mapping tag names to instances of `Tag`."""
 
+        self.context_pool = RenderContextPool(self.context_pool_size)
+        """A pool of reusable render contexts. See `context_pool_size`."""
+
+        self.expression_cache: ExpressionCache | None = (
+            ExpressionCache(self.expression_cache_size)
+            if self.expression_cache_size
+            else None
+        )
+        """Parsed expressions keyed by markup text. See `expression_cache_size`."""
+
+        self.parse_cache: ThreadSafeLRUCache[tuple[object, ...], list[Node]] | None = (
+            ThreadSafeLRUCache(self.parse_cache_size) if self.parse_cache_size else None
+        )
+        """Syntax trees created by `from_string()`. See `parse_cache_size`."""
+
+        self.syntax_trees: SyntaxTreeStore | None = (
+            SyntaxTreeStore() if self.share_syntax_trees else None
+        )
+        """Syntax trees keyed by source text. See `share_syntax_trees`."""
+
         self.setup_tags_and_filters()
         self.parser = Parser(self)
 
@@ -132,7 +241,12 @@ class Environment:
 
     def parse(self, source: str) -> list[Node]:
         """Compile template source text and return an abstract syntax tree."""
-        return self.parser.parse(self.tokenize(source))
+        nodes = self.parser.parse(self.tokenize(source))
+        if self.constant_folding:
+            nodes = fold_constants(self, nodes)
+        if self.compact_ast:
+            freeze_nodes(nodes)
+        return nodes
 
     def from_string(
         self,
@@ -143,11 +257,18 @@ class Environment:
         globals: Mapping[str, object] | None = None,
         overlay_data: Mapping[str, object] | None = None,
     ) -> Template:
-        """Create a template from a string."""
+        """Create a template from a string.
+
+        If `parse_cache_size` is greater than zero, templates created from the same
+        source text, name and path share one syntax tree, while each template
+        keeps its own global and overlay data. If `share_syntax_trees` is `True`,
+        templates created from the same source text share one syntax tree whatever
+        their name and path.
+        """
         try:
             return self.template_class(
                 self,
-                self.parse(source),
+                self._parse_source(source, name, path),
                 name=name,
                 path=path,
                 global_data=self.make_globals(globals),
@@ -163,6 +284,83 @@ class Environment:
                 err.template_name = template_name
             raise
 
+    def adopt_nodes(
+        self,
+        source: str,
+        nodes: list[Node],
+        *,
+        name: str = "",
+        path: str | Path | None = None,
+    ) -> list[Node]:
+        """Return a syntax tree for _source_, preferring one we already have.
+
+        _nodes_ must have been parsed from _source_ by an environment configured
+        like this one, usually in another process. If the parse cache or syntax
+        tree store already has a tree for _source_, that tree is returned instead of
+        _nodes_. Otherwise _nodes_ are stored as if we'd parsed them.
+
+        This is used by `Environment.warm()` to share syntax trees parsed in worker
+        processes.
+        """
+
+        def adopt() -> list[Node]:
+            if self.compact_ast:
+                # Interned strings are not interned after unpickling.
+                freeze_nodes(nodes)
+            return nodes
+
+        return self._parse_source(source, name, path, adopt)
+
+    def _parse_source(
+        self,
+        source: str,
+        name: str,
+        path: str | Path | None,
+        parse: Callable[[], list[Node]] | None = None,
+    ) -> list[Node]:
+        # Look in the parse cache and syntax tree store before calling _parse_.
+        if parse is None:
+            parse = partial(self.parse, source)
+        if self.parse_cache is not None:
+            return self._parse_cached(source, name, path, parse)
+        return self._parse_shared(source, parse)
+
+    def _parse_cached(
+        self,
+        source: str,
+        name: str,
+        path: str | Path | None,
+        parse: Callable[[], list[Node]],
+    ) -> list[Node]:
+        assert self.parse_cache is not None
+        # Strings cache their hash, so repeated lookups with the same source
+        # object cost one hash table probe. Settings that change how source text
+        # is parsed are included so changing them doesn't return a stale tree.
+        key = (source, name, path, *self._parser_settings())
+
+        try:
+            return self.parse_cache[key]
+        except KeyError:
+            pass
+
+        nodes = self._parse_shared(source, parse)
+        self.parse_cache[key] = nodes
+        return nodes
+
+    def _parse_shared(self, source: str, parse: Callable[[], list[Node]]) -> list[Node]:
+        if self.syntax_trees is None:
+            return parse()
+        return self.syntax_trees.get((source, *self._parser_settings()), parse)
+
+    def _parser_settings(self) -> tuple[object, ...]:
+        return (
+            self.default_trim,
+            self.shorthand_indexes,
+            self.constant_folding,
+            self.compact_ast,
+            self.validate_filter_arguments,
+        )
+
     def get_template(
         self,
         name: str,
@@ -187,13 +385,14 @@ class Environment:
             TemplateNotFound: If a template with the given name can not be found.
         """
         try:
-            return self.loader.load(
-                env=self,
-                name=name,
-                globals=self.make_globals(globals),
-                context=context,
-                **kwargs,
-            )
+            with profile_load(name, context):
+                return self.loader.load(
+                    env=self,
+                    name=name,
+                    globals=self.make_globals(globals),
+                    context=context,
+                    **kwargs,
+                )
         except LiquidError as err:
             if not err.template_name:
                 err.template_name = name
@@ -209,18 +408,109 @@ class Environment:
     ) -> Template:
         """An async version of `get_template()`."""
         try:
-            return await self.loader.load_async(
-                env=self,
-                name=name,
-                globals=self.make_globals(globals),
-                context=context,
-                **kwargs,
-            )
+            with profile_load(name, context):
+                return await self.loader.load_async(
+                    env=self,
+                    name=name,
+                    globals=self.make_globals(globals),
+                    context=context,
+                    **kwargs,
+                )
         except LiquidError as err:
             if not err.template_name:
                 err.template_name = name
             raise
 
+    def render_many(
+        self,
+        name: str,
+        data: Iterable[Mapping[str, object]],
+        *,
+        workers: int | None = None,
+        chunksize: int = 1,
+        ordered: bool = True,
+        globals: Mapping[str, object] | None = None,
+    ) -> Iterator[RenderResult]:
+        """Render the template called _name_ once for each mapping in _data_.
+
+        The template is loaded and parsed once, then sent, along with this
+        environment, to each of _workers_ worker processes. Items from _data_ are
+        consumed lazily, in chunks of _chunksize_, so very large or unbounded
+        iterables can be streamed through the pool.
+
+        An error rendering one item does not stop the batch. Instead, each item
+        produces a [RenderResult][liquid2.batch.RenderResult] with either an
+        `output` or an `error`.
+
+        Args:
+            name: The name of the template to render, as understood by this
+                environment's loader.
+            data: An iterable of mappings, each used as render context variables for
+                one rendering of the template.
+            workers: The number of worker processes to use. Defaults to the number of
+                CPUs. If _workers_ is less than two, items are rendered in the
+                current process without a pool.
+            chunksize: The number of items sent to a worker process at a time.
+            ordered: If `True` (the default), results are yielded in the same order
+                as _data_. If `False`, results are yielded as soon as they are ready.
+            globals: A mapping of render context variables attached to the template.
+
+        Returns:
+            An iterator of `RenderResult`, one for each item in _data_.
+
+        Raises:
+            TemplateNotFound: If a template with the given name can not be found.
+        """
+        return render_many(
+            self.get_template(name, globals=globals),
+            data,
+            workers=workers,
+            chunksize=chunksize,
+            ordered=ordered,
+        )
+
+    def warm(
+        self,
+        names: str | Iterable[str] | None = None,
+        *,
+        workers: int | None = None,
+        **kwargs: object,
+    ) -> dict[str, Exception]:
+        """Load and parse templates ahead of time, so first renders are fast.
+
+        Parsed templates are added to the loader's cache if it has one, like
+        [CachingFileSystemLoader][liquid2.CachingFileSystemLoader]. Warming an
+        environment with any other loader is still useful for finding syntax
+        errors before deployment.
+
+        Templates are parsed by _workers_ worker processes, and their syntax trees
+        are sent back to this process. An error loading one template does not stop
+        the others from loading. Instead, errors are collected and returned.
+
+        Args:
+            names: The names of templates to load, or a glob pattern, like
+                `"sections/*.liquid"`, matched against the names returned by the
+                loader's `list_templates()` method. If _names_ is `None` (the
+                default), all templates returned by `list_templates()` are loaded.
+            workers: The number of worker processes to use. Defaults to the number of
+                CPUs. If _workers_ is less than two, templates are loaded in the
+                current process without a pool.
+            kwargs: Arguments passed to the loader for every template, like
+                `get_template()`. For a caching loader with a `namespace_key`, pass
+                the namespace to warm, like `uid="t1"`, so templates are cached
+                under the same keys that namespaced lookups use.
+
+        Returns:
+            A dictionary mapping template names to the exception raised while
+            loading them. The dictionary is empty if all templates loaded
+            successfully.
+
+        Raises:
+            NotImplementedError: If _names_ is a pattern or `None` and this
+                environment's loader can't list its templates.
+        """
+        return warm(self, names, workers=workers, **kwargs)
+
     def make_globals(
         self,
         globals: Mapping[str, object] | None = None,  # noqa: A002
@@ -9,6 +9,7 @@ from .token import PathToken
 from .token import TagToken
 from .token import Token
 from .token import TokenType
+from .utils.lines import line_index
 
 if TYPE_CHECKING:
     from .token import TokenT
@@ -27,6 +28,11 @@ class LiquidError(Exception):
         self.token = token
         self.template_name = template_name
 
+    def __reduce__(self) -> tuple[object, ...]:
+        # Keyword-only arguments are not included in `self.args`, so the default
+        # exception pickling protocol can't call `__init__`.
+        return (self.__class__.__new__, (self.__class__, *self.args), self.__dict__)
+
     def __str__(self) -> str:
         return self.detailed_message()
 
@@ -93,34 +99,13 @@ class LiquidError(Exception):
         return self._error_context(self.token.source, self.token.start)
 
     def _error_context(self, text: str, index: int) -> tuple[int, int, str, str, str]:
-        lines = text.splitlines(keepends=True)
-        cumulative_length = 0
-        target_line_index = -1
-
-        for i, line in enumerate(lines):
-            cumulative_length += len(line)
-            if index < cumulative_length:
-                target_line_index = i
-                break
-
-        if target_line_index == -1:
-            raise ValueError("index is out of bounds for the given string")
-
-        # Line number (1-based)
-        line_number = target_line_index + 1
-        # Column number within the line
-        column_number = index - (cumulative_length - len(lines[target_line_index]))
-
-        previous_line = (
-            lines[target_line_index - 1].rstrip() if target_line_index > 0 else ""
-        )
-        current_line = lines[target_line_index].rstrip()
+        lines = line_index(text)
+        line_number, column_number = lines.location(index)
+        previous_line = lines.line(line_number - 1).rstrip() if line_number > 1 else ""
+        current_line = lines.line(line_number).rstrip()
         next_line = (
-            lines[target_line_index + 1].rstrip()
-            if target_line_index < len(lines) - 1
-            else ""
+            lines.line(line_number + 1).rstrip() if line_number < len(lines) else ""
         )
-
         return line_number, column_number, previous_line, current_line, next_line
 
 
@@ -222,6 +207,30 @@ class LocalNamespaceLimitError(ResourceLimitError):
     """Exception raised when a local namespace limit has been exceeded."""
 
 
+class ParseLimitError(ResourceLimitError):
+    """Base class for exceptions raised when a template is too complex to parse."""
+
+
+class SourceSizeLimitError(ParseLimitError):
+    """Exception raised when template source text exceeds the source size limit."""
+
+
+class TokenLimitError(ParseLimitError):
+    """Exception raised when a template contains too many tokens."""
+
+
+class BlockDepthLimitError(ParseLimitError):
+    """Exception raised when blocks are nested too deeply."""
+
+
+class ExpressionDepthLimitError(ParseLimitError):
+    """Exception raised when an expression is nested too deeply."""
+
+
+class NodeLimitError(ParseLimitError):
+    """Exception raised when a template contains too many nodes."""
+
+
 class LiquidValueError(LiquidError):
     """Exception raised when a cast from str to int exceeds the length limit."""
 
@@ -0,0 +1,146 @@
+"""Share parsed expressions between tags with identical markup.
+
+When `Environment.expression_cache_size` is greater than zero, output statements
+and some built-in tags look up their parsed expression by the exact text of their
+markup, like `{{ product.title | escape }}` or `{% if forloop.first %}`, so
+repeated markup is parsed once and its expression shared between nodes and
+templates.
+
+Tokens referenced by shared expressions are positioned relative to the start of
+their markup, with the markup text as their source. Use `anchor_token()` or
+`markup_offset()` to position them in the template containing a node.
+"""
+
+from __future__ import annotations
+
+from dataclasses import fields
+from dataclasses import replace
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import TypeVar
+
+from .exceptions import LiquidError
+from .stream import TokenStream
+from .token import TokenT
+from .utils import ThreadSafeLRUCache
+
+if TYPE_CHECKING:
+    from .environment import Environment
+    from .token import OutputToken
+    from .token import TagToken
+
+_T = TypeVar("_T")
+
+_POSITION_FIELDS = frozenset(["index", "start", "stop", "markup_start", "markup_stop"])
+
+
+class ExpressionCache:
+    """A bounded, thread safe cache of parsed expressions keyed by markup text.
+
+    Args:
+        capacity: The maximum number of parsed expressions to keep.
+    """
+
+    __slots__ = ("cache",)
+
+    def __init__(self, capacity: int):
+        self.cache: ThreadSafeLRUCache[tuple[object, str], object] = ThreadSafeLRUCache(
+            capacity
+        )
+
+    def parse(
+        self,
+        env: Environment,
+        token: TagToken | OutputToken,
+        parse: Callable[[Environment, TokenStream], _T],
+    ) -> _T:
+        """Return the result of calling _parse_ with _token_'s expression.
+
+        _parse_ should be a module level function or static method, as it forms
+        part of the cache key, and it must not retain references to _env_ or the
+        token stream beyond the objects it returns.
+        """
+        text = token.source[token.start : token.stop]
+        key = (parse, text)
+
+        try:
+            return self.cache[key]  # type: ignore
+        except KeyError:
+            pass
+
+        expression = [_rebase(t, text, token.start) for t in token.expression]
+
+        try:
+            result = parse(env, TokenStream(expression))
+        except LiquidError as err:
+            anchor_error(err, token)
+            raise
+
+        self.cache[key] = result
+        return result
+
+
+def parse_expression(
+    env: Environment,
+    token: TagToken | OutputToken,
+    parse: Callable[[Environment, TokenStream], _T],
+) -> _T:
+    """Parse _token_'s expression with _parse_, using the expression cache if enabled.
+
+    See `ExpressionCache.parse()`.
+    """
+    if env.expression_cache is None:
+        return parse(env, TokenStream(token.expression))
+    return env.expression_cache.parse(env, token, parse)
+
+
+def markup_offset(token: TokenT, markup_token: TokenT) -> int:
+    """Return the amount to add to _token_'s positions to place it in a template.
+
+    _markup_token_ is the token of the node _token_ belongs to. The offset is zero
+    unless _token_ is part of a shared expression.
+    """
+    return markup_token.start if _is_relative(token, markup_token) else 0
+
+
+def anchor_token(token: TokenT, markup_token: TokenT) -> TokenT:
+    """Return _token_ positioned in the template containing _markup_token_.
+
+    _token_ is returned unchanged unless it is part of a shared expression.
+    """
+    if _is_relative(token, markup_token):
+        return _rebase(token, markup_token.source, -markup_token.start)
+    return token
+
+
+def anchor_error(err: LiquidError, markup_token: TokenT) -> None:
+    """Position _err_'s token in the template containing _markup_token_."""
+    if err.token is not None:
+        err.token = anchor_token(err.token, markup_token)
+
+
+def _is_relative(token: TokenT, markup_token: TokenT) -> bool:
+    source = token.source
+    markup_source = markup_token.source
+    return (
+        source is not markup_source
+        and source == markup_source[markup_token.start : markup_token.stop]
+    )
+
+
+def _rebase(token: TokenT, source: str, offset: int) -> TokenT:
+    """Return a copy of _token_ with _source_ and positions reduced by _offset_."""
+    changes: dict[str, object] = {"source": source}
+    for field in fields(token):
+        name = field.name
+        value = getattr(token, name)
+        if name in _POSITION_FIELDS:
+            changes[name] = value - offset
+        elif isinstance(value, TokenT):
+            changes[name] = _rebase(value, source, offset)
+        elif isinstance(value, list):
+            changes[name] = [
+                _rebase(item, source, offset) if isinstance(item, TokenT) else item
+                for item in value
+            ]
+    return replace(token, **changes)  # type: ignore
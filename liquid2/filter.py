@@ -127,6 +127,17 @@ def with_environment(_filter: Callable[..., Any]) -> Callable[..., Any]:
     return _filter
 
 
+def pure(_filter: Callable[..., Any]) -> Callable[..., Any]:
+    """Mark the wrapped callable as a pure filter.
+
+    A pure filter's result depends only on its arguments and the environment, and
+    calling it has no side effects. When an environment has `constant_folding`
+    enabled, pure filters applied to literals are evaluated once, at parse time.
+    """
+    _filter.pure = True  # type: ignore
+    return _filter
+
+
 def string_filter(_filter: Callable[..., Any]) -> Callable[..., Any]:
     """A filter function decorator that converts the first argument to a string."""
 
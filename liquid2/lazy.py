@@ -0,0 +1,158 @@
+"""Template data that is computed on first use."""
+
+from __future__ import annotations
+
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Iterator
+from typing import Mapping
+
+from .exceptions import LiquidTypeError
+
+_MISSING = object()
+
+
+class LazyValue:
+    """A value that is computed by calling _func_ the first time it is used.
+
+    When a lazy value is found while resolving a variable path, it is replaced by
+    the result of calling _func_. _func_ is called at most once, and its result is
+    remembered by the lazy value, so create new lazy values for each render if the
+    result depends on anything other than the template data.
+
+    ```python
+    from liquid2 import lazy
+    from liquid2 import parse
+
+    template = parse("{% if show_reviews %}{{ reviews.average }}{% endif %}")
+    template.render(show_reviews=False, reviews=lazy(load_review_summary))
+    ```
+    """
+
+    __slots__ = ("func", "_value")
+
+    def __init__(self, func: Callable[[], object]) -> None:
+        self.func = func
+        self._value: object = _MISSING
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"LazyValue({self.func!r})"
+
+    @property
+    def resolved(self) -> bool:
+        """_True_ if this value has already been computed."""
+        return self._value is not _MISSING
+
+    def resolve(self) -> object:
+        """Return the value, computing it first if necessary."""
+        if self._value is _MISSING:
+            self._value = self.func()
+        return self._value
+
+    async def resolve_async(self) -> object:
+        """An async version of `resolve()`."""
+        return self.resolve()
+
+    def __getitem__(self, key: object) -> object:
+        # Lazy values that are not the last segment of a path are resolved by
+        # indexing them.
+        return self.resolve()[key]  # type: ignore
+
+    async def __getitem_async__(self, key: object) -> object:
+        obj: Any = await self.resolve_async()
+        if hasattr(obj, "__getitem_async__"):
+            return await obj.__getitem_async__(key)
+        return obj[key]
+
+    # Lazy values are not sequences. Without this, Python would try to iterate a
+    # lazy value by calling `__getitem__()` with integers.
+    __iter__ = None
+
+
+class AsyncLazyValue(LazyValue):
+    """A value that is computed by awaiting _func_ the first time it is used.
+
+    Async lazy values can only be resolved when rendering a template with
+    [render_async()][liquid2.Template.render_async].
+    """
+
+    __slots__ = ()
+
+    def __init__(self, func: Callable[[], Awaitable[object]]) -> None:
+        super().__init__(func)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"AsyncLazyValue({self.func!r})"
+
+    def resolve(self) -> object:
+        """Return the value, if it has already been computed asynchronously."""
+        if self._value is _MISSING:
+            raise LiquidTypeError(
+                "async lazy values can only be resolved with render_async()",
+                token=None,
+            )
+        return self._value
+
+    async def resolve_async(self) -> object:
+        """Return the value, awaiting it first if necessary."""
+        if self._value is _MISSING:
+            self._value = await self.func()  # type: ignore
+        return self._value
+
+
+def resolve_lazy(obj: object) -> object:
+    """Return _obj_, or its value if _obj_ is a lazy value.
+
+    Filters and other code that read template data directly, rather than by
+    resolving a variable path, use this to see through lazy values.
+    """
+    return obj.resolve() if isinstance(obj, LazyValue) else obj
+
+
+def lazy(func: Callable[[], object]) -> LazyValue:
+    """Return a new [LazyValue][liquid2.LazyValue] computed by calling _func_."""
+    return LazyValue(func)
+
+
+def lazy_async(func: Callable[[], Awaitable[object]]) -> AsyncLazyValue:
+    """Return a new [AsyncLazyValue][liquid2.AsyncLazyValue] that awaits _func_."""
+    return AsyncLazyValue(func)
+
+
+class LazyMapping(Mapping[str, object]):
+    """A mapping of keys to values that are computed on first use.
+
+    Each value in _data_ can be a callable, a [LazyValue][liquid2.LazyValue] or an
+    [AsyncLazyValue][liquid2.AsyncLazyValue]. Callables are wrapped in a `LazyValue`.
+    Values are computed the first time their key is looked up, and remembered for
+    subsequent lookups.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(
+        self, data: Mapping[str, Callable[[], object] | LazyValue] | None = None
+    ) -> None:
+        self._data: dict[str, LazyValue] = {
+            k: v if isinstance(v, LazyValue) else LazyValue(v)
+            for k, v in (data or {}).items()
+        }
+
+    def __getitem__(self, key: str) -> object:
+        return self._data[key].resolve()
+
+    async def __getitem_async__(self, key: str) -> object:
+        return await self._data[key].resolve_async()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:  # pragma: no cover
+        return f"LazyMapping({list(self._data)!r})"
@@ -6,12 +6,16 @@ import re
 from itertools import chain
 from typing import TYPE_CHECKING
 from typing import Callable
+from typing import Match
 from typing import Optional
 from typing import Pattern
 
 from typing_extensions import Never
 
+from .exceptions import ExpressionDepthLimitError
 from .exceptions import LiquidSyntaxError
+from .exceptions import SourceSizeLimitError
+from .exceptions import TokenLimitError
 from .token import BlockCommentToken
 from .token import CommentToken
 from .token import ContentToken
@@ -31,6 +35,7 @@ from .token import is_token_type
 
 if TYPE_CHECKING:
     from .environment import Environment
+    from .exceptions import LiquidError
     from .token import TokenT
 
 
@@ -43,6 +48,10 @@ def _compile(*rules: dict[str, str], flags: int = 0) -> Pattern[str]:
     return re.compile(pattern, flags)
 
 
+def _select(rules: dict[str, str], *names: str) -> dict[str, str]:
+    return {name: rules[name] for name in names}
+
+
 class Lexer:
     """Liquid template lexical scanner."""
 
@@ -58,17 +67,35 @@ class Lexer:
     RE_LINE_SPACE = re.compile(r"[ \t]+")
     RE_LINE_TERM = re.compile(r"\r?\n")
 
+    # The start of a tag that changes block comment or raw nesting depth.
     RE_COMMENT_TAG_CHUNK = re.compile(
-        r"(.*?)\{%(?:[\-+~]?)\s*"
-        r"(?P<COMMENT_CHUNK_END>comment|endcomment|raw|endraw)"
-        r".*?(?P<COMMENT_WC_END>[+\-~]?)%\}",
-        re.DOTALL,
+        r"\{%[\-+~]?\s*(?P<COMMENT_CHUNK_END>comment|endcomment|raw|endraw)"
+    )
+
+    RE_ENDRAW = re.compile(
+        r"\{%(?P<RAW_WC2>[\-+~]?)\s*endraw\s*(?P<RAW_WC3>[\-+~]?)%\}"
     )
 
+    WC_CHARS = frozenset(["-", "+", "~"])
+
     RE_PROPERTY = re.compile(r"[\u0080-\uFFFFa-zA-Z_][\u0080-\uFFFFa-zA-Z0-9_-]*")
     RE_INDEX = re.compile(r"-?[0-9]+")
+
+    # A dotted property or a bracketed index or string without escape sequences.
+    RE_PATH_SEGMENT = re.compile(
+        r"\.(?P<PROPERTY>[\u0080-\uFFFFa-zA-Z_][\u0080-\uFFFFa-zA-Z0-9_-]*)"
+        r"|\[[ \n\r\t]*(?:(?P<INDEX>-?[0-9]+)"
+        r"|'(?P<SINGLE_QUOTED>[^'\\]*)'"
+        r"|\"(?P<DOUBLE_QUOTED>[^\"\\]*)\")[ \n\r\t]*\]"
+    )
     ESCAPES = frozenset(["b", "f", "n", "r", "t", "u", "/", "\\", "$"])
 
+    # Quoted strings without escape sequences or template string interpolation.
+    STRINGS: dict[str, str] = {
+        "SINGLE_QUOTE_PLAIN_STRING": r"'(?:[^'\\$]|\$(?!\{))*'",
+        "DOUBLE_QUOTE_PLAIN_STRING": r"\"(?:[^\"\\$]|\$(?!\{))*\"",
+    }
+
     SYMBOLS: dict[str, str] = {
         "ARROW": r"=>",
         "GE": r">=",
@@ -122,6 +149,8 @@ class Lexer:
 
     TOKEN_MAP: dict[str, TokenType] = {
         **KEYWORD_MAP,
+        "SINGLE_QUOTE_PLAIN_STRING": TokenType.SINGLE_QUOTE_STRING,
+        "DOUBLE_QUOTE_PLAIN_STRING": TokenType.DOUBLE_QUOTE_STRING,
         "FLOAT": TokenType.FLOAT,
         "INT": TokenType.INT,
         "GE": TokenType.GE,
@@ -145,26 +174,24 @@ class Lexer:
     }
 
     MARKUP: dict[str, str] = {
-        "RAW": (
-            r"\{%(?P<RAW_WC0>[\-+~]?)\s*raw\s*(?P<RAW_WC1>[\-+~]?)%\}"
-            r"(?P<RAW_TEXT>.*?)"
-            r"\{%(?P<RAW_WC2>[\-+~]?)\s*endraw\s*(?P<RAW_WC3>[\-+~]?)%\}"
-        ),
+        # Raw blocks and comments are matched up to the end of their opening
+        # delimiter only. We look for closing delimiters separately, so unclosed
+        # markup doesn't cause us to rescan the rest of the source each time.
+        "RAW": r"\{%(?P<RAW_WC0>[\-+~]?)\s*raw\s*(?P<RAW_WC1>[\-+~]?)%\}",
         # old style `{% comment %} some comment {% endcomment %}`
         "COMMENT_TAG": r"\{%(?P<CT_WC>[\-+~]?)\s*comment\b.*?%\}",
         "OUTPUT": r"\{\{(?P<OUT_WC>[\-+~]?)\s*",
         "TAG": r"\{%(?P<TAG_WC>[\-+~]?)\s*(?P<TAG_NAME>[a-z][a-z_0-9]*)",
-        "COMMENT": (  # new style `{# some comment #}`
-            r"\{(?P<HASHES>#+)(?P<COMMENT_WC0>[\-+~]?)"
-            r"(?P<COMMENT_TEXT>.*?)"
-            r"(?P<COMMENT_WC1>[\-+~]?)(?P=HASHES)\}"
-        ),
-        "INLINE_COMMENT": (  # shopify style `{% # some comment %}`
-            r"\{%(?P<ILC_WC0>[\-+~]?)\s*#(?P<ILC_TEXT>.*?)(?P<ILC_WC1>[\-+~]?)%\}"
-        ),
-        "CONTENT": r".+?(?=(\{\{|\{%|\{#+|$))",
+        "COMMENT": r"\{(?P<HASHES>#+)",  # new style `{# some comment #}`
+        # shopify style `{% # some comment %}`
+        "INLINE_COMMENT": r"\{%(?P<ILC_WC0>[\-+~]?)\s*#",
     }
 
+    RE_TAG_START = _compile(_select(MARKUP, "TAG"))
+
+    RE_MARKUP_START = re.compile(r"\{[{%#]")
+    """The start of an output statement, tag or comment. Everything else is content."""
+
     WC_MAP = {
         None: WhitespaceControl.DEFAULT,
         "": WhitespaceControl.DEFAULT,
@@ -175,8 +202,16 @@ class Lexer:
 
     WC_DEFAULT = (WhitespaceControl.DEFAULT, WhitespaceControl.DEFAULT)
 
-    MARKUP_RULES = _compile(MARKUP, flags=re.DOTALL)
-    TOKEN_RULES = _compile(NUMBERS, SYMBOLS, WORD)
+    # Markup rules keyed by the character following an opening `{`.
+    MARKUP_RULES = {
+        "{": _compile(_select(MARKUP, "OUTPUT"), flags=re.DOTALL),
+        "%": _compile(
+            _select(MARKUP, "RAW", "COMMENT_TAG", "TAG", "INLINE_COMMENT"),
+            flags=re.DOTALL,
+        ),
+        "#": _compile(_select(MARKUP, "COMMENT"), flags=re.DOTALL),
+    }
+    TOKEN_RULES = _compile(STRINGS, NUMBERS, SYMBOLS, WORD)
 
     __slots__ = (
         "env",
@@ -194,6 +229,12 @@ class Lexer:
         "wc",
         "path_stack",
         "template_string_stack",
+        "template_string_depth",
+        "token_count",
+        "token_limit",
+        "expression_depth_limit",
+        "delimiters",
+        "delimiter_matches",
     )
 
     def __init__(self, env: Environment, source: str) -> None:
@@ -241,8 +282,39 @@ class Lexer:
         self.source = source
         """The template source text being scanned."""
 
+        self.template_string_depth = 0
+        """The number of template string expressions we're currently inside."""
+
+        self.token_count = 0
+        """The number of expression tokens scanned so far."""
+
+        self.token_limit = env.token_limit
+        """The maximum number of markup and expression tokens, or `None`."""
+
+        self.expression_depth_limit = env.expression_depth_limit
+        """The maximum nesting depth of paths and template strings, or `None`."""
+
+        self.delimiters: dict[str, tuple[int, int]] = {}
+        """The most recent search for each closing delimiter. See `find()`."""
+
+        self.delimiter_matches: dict[Pattern[str], tuple[int, Match[str] | None]] = {}
+        """The most recent search for each closing delimiter pattern."""
+
     def run(self) -> None:
-        """Populate _self.tokens_."""
+        """Populate _self.tokens_.
+
+        Raises:
+            SourceSizeLimitError: If the source text is longer than the
+                environment's `source_size_limit`.
+            TokenLimitError: If we've scanned more tokens than the environment's
+                `token_limit`.
+            ExpressionDepthLimitError: If paths or template strings are nested
+                deeper than the environment's `expression_depth_limit`.
+        """
+        limit = self.env.source_size_limit
+        if limit is not None and len(self.source) > limit:
+            raise SourceSizeLimitError("source size limit reached", token=None)
+
         state: Optional[StateFn] = self.lex_markup
         while state is not None:
             state = state()
@@ -277,6 +349,35 @@ class Lexer:
         except IndexError:
             return ""
 
+    def find(self, needle: str, start: int) -> int:
+        """Return the index of the first _needle_ at or after _start_, or -1.
+
+        The result of the last search for each needle is remembered, so looking
+        for a closing delimiter that isn't there, once for every opening
+        delimiter, does not rescan the rest of the source every time.
+        """
+        cached = self.delimiters.get(needle)
+        if cached:
+            searched_from, index = cached
+            if searched_from <= start and (index == -1 or index >= start):
+                return index
+
+        index = self.source.find(needle, start)
+        self.delimiters[needle] = (start, index)
+        return index
+
+    def search(self, pattern: Pattern[str], start: int) -> Match[str] | None:
+        """Like `find()`, but for a regular expression _pattern_."""
+        cached = self.delimiter_matches.get(pattern)
+        if cached:
+            searched_from, match = cached
+            if searched_from <= start and (match is None or match.start() >= start):
+                return match
+
+        match = pattern.search(self.source, start)
+        self.delimiter_matches[pattern] = (start, match)
+        return match
+
     def accept(self, pattern: Pattern[str]) -> bool:
         """Match _pattern_ starting from the current position."""
         match = pattern.match(self.source, self.pos)
@@ -381,6 +482,15 @@ class Lexer:
 
                 elif match := self.RE_PROPERTY.match(self.source, self.pos):
                     # A nested path
+                    if (
+                        self.expression_depth_limit is not None
+                        and len(self.path_stack) >= self.expression_depth_limit
+                    ):
+                        self.error(
+                            "expression depth limit reached",
+                            error=ExpressionDepthLimitError,
+                        )
+
                     self.path_stack.append(
                         PathToken(
                             type_=TokenType.PATH,
@@ -400,6 +510,52 @@ class Lexer:
                 self.backup()
                 return
 
+    def accept_simple_path(self, expression: list[TokenT]) -> bool:
+        """Try to scan a path made up of properties, indexes and plain strings.
+
+        Assumes the first segment, a word, has been consumed. If the path is not
+        simple, or is malformed, nothing is consumed and `False` is returned, leaving
+        the path for `accept_path()`.
+        """
+        source = self.source
+        path: list[str | int | PathToken] = [source[self.start : self.pos]]
+        pos = self.pos
+
+        while match := self.RE_PATH_SEGMENT.match(source, pos):
+            kind = match.lastgroup
+            assert kind is not None
+            if kind == "INDEX":
+                path.append(int(match.group(kind)))
+            else:
+                path.append(match.group(kind))
+            pos = match.end()
+
+        if len(path) == 1:
+            return False
+
+        # Anything other than the end of the path or the start of a range needs the
+        # full path scanner, if only to report an error. That includes running out of
+        # source text.
+        next_char = source[pos : pos + 1]
+        if (
+            not next_char
+            or next_char in ("[", "]")
+            or (next_char == "." and source[pos + 1 : pos + 2] != ".")
+        ):
+            return False
+
+        expression.append(
+            PathToken(
+                type_=TokenType.PATH,
+                path=path,
+                start=self.start,
+                stop=pos,
+                source=source,
+            )
+        )
+        self.pos = pos
+        return True
+
     def accept_string(self, *, quote: str) -> None:
         # Assumes the opening quote has been consumed.
         if self.peek() == quote:
@@ -512,6 +668,16 @@ class Lexer:
                 sub_expression: list[TokenT] = []
                 sub_expression_start = self.start
 
+                self.template_string_depth += 1
+                if (
+                    self.expression_depth_limit is not None
+                    and self.template_string_depth >= self.expression_depth_limit
+                ):
+                    self.error(
+                        "expression depth limit reached",
+                        error=ExpressionDepthLimitError,
+                    )
+
                 while True:
                     self.ignore_whitespace()
                     if not self.accept_token(sub_expression):
@@ -532,6 +698,7 @@ class Lexer:
                             self.next()
                             self.ignore()
                             self.start = self.pos
+                            self.template_string_depth -= 1
                             break
 
                         self.error(
@@ -648,7 +815,21 @@ class Lexer:
         value = match.group()
         self.pos += len(value)
 
-        if kind == "SINGLE_QUOTE_STRING":
+        self.token_count += 1
+        if self.token_limit is not None:
+            self.check_token_limit()
+
+        if kind in ("SINGLE_QUOTE_PLAIN_STRING", "DOUBLE_QUOTE_PLAIN_STRING"):
+            expression.append(
+                Token(
+                    type_=self.TOKEN_MAP[kind],
+                    value=value[1:-1],
+                    index=self.start + 1,
+                    source=self.source,
+                )
+            )
+            self.start = self.pos
+        elif kind == "SINGLE_QUOTE_STRING":
             self.ignore()
             self.accept_template_string(quote="'", expression=expression)
         elif kind == "DOUBLE_QUOTE_STRING":
@@ -661,8 +842,9 @@ class Lexer:
 
         elif kind == "WORD":
             if self.peek() in (".", "["):
-                self.accept_path(carry=True)
-                expression.append(self.path_stack.pop())
+                if not self.accept_simple_path(expression):
+                    self.accept_path(carry=True)
+                    expression.append(self.path_stack.pop())
 
             elif token_type := self.KEYWORD_MAP.get(value):
                 expression.append(
@@ -767,9 +949,16 @@ class Lexer:
             return whitespace
         return ""
 
-    def error(self, msg: str) -> Never:
+    def check_token_limit(self) -> None:
+        """Raise a `TokenLimitError` if we've scanned too many tokens."""
+        assert self.token_limit is not None
+        count = self.token_count + len(self.markup) + len(self.line_statements)
+        if count > self.token_limit:
+            self.error("token limit reached", error=TokenLimitError)
+
+    def error(self, msg: str, *, error: type[LiquidError] = LiquidSyntaxError) -> Never:
         """Emit an error token."""
-        raise LiquidSyntaxError(
+        raise error(
             msg,
             token=ErrorToken(
                 type_=TokenType.ERROR,
@@ -797,32 +986,62 @@ class Lexer:
         )
 
     def lex_markup(self) -> StateFn | None:
+        source = self.source
+        length = len(source)
+        token_limit = self.token_limit
+
         while True:
-            match = self.MARKUP_RULES.match(self.source, pos=self.pos)
+            if token_limit is not None:
+                self.check_token_limit()
 
-            if not match:
-                assert self.pos == len(self.source), (
-                    f"{self.pos}:{self.source[self.pos : 10]!r}.."
-                )
+            pos = self.pos
+
+            if pos >= length:
                 return None
 
-            kind = match.lastgroup
-            value = match.group()
-            self.pos += len(value)
+            # Dispatch on the character following `{`. Anything that isn't valid
+            # markup, including a lone `{`, is content up to the next delimiter.
+            match = None
+            search_pos = pos
+            if source[pos] == "{":
+                rules = self.MARKUP_RULES.get(source[pos + 1 : pos + 2])
+                match = rules.match(source, pos) if rules else None
+                search_pos += 1
+
+                if match:
+                    kind = match.lastgroup
+                    if kind == "COMMENT":
+                        if self.accept_comment(match):
+                            continue
+                        match = None
+                    elif kind == "INLINE_COMMENT":
+                        if self.accept_inline_comment(match):
+                            continue
+                        match = None
+                    elif kind == "RAW":
+                        if self.accept_raw(match):
+                            continue
+                        # Without a matching `endraw`, `raw` is just another tag.
+                        match = self.RE_TAG_START.match(source, pos)
 
-            if kind == "CONTENT":
+            if not match:
+                delimiter = self.RE_MARKUP_START.search(source, search_pos)
+                self.pos = delimiter.start() if delimiter else length
                 self.markup.append(
                     ContentToken(
                         type_=TokenType.CONTENT,
                         start=self.start,
                         stop=self.pos,
-                        text=value,
-                        source=self.source,
+                        text=source[pos : self.pos],
+                        source=source,
                     )
                 )
                 self.start = self.pos
                 continue
 
+            kind = match.lastgroup
+            self.pos = match.end()
+
             if kind == "OUTPUT":
                 self.markup_start = self.start
                 self.wc.append(self.WC_MAP[match.group("OUT_WC")])
@@ -841,59 +1060,6 @@ class Lexer:
                     else self.lex_inside_tag
                 )
 
-            if kind == "COMMENT":
-                self.markup.append(
-                    CommentToken(
-                        type_=TokenType.COMMENT,
-                        start=self.start,
-                        stop=self.pos,
-                        wc=(
-                            self.WC_MAP[match.group("COMMENT_WC0")],
-                            self.WC_MAP[match.group("COMMENT_WC1")],
-                        ),
-                        text=match.group("COMMENT_TEXT"),
-                        hashes=match.group("HASHES"),
-                        source=self.source,
-                    )
-                )
-                continue
-
-            if kind == "RAW":
-                self.markup.append(
-                    RawToken(
-                        type_=TokenType.RAW,
-                        start=self.start,
-                        stop=self.pos,
-                        wc=(
-                            self.WC_MAP[match.group("RAW_WC0")],
-                            self.WC_MAP[match.group("RAW_WC1")],
-                            self.WC_MAP[match.group("RAW_WC2")],
-                            self.WC_MAP[match.group("RAW_WC3")],
-                        ),
-                        text=match.group("RAW_TEXT"),
-                        source=self.source,
-                    )
-                )
-                self.start = self.pos
-                continue
-
-            if kind == "INLINE_COMMENT":
-                self.markup.append(
-                    InlineCommentToken(
-                        type_=TokenType.COMMENT,
-                        start=self.start,
-                        stop=self.pos,
-                        wc=(
-                            self.WC_MAP[match.group("ILC_WC0")],
-                            self.WC_MAP[match.group("ILC_WC1")],
-                        ),
-                        text=match.group("ILC_TEXT"),
-                        hashes="",
-                        source=self.source,
-                    )
-                )
-                continue
-
             if kind == "COMMENT_TAG":
                 self.markup_start = self.start
                 self.wc.append(self.WC_MAP[match.group("CT_WC")])
@@ -903,6 +1069,115 @@ class Lexer:
 
             self.error("unreachable")
 
+    def accept_comment(self, match: Match[str]) -> bool:
+        """Scan a `{# comment #}` starting with the opening delimiter in _match_.
+
+        The comment is closed by the same number of hashes it was opened with,
+        or by fewer if the opening run of hashes is never matched.
+        """
+        source = self.source
+        base = match.start()
+        hashes = len(match.group("HASHES"))
+
+        # Find the most hashes we can close with. If there's a closing run of
+        # _k_ hashes, there's also a closing run of _k - 1_ hashes.
+        low, high = 0, hashes
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.find("#" * mid + "}", base + 1 + mid) == -1:
+                high = mid - 1
+            else:
+                low = mid
+
+        if low == 0:
+            return False
+
+        text_start = base + 1 + low
+        wc_open = ""
+        if (
+            low == hashes
+            and text_start < len(source)
+            and (source[text_start] in self.WC_CHARS)
+        ):
+            wc_open = source[text_start]
+            text_start += 1
+
+        text_end = self.find("#" * low + "}", text_start)
+        wc_close = ""
+        if text_end > text_start and source[text_end - 1] in self.WC_CHARS:
+            text_end -= 1
+            wc_close = source[text_end]
+
+        self.pos = text_end + len(wc_close) + low + 1
+        self.markup.append(
+            CommentToken(
+                type_=TokenType.COMMENT,
+                start=self.start,
+                stop=self.pos,
+                wc=(self.WC_MAP[wc_open], self.WC_MAP[wc_close]),
+                text=source[text_start:text_end],
+                hashes="#" * low,
+                source=source,
+            )
+        )
+        self.start = self.pos
+        return True
+
+    def accept_inline_comment(self, match: Match[str]) -> bool:
+        """Scan a `{% # comment %}` starting with the opening delimiter in _match_."""
+        source = self.source
+        text_start = match.end()
+        text_end = self.find("%}", text_start)
+
+        if text_end == -1:
+            return False
+
+        wc_close = ""
+        if text_end > text_start and source[text_end - 1] in self.WC_CHARS:
+            text_end -= 1
+            wc_close = source[text_end]
+
+        self.pos = text_end + len(wc_close) + 2
+        self.markup.append(
+            InlineCommentToken(
+                type_=TokenType.COMMENT,
+                start=self.start,
+                stop=self.pos,
+                wc=(self.WC_MAP[match.group("ILC_WC0")], self.WC_MAP[wc_close]),
+                text=source[text_start:text_end],
+                hashes="",
+                source=source,
+            )
+        )
+        self.start = self.pos
+        return True
+
+    def accept_raw(self, match: Match[str]) -> bool:
+        """Scan a raw block starting with the `{% raw %}` tag in _match_."""
+        end_match = self.search(self.RE_ENDRAW, match.end())
+
+        if not end_match:
+            return False
+
+        self.pos = end_match.end()
+        self.markup.append(
+            RawToken(
+                type_=TokenType.RAW,
+                start=self.start,
+                stop=self.pos,
+                wc=(
+                    self.WC_MAP[match.group("RAW_WC0")],
+                    self.WC_MAP[match.group("RAW_WC1")],
+                    self.WC_MAP[end_match.group("RAW_WC2")],
+                    self.WC_MAP[end_match.group("RAW_WC3")],
+                ),
+                text=self.source[match.end() : end_match.start()],
+                source=self.source,
+            )
+        )
+        self.start = self.pos
+        return True
+
     def lex_inside_output_statement(
         self,
     ) -> StateFn | None:  # noqa: PLR0911, PLR0912, PLR0915
@@ -966,6 +1241,9 @@ class Lexer:
                 self.error(f"unexpected {ch!r}")
 
     def lex_inside_liquid_tag(self) -> StateFn | None:
+        if self.token_limit is not None:
+            self.check_token_limit()
+
         self.line_space.append(self.consume_whitespace())
 
         if match := self.RE_TAG_END.match(self.source, self.pos):
@@ -1094,8 +1372,11 @@ class Lexer:
         while True:
             # Read comment text up to the next {% comment %}, {% endcomment %},
             # {% raw %}, {% endraw %}, so we can count how many nested tags there are.
-            if match := self.RE_COMMENT_TAG_CHUNK.match(self.source, self.pos):
-                self.pos += match.end() - match.start()
+            match = self.RE_COMMENT_TAG_CHUNK.search(self.source, self.pos)
+            tag_end = self.find("%}", match.end()) if match else -1
+
+            if match and tag_end != -1:
+                self.pos = tag_end + 2
                 tag_name = match.group("COMMENT_CHUNK_END")
 
                 if tag_name == "comment":
@@ -1112,11 +1393,14 @@ class Lexer:
                                 stop=self.pos,
                                 wc=(
                                     self.wc[0],
-                                    self.WC_MAP[match.group("COMMENT_WC_END")],
+                                    self.WC_MAP.get(
+                                        self.source[tag_end - 1],
+                                        WhitespaceControl.DEFAULT,
+                                    )
+                                    if tag_end > match.end()
+                                    else WhitespaceControl.DEFAULT,
                                 ),
-                                text=self.source[
-                                    self.start : match.start() + len(match.group(1))
-                                ],
+                                text=self.source[self.start : match.start()],
                                 hashes="",
                                 source=self.source,
                             )
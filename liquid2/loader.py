@@ -118,6 +118,16 @@ class BaseLoader(ABC):
         template.uptodate = uptodate
         return template
 
+    def list_templates(self) -> list[str]:
+        """Return the names of all templates this loader can load, sorted by name.
+
+        Raises:
+            NotImplementedError: If this loader can't enumerate its templates.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} does not support listing templates"
+        )
+
 
 UpToDate: TypeAlias = Callable[[], bool] | Callable[[], Awaitable[bool]] | None
 
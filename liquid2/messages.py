@@ -22,8 +22,10 @@ from .builtin import FilteredExpression
 from .builtin import TernaryFilteredExpression
 from .builtin.comment import CommentNode
 from .context import RenderContext
+from .expression_cache import anchor_token
 from .token import TokenT
 from .token import is_tag_token
+from .utils import line_index
 
 if TYPE_CHECKING:
     from .ast import Node
@@ -260,12 +262,16 @@ def extract_from_template(
 
         for child in node.children(ctx, include_partials=False):
             for expr in child.expressions():
-                yield from visit_expression(expr, _line_number(expr.token))
+                yield from visit_expression(
+                    expr, _line_number(anchor_token(expr.token, child.token))
+                )
             yield from visit(child)
 
     for node in template.nodes:
         for expr in node.expressions():
-            yield from visit_expression(expr, _line_number(expr.token))
+            yield from visit_expression(
+                expr, _line_number(anchor_token(expr.token, node.token))
+            )
         yield from visit(node)
 
 
@@ -317,41 +323,14 @@ def _strip_comment_tags(comments: list[str], tags: list[str]) -> list[str]:
 
 def line_number(token: TokenT) -> int:
     """Return _token_'s line number."""
-    lines = token.source.splitlines(keepends=True)
-    cumulative_length = 0
-    target_line_index = -1
-
-    for i, line in enumerate(lines):
-        cumulative_length += len(line)
-        if token.start < cumulative_length:
-            target_line_index = i
-            break
-
-    if target_line_index == -1:
-        raise ValueError("index is out of bounds for the given string")
-
-    # Line number (1-based)
-    return target_line_index + 1
+    return line_index(token.source).line_number(token.start)
 
 
 def line_number_factory(source: str) -> Callable[[TokenT], int]:
     """Return a function for looking up token line numbers in _source_."""
-    lines = source.splitlines(keepends=True)
+    index = line_index(source)
 
     def _line_number(token: TokenT) -> int:
-        cumulative_length = 0
-        target_line_index = -1
-
-        for i, line in enumerate(lines):
-            cumulative_length += len(line)
-            if token.start < cumulative_length:
-                target_line_index = i
-                break
-
-        if target_line_index == -1:
-            raise ValueError("index is out of bounds for the given string")
-
-        # Line number (1-based)
-        return target_line_index + 1
+        return index.line_number(token.start)
 
     return _line_number
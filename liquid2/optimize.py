@@ -0,0 +1,584 @@
+"""Optional, parse-time passes over a template's syntax tree.
+
+`fold_constants()` evaluates constant expressions ahead of rendering, and
+`freeze_nodes()` reduces the memory used by a syntax tree that won't change again.
+"""
+
+from __future__ import annotations
+
+import sys
+from decimal import Decimal
+from functools import cache
+from io import StringIO
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
+from typing import Iterable
+from typing import TextIO
+
+from .ast import BlockNode
+from .ast import Node
+from .builtin.content import ContentNode
+from .builtin.expressions import ArrayLiteral
+from .builtin.expressions import Blank
+from .builtin.expressions import BooleanExpression
+from .builtin.expressions import ConstantExpression
+from .builtin.expressions import ContainsExpression
+from .builtin.expressions import Empty
+from .builtin.expressions import EqExpression
+from .builtin.expressions import Filter
+from .builtin.expressions import FilteredExpression
+from .builtin.expressions import GeExpression
+from .builtin.expressions import GtExpression
+from .builtin.expressions import InExpression
+from .builtin.expressions import KeywordArgument
+from .builtin.expressions import LeExpression
+from .builtin.expressions import Literal
+from .builtin.expressions import LogicalAndExpression
+from .builtin.expressions import LogicalNotExpression
+from .builtin.expressions import LogicalOrExpression
+from .builtin.expressions import LtExpression
+from .builtin.expressions import NeExpression
+from .builtin.expressions import Null
+from .builtin.expressions import Parameter
+from .builtin.expressions import Path
+from .builtin.expressions import PositionalArgument
+from .builtin.expressions import RangeLiteral
+from .builtin.expressions import TemplateString
+from .builtin.expressions import TernaryFilteredExpression
+from .builtin.expressions import filters_unchanged
+from .builtin.output import OutputNode
+from .builtin.tags.case_tag import CaseNode
+from .builtin.tags.if_tag import IfNode
+from .builtin.tags.unless_tag import UnlessNode
+from .context import RenderContext
+from .expression import Expression
+from .token import LinesToken
+from .token import OutputToken
+from .token import PathToken
+from .token import TagToken
+from .token import Token
+from .token import TokenT
+
+if TYPE_CHECKING:
+    from .ast import Partial
+    from .builtin import Identifier
+    from .environment import Environment
+
+# Expressions that always evaluate to the same value.
+_CONSTANT_EXPRESSIONS = (Literal, Null, Empty, Blank)
+
+# Expressions that are constant if all of their children are constant. Filtered
+# expressions are handled separately, as they also depend on filters being pure.
+_PURE_EXPRESSIONS = (
+    ArrayLiteral,
+    BooleanExpression,
+    ContainsExpression,
+    EqExpression,
+    GeExpression,
+    GtExpression,
+    InExpression,
+    LeExpression,
+    LogicalAndExpression,
+    LogicalNotExpression,
+    LogicalOrExpression,
+    LtExpression,
+    NeExpression,
+    RangeLiteral,
+    TemplateString,
+)
+
+# Only immutable values are folded. Mutable values, like lists, could be modified
+# by custom filters or tags, changing the value for subsequent renders.
+_IMMUTABLE_TYPES = (str, int, float, Decimal, range, type(None))
+
+# Objects, other than expressions, that can hold expressions.
+_EXPRESSION_CONTAINERS = (Filter, KeywordArgument, PositionalArgument)
+
+
+def fold_constants(env: Environment, nodes: list[Node]) -> list[Node]:
+    """Evaluate constant expressions in _nodes_ once, ahead of rendering.
+
+    Constant expressions are those made up of literals and pure filters only.
+    `if`, `unless` and `case` tags with constant conditions are replaced with the
+    branch that would be rendered, and runs of text and constant output are merged
+    into a single node.
+
+    Folded expressions and nodes keep a reference to their originals, so
+    serializing or analyzing a template gives the same results with or without
+    constant folding. Originals are also rendered in place of folded output if a
+    folded filter is replaced in `Environment.filters`, or if the render context
+    overrides `RenderContext.filter()`.
+
+    Returns:
+        A new list of nodes. Nodes in _nodes_ are updated in place.
+    """
+    return _ConstantFolder(env).fold_nodes(nodes)
+
+
+class FoldedNode(Node):
+    """A conditional tag replaced by the block that would always be rendered."""
+
+    __slots__ = ("node", "block", "filters")
+
+    propagates_interrupts = True
+
+    def __init__(
+        self,
+        node: Node,
+        block: BlockNode | None,
+        filters: tuple[tuple[str, Callable[..., object]], ...] = (),
+    ) -> None:
+        super().__init__(node.token)
+        self.node = node
+        self.block = block
+        self.blank = node.blank
+        # Filters called to evaluate the conditions that chose _block_.
+        self.filters = filters
+
+    def __str__(self) -> str:
+        return str(self.node)
+
+    def render_to_output(self, context: RenderContext, buffer: TextIO) -> int:
+        """Render the node to the output buffer."""
+        if self.filters and not filters_unchanged(self.filters, context):
+            return self.node.render_to_output(context, buffer)
+        if self.block:
+            return self.block.render(context, buffer)
+        return 0
+
+    async def render_to_output_async(
+        self, context: RenderContext, buffer: TextIO
+    ) -> int:
+        """Render the node to the output buffer."""
+        if self.filters and not filters_unchanged(self.filters, context):
+            return await self.node.render_to_output_async(context, buffer)
+        if self.block:
+            return await self.block.render_async(context, buffer)
+        return 0
+
+    def children(
+        self,
+        static_context: RenderContext,
+        *,
+        include_partials: bool = True,
+    ) -> Iterable[Node]:
+        """Return this node's children."""
+        return self.node.children(static_context, include_partials=include_partials)
+
+    def expressions(self) -> Iterable[Expression]:
+        """Return this node's expressions."""
+        return self.node.expressions()
+
+    def template_scope(self) -> Iterable[Identifier]:
+        """Return variables this node adds to the template local scope."""
+        return self.node.template_scope()
+
+    def block_scope(self) -> Iterable[Identifier]:
+        """Return variables this node adds to the node's block scope."""
+        return self.node.block_scope()
+
+    def partial_scope(self) -> Partial | None:
+        """Return information about a partial template loaded by this node."""
+        return self.node.partial_scope()
+
+
+class StaticBlockNode(BlockNode):
+    """A sequence of text and constant output nodes, rendered ahead of time."""
+
+    __slots__ = ("text", "filters")
+
+    def __init__(
+        self,
+        nodes: list[Node],
+        text: str,
+        filters: tuple[tuple[str, Callable[..., object]], ...] = (),
+    ) -> None:
+        super().__init__(nodes[0].token, nodes)
+        self.text = text
+        # Filters called to render constant output in _text_.
+        self.filters = filters
+
+    def render_to_output(self, context: RenderContext, buffer: TextIO) -> int:
+        """Render the node to the output buffer."""
+        if self.filters and not filters_unchanged(self.filters, context):
+            return sum(node.render(context, buffer) for node in self.nodes)
+        return buffer.write(self.text)
+
+    async def render_to_output_async(
+        self, context: RenderContext, buffer: TextIO
+    ) -> int:
+        """Render the node to the output buffer."""
+        if self.filters and not filters_unchanged(self.filters, context):
+            count = 0
+            for node in self.nodes:
+                count += await node.render_async(context, buffer)
+            return count
+        return buffer.write(self.text)
+
+
+class _ConstantFolder:
+    __slots__ = ("context", "branches")
+
+    def __init__(self, env: Environment) -> None:
+        self.context = RenderContext(env.template_class(env, []))
+        self.branches: dict[type[Node], Callable[[Node], Node]] = {
+            IfNode: self._fold_if,  # type: ignore
+            UnlessNode: self._fold_unless,  # type: ignore
+            CaseNode: self._fold_case,  # type: ignore
+        }
+
+    def fold_nodes(self, nodes: list[Node]) -> list[Node]:
+        folded: list[Node] = []
+        for node in nodes:
+            self.fold_node(node)
+            fold_branches = self.branches.get(type(node))
+            folded.append(fold_branches(node) if fold_branches else node)
+        return self._merge_static_nodes(folded)
+
+    def fold_node(self, node: Node) -> None:
+        self._fold_attributes(node)
+
+        if isinstance(node, BlockNode):
+            node.nodes = self.fold_nodes(node.nodes)
+            return
+
+        for child in node.children(self.context, include_partials=False):
+            self.fold_node(child)
+
+    def fold_expression(self, expression: Expression) -> Expression:
+        if isinstance(expression, _CONSTANT_EXPRESSIONS):
+            return expression
+
+        self._fold_attributes(expression)
+
+        if self._is_constant(expression):
+            try:
+                value = expression.evaluate(self.context)
+            except Exception:  # noqa: BLE001
+                # Leave it to render time to report the error.
+                return expression
+
+            if isinstance(value, _IMMUTABLE_TYPES):
+                return ConstantExpression(
+                    expression, value, self._folded_filters(expression)
+                )
+
+        if isinstance(expression, FilteredExpression):
+            self._fold_leading_filters(expression)
+
+        return expression
+
+    def _fold_attributes(self, obj: Any) -> None:
+        """Replace expressions referenced by _obj_ with folded expressions."""
+        for name in _slots(obj.__class__):
+            value = getattr(obj, name, None)
+            if isinstance(value, Expression):
+                setattr(obj, name, self.fold_expression(value))
+            elif isinstance(value, _EXPRESSION_CONTAINERS):
+                self._fold_attributes(value)
+            elif isinstance(value, list):
+                for i, item in enumerate(value):
+                    if isinstance(item, Expression):
+                        value[i] = self.fold_expression(item)
+                    elif isinstance(item, _EXPRESSION_CONTAINERS):
+                        self._fold_attributes(item)
+
+    def _fold_leading_filters(self, expression: FilteredExpression) -> None:
+        """Fold the longest run of constant filters at the start of _expression_."""
+        if not expression.filters or not self._is_constant(expression.left):
+            return
+
+        stop = 0
+        folded_value: object = None
+
+        try:
+            value = expression.left.evaluate(self.context)
+            for i, _filter in enumerate(expression.filters):
+                if not self._is_constant_filter(_filter):
+                    break
+                value = _filter.evaluate(value, self.context)
+                if isinstance(value, _IMMUTABLE_TYPES):
+                    stop = i + 1
+                    folded_value = value
+        except Exception:  # noqa: BLE001, S110
+            pass
+
+        if stop:
+            folded = FilteredExpression(
+                expression.token, expression.left, expression.filters[:stop]
+            )
+            expression.left = ConstantExpression(
+                folded, folded_value, self._folded_filters(folded)
+            )
+            expression.filters = expression.filters[stop:]
+
+    def _is_constant(self, expression: Expression) -> bool:
+        if isinstance(expression, _CONSTANT_EXPRESSIONS):
+            return True
+
+        if isinstance(expression, FilteredExpression):
+            return self._is_constant(expression.left) and self._is_constant_filters(
+                expression.filters
+            )
+
+        if isinstance(expression, TernaryFilteredExpression):
+            return (
+                self._is_constant(expression.left)
+                and self._is_constant(expression.condition)
+                and (
+                    expression.alternative is None
+                    or self._is_constant(expression.alternative)
+                )
+                and self._is_constant_filters(expression.filters)
+                and self._is_constant_filters(expression.tail_filters)
+            )
+
+        if isinstance(expression, _PURE_EXPRESSIONS):
+            return all(self._is_constant(child) for child in expression.children())
+
+        return False
+
+    def _is_constant_filters(self, filters: list[Filter] | None) -> bool:
+        return not filters or all(self._is_constant_filter(f) for f in filters)
+
+    def _is_constant_filter(self, _filter: Filter) -> bool:
+        func = self.context.env.filters.get(_filter.name)
+        return (
+            getattr(func, "pure", False)
+            and not getattr(func, "with_context", False)
+            and all(self._is_constant(arg.value) for arg in _filter.args)
+        )
+
+    def _folded_filters(
+        self, *expressions: Expression
+    ) -> tuple[tuple[str, Callable[..., object]], ...]:
+        """Return `(name, callable)` pairs for filters called by _expressions_."""
+        registered = self.context.env.filters
+        found: dict[str, Callable[..., object]] = {}
+        stack: list[Any] = list(expressions)
+
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, ConstantExpression):
+                found.update(obj.filters)
+                continue
+            if isinstance(obj, Filter):
+                found[obj.name] = registered[obj.name]
+            for name in _slots(obj.__class__):
+                value = getattr(obj, name, None)
+                if isinstance(value, (Expression, *_EXPRESSION_CONTAINERS)):
+                    stack.append(value)
+                elif isinstance(value, list):
+                    stack.extend(
+                        item
+                        for item in value
+                        if isinstance(item, (Expression, *_EXPRESSION_CONTAINERS))
+                    )
+
+        return tuple(found.items())
+
+    def _fold_if(self, node: IfNode) -> Node:
+        branches: list[tuple[Expression, BlockNode]] = [
+            (node.condition, node.consequence),
+            *((alt.expression, alt.block) for alt in node.alternatives),
+        ]
+
+        conditions: list[Expression] = []
+        for expression, block in branches:
+            if not isinstance(expression, Literal):
+                return node
+            conditions.append(expression)
+            if expression.value:
+                return FoldedNode(node, block, self._folded_filters(*conditions))
+
+        return FoldedNode(node, node.default, self._folded_filters(*conditions))
+
+    def _fold_unless(self, node: UnlessNode) -> Node:
+        condition: Expression = node.condition
+        if not isinstance(condition, Literal):
+            return node
+
+        if not condition.value:
+            return FoldedNode(node, node.consequence, self._folded_filters(condition))
+
+        conditions = [condition]
+        for alternative in node.alternatives:
+            expression: Expression = alternative.expression
+            if not isinstance(expression, Literal):
+                return node
+            conditions.append(expression)
+            if expression.value:
+                return FoldedNode(
+                    node, alternative.block, self._folded_filters(*conditions)
+                )
+
+        return FoldedNode(node, node.default, self._folded_filters(*conditions))
+
+    def _fold_case(self, node: CaseNode) -> Node:
+        # We only fold `case` tags where none of the `when` blocks match, as more
+        # than one `when` block can be rendered.
+        expressions = [node.expression]
+        for when in node.whens:
+            expressions.extend(when.expression.children())
+
+        if not all(isinstance(e, _CONSTANT_EXPRESSIONS) for e in expressions):
+            return node
+
+        if any(when.expression.evaluate(self.context) for when in node.whens):
+            return node
+
+        return FoldedNode(node, node.default, self._folded_filters(*expressions))
+
+    def _merge_static_nodes(self, nodes: list[Node]) -> list[Node]:
+        merged: list[Node] = []
+        run: list[Node] = []
+
+        for node in nodes:
+            if self._is_static(node):
+                run.append(node)
+                continue
+
+            self._flush(run, merged)
+            merged.append(node)
+
+        self._flush(run, merged)
+        return merged
+
+    def _flush(self, run: list[Node], merged: list[Node]) -> None:
+        if len(run) > 1:
+            buf = StringIO()
+            for node in run:
+                node.render_to_output(self.context, buf)
+            filters = self._folded_filters(
+                *(node.expression for node in run if isinstance(node, OutputNode))
+            )
+            merged.append(StaticBlockNode(run.copy(), buf.getvalue(), filters))
+        else:
+            merged.extend(run)
+        run.clear()
+
+    def _is_static(self, node: Node) -> bool:
+        return type(node) is ContentNode or (
+            type(node) is OutputNode
+            and isinstance(node.expression, _CONSTANT_EXPRESSIONS)
+        )
+
+
+def freeze_nodes(nodes: Iterable[Node]) -> None:
+    """Reduce the memory used by _nodes_ and everything they reference, in place.
+
+    Expression tokens that have already been parsed into expressions are dropped
+    from tag and output tokens, lists of nodes, expressions and path segments are
+    replaced with tuples, and names and path segments are interned so they are
+    shared with other templates.
+
+    Frozen nodes render, serialize and analyze exactly as before, and the tokens
+    they keep are enough to report errors. Nodes must not be modified after they
+    have been frozen.
+    """
+    freezer = _Freezer()
+    for node in nodes:
+        freezer.freeze(node)
+
+
+# Objects, other than nodes and expressions, that are frozen along with their nodes.
+_FREEZABLE = (Node, Expression, Parameter, *_EXPRESSION_CONTAINERS)
+
+
+class _Freezer:
+    __slots__ = ("seen", "keep")
+
+    def __init__(self) -> None:
+        # IDs of nodes, expressions and tokens that have already been frozen.
+        # Nodes and expressions can be shared, so we might see them more than once.
+        self.seen: set[int] = set()
+        # IDs of tag tokens that are needed to serialize a `{% liquid %}` tag.
+        self.keep: set[int] = set()
+
+    def freeze(self, obj: Any) -> None:
+        if id(obj) in self.seen:
+            return
+        self.seen.add(id(obj))
+
+        if isinstance(obj, Node):
+            # Line statements must be seen before the nodes parsed from them.
+            self._freeze_token(obj.token)
+        elif isinstance(obj, Path):
+            self._freeze_path(obj)
+            self._freeze_token(obj.token)
+            return
+
+        for name in _slots(obj.__class__):
+            value = getattr(obj, name, None)
+            frozen = self._freeze_value(value)
+            if frozen is not value:
+                setattr(obj, name, frozen)
+
+    def _freeze_value(self, value: object) -> object:
+        if type(value) is str:
+            return sys.intern(value)
+        if isinstance(value, TokenT):
+            self._freeze_token(value)
+        elif isinstance(value, _FREEZABLE):
+            self.freeze(value)
+        elif isinstance(value, list):
+            return tuple(self._freeze_value(item) for item in value)
+        elif isinstance(value, tuple):
+            items = tuple(self._freeze_value(item) for item in value)
+            if all(a is b for a, b in zip(items, value, strict=True)):
+                return value
+            # Named tuples, like `MessageBlock`, keep their type.
+            return value._make(items) if hasattr(value, "_make") else items
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if isinstance(item, _FREEZABLE):
+                    self.freeze(item)
+                elif isinstance(item, list):
+                    value[key] = self._freeze_value(item)
+        return value
+
+    def _freeze_path(self, path: Path) -> None:
+        if path.static_path is None:
+            path.path = self._freeze_value(path.path)  # type: ignore
+            return
+
+        # Share one tuple of segments between the path and its token.
+        segments = self._freeze_value(path.static_path)
+        path.static_path = segments  # type: ignore
+        path.path = segments  # type: ignore
+        token = path.token
+        if isinstance(token, PathToken) and tuple(token.path) == segments:
+            token.path = segments  # type: ignore
+            self.seen.add(id(token))
+
+    def _freeze_token(self, token: TokenT) -> None:
+        if id(token) in self.seen:
+            return
+        self.seen.add(id(token))
+
+        if isinstance(token, LinesToken):
+            self.keep.update(id(statement) for statement in token.statements)
+        elif isinstance(token, (TagToken, OutputToken)):
+            if isinstance(token, TagToken):
+                token.name = sys.intern(token.name)
+            if id(token) not in self.keep:
+                # Nodes serialize themselves from their expressions, not tokens.
+                token.expression = ()  # type: ignore
+        elif isinstance(token, Token):
+            token.value = sys.intern(token.value)
+        elif isinstance(token, PathToken):
+            for segment in token.path:
+                if isinstance(segment, PathToken):
+                    self._freeze_token(segment)
+            token.path = self._freeze_value(token.path)  # type: ignore
+
+
+@cache
+def _slots(cls: type) -> tuple[str, ...]:
+    """Return the names of all slots defined by _cls_ and its base classes."""
+    names: list[str] = []
+    for klass in cls.__mro__:
+        slots = klass.__dict__.get("__slots__", ())
+        names.extend((slots,) if isinstance(slots, str) else slots)
+    return tuple(names)
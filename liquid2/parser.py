@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import threading
 from typing import TYPE_CHECKING
 from typing import Container
 from typing import cast
@@ -9,7 +10,9 @@ from typing import cast
 from liquid2 import TokenStream
 
 from .builtin import Content
+from .exceptions import BlockDepthLimitError
 from .exceptions import LiquidSyntaxError
+from .exceptions import NodeLimitError
 from .token import TokenType
 from .token import is_comment_token
 from .token import is_content_token
@@ -24,15 +27,53 @@ if TYPE_CHECKING:
     from .token import TokenT
 
 
+class ParseState(threading.local):
+    """Counters for the template currently being parsed, one set per thread."""
+
+    block_depth = 0
+    """The number of blocks we're currently inside."""
+
+    expression_depth = 0
+    """The nesting depth of the expression currently being parsed."""
+
+    node_count = 0
+    """The number of nodes parsed so far."""
+
+
 class Parser:
     """Liquid token parser."""
 
     def __init__(self, env: Environment) -> None:
         self.env = env
         self.tags = env.tags
+        self.state = ParseState()
+
+    def __getstate__(self) -> dict[str, object]:
+        state = self.__dict__.copy()
+        del state["state"]
+        return state
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self.state = ParseState()
 
     def parse(self, tokens: list[TokenT]) -> list[Node]:
-        """Parse _tokens_ into an abstract syntax tree."""
+        """Parse _tokens_ into an abstract syntax tree.
+
+        Raises:
+            BlockDepthLimitError: If blocks are nested deeper than the environment's
+                `block_depth_limit`.
+            ExpressionDepthLimitError: If an expression is nested deeper than the
+                environment's `expression_depth_limit`.
+            NodeLimitError: If the syntax tree would contain more nodes than the
+                environment's `node_limit`.
+        """
+        state = self.state
+        state.block_depth = 0
+        state.expression_depth = 0
+        state.node_count = 0
+        node_limit = self.env.node_limit
+
         tags = self.tags
         comment = tags["__COMMENT"]
         content = cast(Content, tags["__CONTENT"])
@@ -81,12 +122,32 @@ class Parser:
                     token=token,
                 )
 
+            if node_limit is not None:
+                self._count_node(node_limit, token)
+
             stream.next()
 
         return nodes
 
     def parse_block(self, stream: TokenStream, end: Container[str]) -> list[Node]:
         """Parse markup tokens from _stream_ until wee find a tag in _end_."""
+        state = self.state
+        limit = self.env.block_depth_limit
+
+        if limit is not None and state.block_depth >= limit:
+            raise BlockDepthLimitError(
+                "block depth limit reached", token=stream.current()
+            )
+
+        state.block_depth += 1
+
+        try:
+            return self._parse_block(stream, end)
+        finally:
+            state.block_depth -= 1
+
+    def _parse_block(self, stream: TokenStream, end: Container[str]) -> list[Node]:
+        node_limit = self.env.node_limit
         tags = self.tags
         comment = tags["__COMMENT"]
         content = cast(Content, tags["__CONTENT"])
@@ -138,6 +199,14 @@ class Parser:
                     token=token,
                 )
 
+            if node_limit is not None:
+                self._count_node(node_limit, token)
+
             stream.next()
 
         return nodes
+
+    def _count_node(self, limit: int, token: TokenT) -> None:
+        self.state.node_count += 1
+        if self.state.node_count > limit:
+            raise NodeLimitError("node limit reached", token=token)
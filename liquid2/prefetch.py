@@ -0,0 +1,118 @@
+"""Batch loading of loop item properties.
+
+If items in a collection implement `__liquid_batch__(key, siblings)`, loops call it
+once for each property accessed by the loop body, passing every item of the same
+type, before rendering the first iteration. This gives drops the opportunity to
+load data for all items with one query, instead of one query per item.
+
+Properties are found by static analysis of the loop body. Only paths starting with
+the loop variable followed by a property name, like `item.inventory` or
+`item.reviews.size`, are considered.
+"""
+
+from __future__ import annotations
+
+from itertools import chain
+from typing import TYPE_CHECKING
+from typing import Iterable
+from typing import Iterator
+from typing import Sequence
+
+from .builtin.expressions import Path
+
+if TYPE_CHECKING:
+    from .ast import Node
+    from .context import RenderContext
+    from .expression import Expression
+
+
+def loop_keys(
+    name: str, nodes: Iterable[Node], static_context: RenderContext
+) -> tuple[str, ...]:
+    """Return property names accessed on variable _name_ by _nodes_.
+
+    Partial templates are not included.
+    """
+    keys: dict[str, None] = {}
+    _visit_nodes(name, nodes, static_context, keys)
+    return tuple(keys)
+
+
+def _visit_nodes(
+    name: str,
+    nodes: Iterable[Node],
+    static_context: RenderContext,
+    keys: dict[str, None],
+) -> None:
+    for node in nodes:
+        for expression in node.expressions():
+            _visit_expression(name, expression, keys)
+        _visit_nodes(
+            name,
+            node.children(static_context, include_partials=False),
+            static_context,
+            keys,
+        )
+
+
+def _visit_expression(name: str, expression: Expression, keys: dict[str, None]) -> None:
+    if isinstance(expression, Path):
+        path = expression.path
+        if len(path) > 1 and path[0] == name and isinstance(path[1], str):
+            keys[path[1]] = None
+
+    for child in expression.children():
+        _visit_expression(name, child, keys)
+
+
+def peek_batchable(
+    it: Iterator[object],
+) -> tuple[Iterator[object], list[object] | None]:
+    """Look at the first item in _it_ to see if items implement `__liquid_batch__`.
+
+    Returns:
+        A (iterator, items) tuple. If the first item implements `__liquid_batch__`,
+        _items_ is a list of all items from _it_, otherwise it is `None`. Either
+        way, the returned iterator yields all items from _it_.
+    """
+    try:
+        first = next(it)
+    except StopIteration:
+        return iter(()), None
+
+    if not hasattr(first, "__liquid_batch__"):
+        return chain((first,), it), None
+
+    items = [first, *it]
+    return iter(items), items
+
+
+def batch_load(items: Sequence[object], keys: Iterable[str]) -> None:
+    """Call `__liquid_batch__` once per key for each type of item in _items_."""
+    groups = _group(items)
+    for key in keys:
+        for group in groups:
+            group[0].__liquid_batch__(key, group)  # type: ignore
+
+
+async def batch_load_async(items: Sequence[object], keys: Iterable[str]) -> None:
+    """An async version of `batch_load()`.
+
+    `__liquid_batch_async__` is awaited instead of calling `__liquid_batch__`, if
+    it is available.
+    """
+    groups = _group(items)
+    for key in keys:
+        for group in groups:
+            if hasattr(group[0], "__liquid_batch_async__"):
+                await group[0].__liquid_batch_async__(key, group)
+            else:
+                group[0].__liquid_batch__(key, group)  # type: ignore
+
+
+def _group(items: Sequence[object]) -> list[list[object]]:
+    groups: dict[type, list[object]] = {}
+    for item in items:
+        if hasattr(item, "__liquid_batch__"):
+            groups.setdefault(item.__class__, []).append(item)
+    return list(groups.values())
@@ -0,0 +1,458 @@
+"""Record where template render time goes.
+
+Set `Environment.profiler` or `RenderContext.profiler` to an instance of
+`RenderProfiler` to have nodes, filters, partial templates and template loading
+timed while rendering.
+
+Set `Environment.slow_render_threshold` and `Environment.slow_render_callback` to
+have a `SlowRender` record passed to the callback for every render that takes
+longer than the threshold.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from contextlib import AbstractContextManager
+from contextlib import contextmanager
+from contextlib import nullcontext
+from dataclasses import dataclass
+from dataclasses import field
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Iterator
+from typing import Literal
+from typing import TextIO
+
+from .ast import BlockNode
+from .token import is_tag_token
+from .utils import line_index
+
+if TYPE_CHECKING:
+    from .ast import Node
+    from .context import RenderContext
+    from .environment import Environment
+    from .template import Template
+    from .token import TokenT
+
+logger = logging.getLogger(__name__)
+
+ProfileKind = Literal["node", "filter", "partial", "load"]
+
+# A reusable context manager for when profiling is disabled.
+_NOT_PROFILING = nullcontext()
+
+
+@dataclass(slots=True)
+class ProfileRecord:
+    """Timings for one node, filter, partial template or template load."""
+
+    kind: ProfileKind
+    """The kind of thing that was timed."""
+
+    name: str
+    """A tag name, `output`, `content` etc. for nodes, a filter name for filters, or
+    a template name for partials and template loads."""
+
+    template_name: str
+    """The name of the template containing the node, or an empty string for filters,
+    partials and template loads."""
+
+    span: tuple[int, int]
+    """The start and stop index of the node in its template's source text, or
+    `(-1, -1)` for filters, partials and template loads."""
+
+    line: int
+    """The line number of the node in its template's source text, or `0` for
+    filters, partials and template loads."""
+
+    calls: int = 0
+    """The number of times the node, filter or partial was rendered, called or
+    loaded."""
+
+    total_time: float = 0.0
+    """Total wall time in seconds, including time spent in children."""
+
+    self_time: float = 0.0
+    """Total wall time in seconds, excluding time spent in children."""
+
+    iterations: int = 0
+    """The total number of loop iterations rendered by a `for` node, or `0` for
+    other nodes, filters, partials and template loads."""
+
+    @property
+    def label(self) -> str:
+        """A short description of this record used in stack frames."""
+        if self.kind == "node":
+            return f"{self.template_name}:{self.line} {self.name}"
+        return f"{self.kind}:{self.name}"
+
+
+class _Frame:
+    __slots__ = ("record", "start", "child_time")
+
+    def __init__(self, record: ProfileRecord, start: float) -> None:
+        self.record = record
+        self.start = start
+        self.child_time = 0.0
+
+
+class RenderProfiler:
+    """Wall time and call counts for nodes, filters, partials and template loads.
+
+    Node timings are recorded per template name and source span. Filter timings are
+    recorded per filter name, and partial template and template load timings are
+    recorded per template name.
+
+    A profiler can be shared between threads. Renders interleaved in the same
+    thread, with `render_async()`, should use separate profilers, as they would
+    otherwise share a call stack.
+
+    Args:
+        clock: A function returning the current time in seconds. Defaults to
+            `time.perf_counter`.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter) -> None:
+        self.clock = clock
+        self._records: dict[tuple[object, ...], ProfileRecord] = {}
+        self._stacks: defaultdict[tuple[str, ...], float] = defaultdict(float)
+        self._local = threading.local()
+
+    def clear(self) -> None:
+        """Discard all recorded timings."""
+        self._records.clear()
+        self._stacks.clear()
+
+    @property
+    def records(self) -> list[ProfileRecord]:
+        """All records, in the order they were first seen."""
+        return list(self._records.values())
+
+    def report(
+        self, kind: ProfileKind | None = None, *, limit: int | None = None
+    ) -> list[ProfileRecord]:
+        """Return records sorted by self time, slowest first.
+
+        Args:
+            kind: Only include records of this kind.
+            limit: The maximum number of records to return.
+        """
+        records = sorted(
+            (r for r in self._records.values() if kind is None or r.kind == kind),
+            key=lambda r: r.self_time,
+            reverse=True,
+        )
+        return records[:limit] if limit is not None else records
+
+    def collapsed_stacks(self) -> str:
+        """Return self time for each call stack in collapsed stack format.
+
+        Each line is a semicolon separated list of frames followed by a space and
+        a number of microseconds, suitable for flame graph tools.
+        """
+        return "".join(
+            f"{';'.join(f.replace(';', ',') for f in stack)} "
+            f"{round(seconds * 1_000_000)}\n"
+            for stack, seconds in self._stacks.items()
+        )
+
+    def render_node(self, node: Node, context: RenderContext, buffer: TextIO) -> int:
+        """Render _node_, recording its timings."""
+        # Block nodes share a token with their first child, and are not
+        # interesting on their own.
+        if isinstance(node, BlockNode):
+            return node.render_to_output(context, buffer)
+
+        frame = self.enter(self._node_record(node, context))
+        try:
+            return node.render_to_output(context, buffer)
+        finally:
+            self.exit(frame)
+
+    async def render_node_async(
+        self, node: Node, context: RenderContext, buffer: TextIO
+    ) -> int:
+        """Render _node_ asynchronously, recording its timings."""
+        if isinstance(node, BlockNode):
+            return await node.render_to_output_async(context, buffer)
+
+        frame = self.enter(self._node_record(node, context))
+        try:
+            return await node.render_to_output_async(context, buffer)
+        finally:
+            self.exit(frame)
+
+    def enter(self, record: ProfileRecord) -> _Frame:
+        """Start timing _record_. Every call must be followed by a call to `exit()`."""
+        stack = self._stack()
+        frame = _Frame(record, self.clock())
+        stack.append(frame)
+        return frame
+
+    def exit(self, frame: _Frame) -> None:
+        """Stop timing _frame_ and add its timings to its record."""
+        elapsed = self.clock() - frame.start
+        stack = self._stack()
+        labels = tuple(f.record.label for f in stack)
+        stack.pop()
+
+        record = frame.record
+        record.calls += 1
+        record.total_time += elapsed
+        self_time = elapsed - frame.child_time
+        record.self_time += self_time
+        self._stacks[labels] += self_time
+
+        if stack:
+            stack[-1].child_time += elapsed
+
+    def count_iterations(self, iterations: int) -> None:
+        """Add _iterations_ to the record of the node currently being rendered."""
+        stack = self._stack()
+        if stack:
+            stack[-1].record.iterations += iterations
+
+    def hottest_stack(self) -> tuple[str, ...]:
+        """Return the call stack with the most self time, as a tuple of labels."""
+        if not self._stacks:
+            return ()
+        return max(self._stacks.items(), key=lambda item: item[1])[0]
+
+    def filter_record(self, name: str) -> ProfileRecord:
+        """Return the record for filter _name_, creating it if necessary."""
+        return self._record("filter", name)
+
+    @contextmanager
+    def partial(self, name: str) -> Iterator[None]:
+        """Time rendering partial template _name_ for the duration of the block.
+
+        Nodes rendered inside the block are attributed to template _name_.
+        """
+        names = self._template_names()
+        frame = self.enter(self._record("partial", name))
+        names.append(name)
+        try:
+            yield
+        finally:
+            names.pop()
+            self.exit(frame)
+
+    @contextmanager
+    def load(self, name: str) -> Iterator[None]:
+        """Time loading template _name_ for the duration of the block."""
+        frame = self.enter(self._record("load", name))
+        try:
+            yield
+        finally:
+            self.exit(frame)
+
+    def _template_names(self) -> list[str]:
+        try:
+            return self._local.template_names  # type: ignore
+        except AttributeError:
+            names: list[str] = []
+            self._local.template_names = names
+            return names
+
+    def _stack(self) -> list[_Frame]:
+        try:
+            return self._local.stack  # type: ignore
+        except AttributeError:
+            stack: list[_Frame] = []
+            self._local.stack = stack
+            return stack
+
+    def _record(self, kind: ProfileKind, name: str) -> ProfileRecord:
+        key = (kind, name)
+        try:
+            return self._records[key]
+        except KeyError:
+            record = ProfileRecord(
+                kind=kind, name=name, template_name="", span=(-1, -1), line=0
+            )
+            return self._records.setdefault(key, record)
+
+    def _node_record(self, node: Node, context: RenderContext) -> ProfileRecord:
+        names = self._template_names()
+        template_name = names[-1] if names else context.template.full_name()
+        token = node.token
+        key = ("node", template_name, token.start, token.stop)
+
+        try:
+            return self._records[key]
+        except KeyError:
+            pass
+
+        record = ProfileRecord(
+            kind="node",
+            name=_node_name(node, token),
+            template_name=template_name,
+            span=(token.start, token.stop),
+            line=line_index(token.source).line_number(token.start),
+        )
+        return self._records.setdefault(key, record)
+
+
+def _node_name(node: Node, token: TokenT) -> str:
+    if is_tag_token(token):
+        return token.name
+    return node.__class__.__name__.removesuffix("Node").lower() or "node"
+
+
+@dataclass(slots=True)
+class SlowRender:
+    """Details of a render that took longer than `Environment.slow_render_threshold`.
+
+    Only sampled renders, as controlled by `Environment.slow_render_sample_rate`,
+    include node, partial and loop records. Unsampled slow renders are reported with
+    `sampled` set to `False` and empty lists.
+    """
+
+    template_name: str
+    """The name of the template that was rendered."""
+
+    duration: float
+    """How long the render took, in seconds."""
+
+    threshold: float
+    """The threshold, in seconds, that the render exceeded."""
+
+    sampled: bool
+    """`True` if the render was profiled."""
+
+    nodes: list[ProfileRecord] = field(default_factory=list)
+    """The slowest nodes by self time, slowest first. At most
+    `Environment.slow_render_top_nodes` nodes are included."""
+
+    partials: list[ProfileRecord] = field(default_factory=list)
+    """Partial templates that were rendered, slowest first by total time."""
+
+    loops: list[ProfileRecord] = field(default_factory=list)
+    """Records for `for` nodes, most iterations first."""
+
+    stack: tuple[str, ...] = ()
+    """The call stack, including partial templates, with the most self time."""
+
+
+def watch_render(
+    template: Template, context: RenderContext
+) -> AbstractContextManager[None]:
+    """Report a `SlowRender` if the block takes longer than the slow render threshold.
+
+    A sample of renders are profiled using a new `RenderProfiler`. Renders using a
+    context that already has a profiler are never sampled. If the environment's
+    `slow_render_threshold` is `None`, a reusable, do-nothing context manager is
+    returned.
+    """
+    if template.env.slow_render_threshold is None:
+        return _NOT_PROFILING
+    return _watch_slow_render(template, context)
+
+
+def profile_partial(
+    template: Template,
+    context: RenderContext,
+    partial: bool,  # noqa: FBT001
+) -> AbstractContextManager[None]:
+    """Time rendering _template_ for the duration of the block.
+
+    Only partial templates rendered with a profiling render context are timed.
+    Otherwise a reusable, do-nothing context manager is returned.
+    """
+    if partial and context.profiler:
+        return context.profiler.partial(template.full_name())
+    return _NOT_PROFILING
+
+
+def profile_load(
+    name: str, context: RenderContext | None
+) -> AbstractContextManager[None]:
+    """Time loading template _name_ for the duration of the block.
+
+    Only templates loaded with a profiling render context are timed. Otherwise a
+    reusable, do-nothing context manager is returned.
+    """
+    if context and context.profiler:
+        return context.profiler.load(name)
+    return _NOT_PROFILING
+
+
+@contextmanager
+def _watch_slow_render(template: Template, context: RenderContext) -> Iterator[None]:
+    env = template.env
+    threshold = env.slow_render_threshold
+    assert threshold is not None
+
+    callback = _slow_render_callback(env)
+
+    if callback is None:
+        yield
+        return
+
+    profiler: RenderProfiler | None = None
+    if not context.profiler and random.random() < env.slow_render_sample_rate:  # noqa: S311
+        profiler = RenderProfiler()
+        context.profiler = profiler
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - start
+        if profiler:
+            context.profiler = None
+
+    if duration <= threshold:
+        return
+
+    if profiler is None:
+        _report(
+            callback,
+            SlowRender(template.full_name(), duration, threshold, sampled=False),
+        )
+        return
+
+    records = profiler.records
+    _report(
+        callback,
+        SlowRender(
+            template.full_name(),
+            duration,
+            threshold,
+            sampled=True,
+            nodes=profiler.report("node", limit=env.slow_render_top_nodes),
+            partials=sorted(
+                (r for r in records if r.kind == "partial"),
+                key=lambda r: r.total_time,
+                reverse=True,
+            ),
+            loops=sorted(
+                (r for r in records if r.iterations),
+                key=lambda r: r.iterations,
+                reverse=True,
+            ),
+            stack=profiler.hottest_stack(),
+        ),
+    )
+
+
+def _slow_render_callback(env: Environment) -> Callable[[SlowRender], None] | None:
+    # Look the callback up without binding it, so a plain function assigned to
+    # `slow_render_callback` on an Environment subclass is not called as a method.
+    for namespace in (vars(env), *(vars(cls) for cls in type(env).__mro__)):
+        if "slow_render_callback" in namespace:
+            return namespace["slow_render_callback"]  # type: ignore
+    return None
+
+
+def _report(callback: Callable[[SlowRender], None], report: SlowRender) -> None:
+    # The render has already succeeded, so errors from the callback are logged
+    # rather than raised.
+    try:
+        callback(report)
+    except Exception:
+        logger.exception("slow render callback failed for %r", report.template_name)
@@ -12,19 +12,22 @@ from typing import TextIO
 from liquid2 import BlockNode
 from liquid2 import Expression
 from liquid2 import Node
+from liquid2 import RenderContext
 from liquid2 import Tag
 from liquid2 import TagToken
 from liquid2 import TokenStream
 from liquid2.builtin import Identifier
 from liquid2.builtin import LoopExpression
+from liquid2.builtin.tags.for_tag import signal_interrupts
+from liquid2.context import Interrupt
 from liquid2.exceptions import BreakLoop
 from liquid2.exceptions import ContinueLoop
 from liquid2.exceptions import LiquidSyntaxError
 from liquid2.limits import to_int
 
 if TYPE_CHECKING:
+    from liquid2 import Environment
     from liquid2 import TokenT
-    from liquid2.context import RenderContext
 
 
 class TablerowNode(Node):
@@ -97,6 +100,10 @@ class TablerowNode(Node):
                 except ContinueLoop:
                     pass
 
+                if context.interrupt:
+                    _break = context.interrupt is Interrupt.BREAK
+                    context.interrupt = None
+
                 character_count += buffer.write("</td>")
 
                 if drop.col_last and not drop.last:
@@ -156,6 +163,10 @@ class TablerowNode(Node):
                 except ContinueLoop:
                     pass
 
+                if context.interrupt:
+                    _break = context.interrupt is Interrupt.BREAK
+                    context.interrupt = None
+
                 character_count += buffer.write("</td>")
 
                 if drop.col_last and not drop.last:
@@ -193,6 +204,12 @@ class TablerowTag(Tag):
 
     node_class = TablerowNode
 
+    def __init__(self, env: Environment):
+        super().__init__(env)
+        # Built the first time we parse a loop, then reused for every loop parsed by
+        # this environment.
+        self._static_context: RenderContext | None = None
+
     def parse(self, stream: TokenStream) -> Node:
         """Parse tokens from _stream_ into an AST node."""
         token = stream.next()
@@ -207,6 +224,7 @@ class TablerowTag(Tag):
         block = BlockNode(
             block_token, self.env.parser.parse_block(stream, end=("endtablerow"))
         )
+        signal_interrupts(block, self._get_static_context())
 
         stream.expect_tag("endtablerow")
         end_tag_token = stream.current()
@@ -219,6 +237,12 @@ class TablerowTag(Tag):
             end_tag_token,
         )
 
+    def _get_static_context(self) -> RenderContext:
+        """Return a render context for walking nodes at parse time."""
+        if self._static_context is None:
+            self._static_context = RenderContext(self.env.template_class(self.env, []))
+        return self._static_context
+
 
 class TableRow(Mapping[str, object]):
     """The _tablerow_ drop."""
@@ -19,6 +19,8 @@ from .builtin import Path
 from .builtin import TernaryFilteredExpression
 from .builtin.tags.case_tag import MultiExpressionBlockNode
 from .context import RenderContext
+from .expression_cache import anchor_token
+from .expression_cache import markup_offset
 from .token import is_lines_token
 from .token import is_tag_token
 
@@ -172,19 +174,24 @@ def _analyze(template: Template, *, include_partials: bool) -> TemplateAnalysis:
 
         # Update variables from node.expressions()
         for expr in node.expressions():
-            _analyze_variables(expr, template_name, scope, globals, variables)
+            # Shared expressions are positioned relative to their markup.
+            offset = markup_offset(expr.token, node.token)
+            _analyze_variables(
+                expr, template_name, scope, globals, variables, offset=offset
+            )
 
             # Update filters from expr
-            for name, span in _extract_filters(expr, template_name):
+            for name, span in _extract_filters(expr, template_name, offset):
                 filters[name].append(span)
 
         # Update the template scope from node.template_scope()
         for ident in node.template_scope():
             scope.add(ident)
+            token = anchor_token(ident.token, node.token)
             locals.add(
                 Variable(
                     segments=[ident],
-                    span=Span(template_name, ident.token.start, ident.token.stop),
+                    span=Span(template_name, token.start, token.stop),
                 )
             )
 
@@ -258,19 +265,24 @@ async def _analyze_async(
 
         # Update variables from node.expressions()
         for expr in node.expressions():
-            _analyze_variables(expr, template_name, scope, globals, variables)
+            # Shared expressions are positioned relative to their markup.
+            offset = markup_offset(expr.token, node.token)
+            _analyze_variables(
+                expr, template_name, scope, globals, variables, offset=offset
+            )
 
             # Update filters from expr
-            for name, span in _extract_filters(expr, template_name):
+            for name, span in _extract_filters(expr, template_name, offset):
                 filters[name].append(span)
 
         # Update the template scope from node.template_scope()
         for ident in node.template_scope():
             scope.add(ident)
+            token = anchor_token(ident.token, node.token)
             locals.add(
                 Variable(
                     segments=[ident],
-                    span=Span(template_name, ident.token.start, ident.token.stop),
+                    span=Span(template_name, token.start, token.stop),
                 )
             )
 
@@ -314,25 +326,25 @@ async def _analyze_async(
 
 
 def _extract_filters(
-    expression: Expression, template_name: str
+    expression: Expression, template_name: str, offset: int = 0
 ) -> Iterable[tuple[str, Span]]:
     if (
         isinstance(expression, (FilteredExpression, TernaryFilteredExpression))
         and expression.filters
     ):
         yield from (
-            (f.name, Span(template_name, f.token.start, f.token.stop))
+            (f.name, Span(template_name, f.token.start + offset, f.token.stop + offset))
             for f in expression.filters
         )
 
     if isinstance(expression, TernaryFilteredExpression) and expression.tail_filters:
         yield from (
-            (f.name, Span(template_name, f.token.start, f.token.stop))
+            (f.name, Span(template_name, f.token.start + offset, f.token.stop + offset))
             for f in expression.tail_filters
         )
 
     for expr in expression.children():
-        yield from _extract_filters(expr, template_name)
+        yield from _extract_filters(expr, template_name, offset)
 
 
 def _analyze_variables(
@@ -341,11 +353,14 @@ def _analyze_variables(
     scope: _StaticScope,
     globals: _VariableMap,
     variables: _VariableMap,
+    *,
+    offset: int = 0,
 ) -> None:
     if isinstance(expression, Path):
+        token = expression.token
         var = Variable(
             segments=_segments(expression, template_name),
-            span=Span(template_name, expression.token.start, expression.token.stop),
+            span=Span(template_name, token.start + offset, token.stop + offset),
         )
 
         # NOTE: We're updating globals and variables here so we can manage scope while
@@ -360,11 +375,15 @@ def _analyze_variables(
     if child_scope := expression.scope():
         scope.push(set(child_scope))
         for expr in expression.children():
-            _analyze_variables(expr, template_name, scope, globals, variables)
+            _analyze_variables(
+                expr, template_name, scope, globals, variables, offset=offset
+            )
         scope.pop()
     else:
         for expr in expression.children():
-            _analyze_variables(expr, template_name, scope, globals, variables)
+            _analyze_variables(
+                expr, template_name, scope, globals, variables, offset=offset
+            )
 
 
 def _segments(path: Path, template_name: str) -> Segments:
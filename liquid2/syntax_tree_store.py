@@ -0,0 +1,82 @@
+"""Share parsed templates between templates with identical source text.
+
+When `Environment.share_syntax_trees` is `True`, templates are looked up by their
+source text and the environment's parser settings before being parsed. Templates
+with the same source text share one syntax tree, whatever their name or path, and
+whichever loader, or loader namespace, they were loaded from.
+
+Syntax trees are held weakly. A tree is kept for as long as at least one template
+is using it, and is discarded when the last of those templates is evicted from a
+cache or otherwise goes out of scope.
+"""
+
+from __future__ import annotations
+
+from threading import Lock
+from typing import TYPE_CHECKING
+from typing import Callable
+from typing import Hashable
+from typing import List
+from weakref import WeakValueDictionary
+
+if TYPE_CHECKING:
+    from .ast import Node
+
+
+class SharedNodes(List["Node"]):
+    """A list of nodes that can be weakly referenced."""
+
+    __slots__ = ("__weakref__",)
+
+
+class SyntaxTreeStore:
+    """A thread safe, content addressed store of parsed templates.
+
+    Attributes:
+        hits: The number of lookups that found an existing syntax tree.
+        misses: The number of lookups that had to parse source text.
+    """
+
+    __slots__ = ("trees", "lock", "hits", "misses")
+
+    def __init__(self) -> None:
+        self.trees: WeakValueDictionary[Hashable, SharedNodes] = WeakValueDictionary()
+        self.lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __reduce__(self) -> tuple[type[SyntaxTreeStore], tuple[()]]:
+        # Syntax trees are not carried over to copies of an environment.
+        return (self.__class__, ())
+
+    def __len__(self) -> int:
+        return len(self.trees)
+
+    def get(self, key: Hashable, parse: Callable[[], list[Node]]) -> list[Node]:
+        """Return the syntax tree for _key_, calling _parse_ if we don't have one.
+
+        _key_ should include the source text being parsed and any settings that
+        change how it is parsed.
+        """
+        with self.lock:
+            nodes = self.trees.get(key)
+            if nodes is not None:
+                self.hits += 1
+                return nodes
+            self.misses += 1
+
+        # Parse without holding the lock. If another thread parses the same source
+        # at the same time, whichever tree is stored first is used by both.
+        parsed = SharedNodes(parse())
+
+        with self.lock:
+            return self.trees.setdefault(key, parsed)
+
+    def clear(self) -> None:
+        """Forget all syntax trees.
+
+        Templates using a shared syntax tree keep it, but new templates will not
+        share it.
+        """
+        with self.lock:
+            self.trees.clear()
@@ -11,12 +11,14 @@ from typing import Awaitable
 from typing import Mapping
 from typing import TextIO
 
-from .context import RenderContext
 from .exceptions import LiquidError
 from .exceptions import LiquidInterrupt
 from .exceptions import LiquidSyntaxError
 from .exceptions import StopRender
+from .optimize import freeze_nodes
 from .output import LimitedStringIO
+from .profiler import profile_partial
+from .profiler import watch_render
 from .static_analysis import Segments
 from .static_analysis import _analyze
 from .static_analysis import _analyze_async
@@ -24,6 +26,7 @@ from .utils import ReadOnlyChainMap
 
 if TYPE_CHECKING:
     from .ast import Node
+    from .context import RenderContext
     from .environment import Environment
     from .loader import UpToDate
     from .static_analysis import TemplateAnalysis
@@ -45,6 +48,7 @@ class Template:
         "global_data",
         "overlay_data",
         "uptodate",
+        "__weakref__",
     )
 
     def __init__(
@@ -81,11 +85,16 @@ class Template:
         _args_ and _kwargs_ are passed to `dict()`.
         """
         buf = self._get_buffer()
-        context = RenderContext(
+        pool = self.env.context_pool
+        context = pool.acquire(
             self,
             global_data=self.make_globals(dict(*args, **kwargs)),
         )
-        self.render_with_context(context, buf)
+        try:
+            with watch_render(self, context):
+                self.render_with_context(context, buf)
+        finally:
+            pool.release(context)
         return buf.getvalue()
 
     async def render_async(self, *args: Any, **kwargs: Any) -> str:
@@ -94,11 +103,16 @@ class Template:
         _args_ and _kwargs_ are passed to `dict()`.
         """
         buf = self._get_buffer()
-        context = RenderContext(
+        pool = self.env.context_pool
+        context = pool.acquire(
             self,
             global_data=self.make_globals(dict(*args, **kwargs)),
         )
-        await self.render_with_context_async(context, buf)
+        try:
+            with watch_render(self, context):
+                await self.render_with_context_async(context, buf)
+        finally:
+            pool.release(context)
         return buf.getvalue()
 
     def render_with_context(
@@ -114,7 +128,7 @@ class Template:
         namespace = dict(*args, **kwargs)
         character_count = 0
 
-        with context.extend(namespace):
+        with context.extend(namespace), profile_partial(self, context, partial):
             for node in self.nodes:
                 try:
                     character_count += node.render(context, buf)
@@ -148,7 +162,7 @@ class Template:
         namespace = dict(*args, **kwargs)
         character_count = 0
 
-        with context.extend(namespace):
+        with context.extend(namespace), profile_partial(self, context, partial):
             for node in self.nodes:
                 try:
                     character_count += await node.render_async(context, buf)
@@ -190,6 +204,18 @@ class Template:
         """An async version of `analyze`."""
         return await _analyze_async(self, include_partials=include_partials)
 
+    def freeze(self) -> None:
+        """Reduce the memory used by this template's syntax tree.
+
+        Tokens already consumed by the parser are discarded, lists of nodes,
+        expressions and variable path segments are replaced with tuples, and
+        names are interned. Frozen templates render, serialize and analyze
+        exactly as before, but their nodes must not be modified.
+
+        Set `Environment.compact_ast` to freeze every template as it is parsed.
+        """
+        freeze_nodes(self.nodes)
+
     def is_up_to_date(self) -> bool:
         """Return _False_ if the template has been modified, _True_ otherwise."""
         if self.uptodate is None:
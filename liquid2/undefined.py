@@ -8,6 +8,7 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 from typing import Any
+from typing import Callable
 from typing import Iterable
 from typing import Iterator
 from typing import Mapping
@@ -25,9 +26,13 @@ class Undefined(Mapping[Any, object]):
     """The default undefined type.
 
     Always evaluates to an empty string. Can be iterated over and indexed without error.
+
+    _hint_ can be a string or a callable returning a string. A callable is not called
+    until the hint is first accessed, so undefined types that never show their hint
+    don't pay for formatting it.
     """
 
-    __slots__ = ("path", "obj", "hint", "token")
+    __slots__ = ("path", "obj", "_hint", "token")
 
     def __init__(
         self,
@@ -35,12 +40,24 @@ class Undefined(Mapping[Any, object]):
         *,
         token: TokenT | None,
         obj: object = UNDEFINED,
-        hint: str | None = None,
+        hint: str | Callable[[], str] | None = None,
     ):
         self.path = path
         self.token = token
         self.obj = obj
-        self.hint = hint
+        self._hint = hint
+
+    @property
+    def hint(self) -> str | None:
+        """A message describing why this variable is undefined, if available."""
+        hint = self._hint
+        if callable(hint):
+            hint = self._hint = hint()
+        return hint
+
+    @hint.setter
+    def hint(self, hint: str | Callable[[], str] | None) -> None:
+        self._hint = hint
 
     def __contains__(self, item: object) -> bool:
         return False
@@ -113,6 +130,7 @@ class StrictUndefined(Undefined):
             "force_liquid_default",
             "name",
             "hint",
+            "_hint",
             "obj",
             "msg",
             "path",
@@ -126,7 +144,7 @@ class StrictUndefined(Undefined):
         *,
         token: TokenT | None,
         obj: object = UNDEFINED,
-        hint: str | None = None,
+        hint: str | Callable[[], str] | None = None,
     ):
         super().__init__(path, token=token, obj=obj, hint=hint)
         self.msg = self.hint if self.hint else f"'{self.path}' is undefined"
@@ -182,6 +200,7 @@ class FalsyStrictUndefined(StrictUndefined):
             "__class__",
             "name",
             "hint",
+            "_hint",
             "obj",
             "msg",
             "force_liquid_default",
@@ -1,15 +1,19 @@
 from .chainmap import ReadOnlyChainMap
 from .html import strip_tags
+from .lines import LineIndex
+from .lines import line_index
 from .lru_cache import LRUCache
 from .lru_cache import ThreadSafeLRUCache
 from .text import truncate_chars
 from .text import truncate_words
 
 __all__ = (
+    "LineIndex",
     "LRUCache",
     "ThreadSafeLRUCache",
     "strip_tags",
     "truncate_chars",
     "truncate_words",
     "ReadOnlyChainMap",
+    "line_index",
 )
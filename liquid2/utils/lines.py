@@ -0,0 +1,73 @@
+"""Find line and column numbers for indexes into source text."""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from functools import lru_cache
+
+# The same line boundaries as `str.splitlines()`.
+RE_LINE_BREAK = re.compile(r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+class LineIndex:
+    """The start offset of each line in some source text.
+
+    Lines are split at the same boundaries as `str.splitlines()`. Build the index
+    once per source string, then look up lines and columns with a binary search.
+
+    Args:
+        source: The text to index.
+    """
+
+    __slots__ = ("source", "starts")
+
+    def __init__(self, source: str):
+        self.source = source
+        length = len(source)
+        self.starts: list[int] = [0]
+        self.starts.extend(
+            match.end()
+            for match in RE_LINE_BREAK.finditer(source)
+            if match.end() < length
+        )
+
+    def __len__(self) -> int:
+        return len(self.starts) if self.source else 0
+
+    def line_number(self, index: int) -> int:
+        """Return the 1-based line number of _index_.
+
+        Raises:
+            ValueError: If _index_ is out of bounds for the source text.
+        """
+        if index >= len(self.source):
+            raise ValueError("index is out of bounds for the given string")
+        return bisect_right(self.starts, index) or 1
+
+    def location(self, index: int) -> tuple[int, int]:
+        """Return the 1-based line number and 0-based column number of _index_.
+
+        Raises:
+            ValueError: If _index_ is out of bounds for the source text.
+        """
+        line_number = self.line_number(index)
+        return line_number, index - self.starts[line_number - 1]
+
+    def line(self, line_number: int) -> str:
+        """Return the text of the 1-based line _line_number_, including its line
+        break, if it has one.
+        """  # noqa: D205
+        start = self.starts[line_number - 1]
+        stop = (
+            self.starts[line_number]
+            if line_number < len(self.starts)
+            else len(self.source)
+        )
+        return self.source[start:stop]
+
+
+@lru_cache(maxsize=128)
+def line_index(source: str) -> LineIndex:
+    """Return a `LineIndex` for _source_, reusing a recently built one if possible."""
+    return LineIndex(source)
@@ -13,7 +13,13 @@ _T = TypeVar("_T")
 
 
 class LRUCache(Generic[_KT, _VT]):
-    """An LRU cache with a mapping interface."""
+    """An LRU cache with a mapping interface.
+
+    Attributes:
+        hits: The number of successful lookups.
+        misses: The number of lookups for keys that are not in the cache.
+        evictions: The number of items removed to make room for new items.
+    """
 
     def __init__(self, capacity: int):
         if capacity < 1:
@@ -21,10 +27,19 @@ class LRUCache(Generic[_KT, _VT]):
 
         self.capacity = capacity
         self._cache: OrderedDict[_KT, _VT] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def __getitem__(self, key: _KT) -> _VT:
-        value = self._cache[key]  # This will raise a KeyError if key is not cached
+        try:
+            value = self._cache[key]
+        except KeyError:
+            self.misses += 1
+            raise
+
         self._cache.move_to_end(key)
+        self.hits += 1
         return value
 
     def __setitem__(self, key: _KT, value: _VT) -> None:
@@ -33,6 +48,7 @@ class LRUCache(Generic[_KT, _VT]):
         except KeyError:
             if len(self._cache) >= self.capacity:
                 self._cache.popitem(last=False)
+                self.evictions += 1
 
         self._cache[key] = value
 
@@ -48,6 +64,10 @@ class LRUCache(Generic[_KT, _VT]):
     def __contains__(self, key: _KT) -> bool:
         return key in self._cache
 
+    def clear(self) -> None:
+        """Remove all items from the cache."""
+        self._cache.clear()
+
     @overload
     def get(self, key: _KT) -> _VT | None: ...
     @overload
@@ -81,6 +101,16 @@ class ThreadSafeLRUCache(LRUCache[_KT, _VT]):
         super().__init__(capacity)
         self._lock = Lock()
 
+    def __getstate__(self) -> dict[str, object]:
+        # Locks can't be pickled. A new one is created when unpickling.
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._lock = Lock()
+
     def __getitem__(self, key: _KT) -> _VT:
         with self._lock:
             return super().__getitem__(key)
@@ -97,6 +127,11 @@ class ThreadSafeLRUCache(LRUCache[_KT, _VT]):
         with self._lock:
             return super().__contains__(key)
 
+    def clear(self) -> None:
+        """Remove all items from the cache."""
+        with self._lock:
+            super().clear()
+
     @overload
     def get(self, key: _KT) -> _VT | None: ...
     @overload
@@ -0,0 +1,162 @@
+"""Load and parse many templates ahead of time, optionally using a process pool."""
+
+from __future__ import annotations
+
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fnmatch import fnmatchcase
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Iterable
+
+from .builtin.loaders.mixins import CachingLoaderMixin
+from .exceptions import LiquidError
+
+if TYPE_CHECKING:
+    from .environment import Environment
+
+# The environment and loader arguments each worker process loads templates with.
+# Set once by `_init_worker`.
+_worker_env: Environment | None = None
+_worker_kwargs: dict[str, Any] = {}
+
+
+def _init_worker(env: Environment, kwargs: dict[str, Any]) -> None:
+    global _worker_env, _worker_kwargs  # noqa: PLW0603
+    _worker_env = env
+    _worker_kwargs = kwargs
+
+
+def _load(name: str) -> tuple[str, bytes | None, Exception | None]:
+    """Load template _name_ in a worker process.
+
+    Returns:
+        A (name, data, error) tuple. _data_ is a pickled tuple of template
+        source text, nodes, name, path, overlay data, `uptodate` function and load
+        time, or `None` if loading failed or the template can't be pickled.
+    """
+    assert _worker_env is not None
+    start = time.perf_counter()
+
+    try:
+        template = _worker_env.get_template(name, **_worker_kwargs)
+    except Exception as err:  # noqa: BLE001
+        return name, None, _picklable(err)
+
+    # Only the source text, syntax tree and loader metadata are sent back. The
+    # parent process has its own environment. All of a template's tokens share
+    # its source text.
+    source = template.nodes[0].token.source if template.nodes else ""
+
+    try:
+        data = pickle.dumps(
+            (
+                source,
+                template.nodes,
+                template.name,
+                template.path,
+                template.overlay_data,
+                template.uptodate,
+                time.perf_counter() - start,
+            )
+        )
+    except Exception:  # noqa: BLE001
+        # Probably an `uptodate` function that can't be pickled. The parent
+        # process will load this one itself.
+        return name, None, None
+
+    return name, data, None
+
+
+def _picklable(err: Exception) -> Exception:
+    try:
+        pickle.dumps(err)
+    except Exception:  # noqa: BLE001
+        return LiquidError(f"{err.__class__.__name__}: {err}", token=None)
+    return err
+
+
+def warm(
+    env: Environment,
+    names: str | Iterable[str] | None = None,
+    *,
+    workers: int | None = None,
+    **kwargs: Any,
+) -> dict[str, Exception]:
+    """Load and parse templates so they are ready before they are first rendered.
+
+    See [Environment.warm][liquid2.Environment.warm].
+    """
+    if names is None:
+        template_names = env.loader.list_templates()
+    elif isinstance(names, str):
+        template_names = [
+            name for name in env.loader.list_templates() if fnmatchcase(name, names)
+        ]
+    else:
+        template_names = list(names)
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    errors: dict[str, Exception] = {}
+
+    if workers < 2 or len(template_names) < 2:  # noqa: PLR2004
+        for name in template_names:
+            _load_in_process(env, name, errors, kwargs)
+        return errors
+
+    loader = env.loader
+    chunksize = max(1, len(template_names) // (workers * 4))
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(env, kwargs)
+    ) as executor:
+        for name, data, error in executor.map(
+            _load, template_names, chunksize=chunksize
+        ):
+            if error is not None:
+                errors[name] = error
+            elif data is None:
+                _load_in_process(env, name, errors, kwargs)
+            # Without a cache there's nowhere to keep the template, but parsing
+            # in worker processes still reports errors.
+            elif isinstance(loader, CachingLoaderMixin):
+                (
+                    source,
+                    nodes,
+                    template_name,
+                    path,
+                    overlay_data,
+                    uptodate,
+                    load_time,
+                ) = pickle.loads(data)  # noqa: S301
+
+                template = env.template_class(
+                    env,
+                    # Use an existing syntax tree for the same source, if the
+                    # environment has one, like `from_string()` does.
+                    env.adopt_nodes(source, nodes, name=template_name, path=path),
+                    name=template_name,
+                    path=path,
+                    global_data=env.make_globals(),
+                    overlay_data=overlay_data,
+                )
+                template.uptodate = uptodate
+                loader.cache_template(name, template, load_time=load_time, **kwargs)
+
+    return errors
+
+
+def _load_in_process(
+    env: Environment,
+    name: str,
+    errors: dict[str, Exception],
+    kwargs: dict[str, Any],
+) -> None:
+    try:
+        env.get_template(name, **kwargs)
+    except Exception as err:  # noqa: BLE001
+        errors[name] = err
@@ -0,0 +1,83 @@
+"""Check that scanning and parsing time grows linearly with template size.
+
+Each template from `worst_case_corpus.py` is parsed at a range of sizes, each
+double the last. We estimate how time grows with size, time ~ size ** k, from the
+smallest and largest sizes. If _k_ is much more than 1, the case is reported as
+superlinear and we exit with a non-zero status.
+
+```
+python performance/worst_case_benchmark.py
+```
+"""
+
+import gc
+import math
+import sys
+import time
+from contextlib import suppress
+
+from worst_case_corpus import CORPUS
+
+from liquid2 import Environment
+from liquid2.exceptions import LiquidError
+
+SIZES = [20_000, 40_000, 80_000, 160_000]
+
+# The largest acceptable growth exponent. Linear is 1, quadratic is 2. Timings
+# are noisy, so we allow some slack.
+MAX_EXPONENT = 1.3
+
+# Don't bother with timings shorter than this.
+MIN_TIME = 0.002
+
+
+def parse_time(env: Environment, source: str, repeat: int = 3) -> float:
+    # Like timeit, disable garbage collection so it doesn't skew timings.
+    gc.disable()
+    best = float("inf")
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            with suppress(LiquidError, RecursionError):
+                env.parse(source)
+            best = min(best, time.perf_counter() - start)
+    finally:
+        gc.enable()
+    return best
+
+
+def growth_exponent(times: list[float]) -> float:
+    first = next((i for i, t in enumerate(times) if t >= MIN_TIME), len(times))
+    if first >= len(times) - 1:
+        return 0.0
+    return math.log(times[-1] / times[first]) / math.log(SIZES[-1] / SIZES[first])
+
+
+def benchmark(env: Environment) -> list[str]:
+    superlinear: list[str] = []
+
+    for name, generate in CORPUS.items():
+        times = [parse_time(env, generate(size)) for size in SIZES]
+        exponent = growth_exponent(times)
+        verdict = "ok" if exponent <= MAX_EXPONENT else "SUPERLINEAR"
+
+        if exponent > MAX_EXPONENT:
+            superlinear.append(name)
+
+        timings = ", ".join(f"{t * 1000:.1f}ms" for t in times)
+        print(f"{name:>32}: {timings} (exponent {exponent:.2f}) {verdict}")
+
+    return superlinear
+
+
+def main() -> None:
+    print(f"Sizes: {', '.join(str(s) for s in SIZES)}")
+    superlinear = benchmark(Environment())
+
+    if superlinear:
+        print(f"\n{len(superlinear)} superlinear case(s): {', '.join(superlinear)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Generate adversarial template sources for worst case lexer and parser benchmarks.
+
+Each generator takes a size, roughly the length of the source it returns, and
+builds a template that has been, or could be, slow to scan or parse. Most of them
+are malformed, so we're interested in how long it takes to fail, not the result.
+
+Run this module to write the corpus to a directory, one file per case:
+
+```
+python performance/worst_case_corpus.py performance/fixtures/worst_case 100000
+```
+"""
+
+import sys
+from pathlib import Path
+from typing import Callable
+
+
+def unterminated_comments(size: int) -> str:
+    return "{#" * (size // 2)
+
+
+def unterminated_comments_with_text(size: int) -> str:
+    return "{# x " * (size // 5)
+
+
+def long_comment_hashes(size: int) -> str:
+    return "{" + "#" * size + "x#}"
+
+
+def unclosed_long_comment_hashes(size: int) -> str:
+    return "{" + "#" * size
+
+
+def unterminated_inline_comments(size: int) -> str:
+    return "{% #" * (size // 4)
+
+
+def unterminated_raw_tags(size: int) -> str:
+    return "{% raw %}" * (size // 9)
+
+
+def unterminated_block_comment(size: int) -> str:
+    return "{% comment %}" + "{%comment " * (size // 10)
+
+
+def unterminated_comment_tags(size: int) -> str:
+    return "{% comment x " * (size // 13)
+
+
+def nested_block_comments(size: int) -> str:
+    n = size // 27
+    return "{% comment %}" * n + "{% endcomment %}" * n
+
+
+def output_storm(size: int) -> str:
+    return "{{" * (size // 2)
+
+
+def tag_storm(size: int) -> str:
+    return "{%" * (size // 2)
+
+
+def long_line_of_braces(size: int) -> str:
+    return "{" * size
+
+
+def braces_and_spaces(size: int) -> str:
+    return "{ " * (size // 2)
+
+
+def unclosed_output_whitespace(size: int) -> str:
+    return "{{" + " " * size
+
+
+def unclosed_tag_whitespace(size: int) -> str:
+    return ("{%" + " " * 20) * (size // 22)
+
+
+def unclosed_strings(size: int) -> str:
+    return "{{ '" + "a" * size
+
+
+def many_template_strings(size: int) -> str:
+    return "{{ '" + "${a}" * (size // 4) + "' }}"
+
+
+def many_output_statements(size: int) -> str:
+    return "{{ a.b | upcase }}" * (size // 18)
+
+
+def deep_blocks(size: int) -> str:
+    # Deep enough to exercise the parser without hitting Python's recursion limit.
+    n = min(size // 21, 100)
+    block = "{% if a %}" * n + "x" + "{% endif %}" * n
+    return block * max(1, size // (21 * n))
+
+
+def long_boolean_expressions(size: int) -> str:
+    n = min(size // 6, 100)
+    tag = "{% if " + " and ".join(["a"] * n) + " %}x{% endif %}"
+    return tag * max(1, size // len(tag))
+
+
+def long_liquid_tag(size: int) -> str:
+    return "{% liquid\n" + "echo a\n" * (size // 7) + "%}"
+
+
+def long_filter_chain(size: int) -> str:
+    return "{{ a" + " | upcase" * (size // 9) + " }}"
+
+
+def many_elsif(size: int) -> str:
+    return "{% if a %}" + "{% elsif b %}x" * (size // 14) + "{% endif %}"
+
+
+CORPUS: dict[str, Callable[[int], str]] = {
+    "unterminated_comments": unterminated_comments,
+    "unterminated_comments_with_text": unterminated_comments_with_text,
+    "long_comment_hashes": long_comment_hashes,
+    "unclosed_long_comment_hashes": unclosed_long_comment_hashes,
+    "unterminated_inline_comments": unterminated_inline_comments,
+    "unterminated_raw_tags": unterminated_raw_tags,
+    "unterminated_block_comment": unterminated_block_comment,
+    "unterminated_comment_tags": unterminated_comment_tags,
+    "nested_block_comments": nested_block_comments,
+    "output_storm": output_storm,
+    "tag_storm": tag_storm,
+    "long_line_of_braces": long_line_of_braces,
+    "braces_and_spaces": braces_and_spaces,
+    "unclosed_output_whitespace": unclosed_output_whitespace,
+    "unclosed_tag_whitespace": unclosed_tag_whitespace,
+    "unclosed_strings": unclosed_strings,
+    "many_template_strings": many_template_strings,
+    "many_output_statements": many_output_statements,
+    "deep_blocks": deep_blocks,
+    "long_boolean_expressions": long_boolean_expressions,
+    "long_liquid_tag": long_liquid_tag,
+    "long_filter_chain": long_filter_chain,
+    "many_elsif": many_elsif,
+}
+
+
+def main() -> None:
+    path = Path(sys.argv[1])
+    size = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000  # noqa: PLR2004
+    path.mkdir(parents=True, exist_ok=True)
+
+    for name, generate in CORPUS.items():
+        (path / f"{name}.liquid").write_text(generate(size))
+
+    print(f"wrote {len(CORPUS)} templates to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import asyncio
+import math
+import pickle
+
+from liquid2 import CacheEvent
+from liquid2 import CachingDictLoader
+from liquid2 import Environment
+from liquid2.builtin.loaders.mixins import CachingLoaderMixin
+
+TEMPLATES = {
+    "a": "Hello, {{ you }}!",
+    "b": "the quick brown {{ animal | default: 'fox' }}",
+    "c": "café",
+}
+
+
+def test_hits_misses_and_evictions() -> None:
+    loader = CachingDictLoader(TEMPLATES, capacity=2)
+    env = Environment(loader=loader)
+    env.get_template("a")
+    env.get_template("a")
+    env.get_template("b")
+    env.get_template("c")
+
+    stats = loader.cache_stats()
+    assert stats.hits == 1
+    assert stats.misses == 3  # noqa: PLR2004
+    assert stats.reloads == 0
+    assert stats.evictions == 1
+    assert stats.uptodate_checks == 1
+    assert stats.size == 2  # noqa: PLR2004
+    assert stats.capacity == 2  # noqa: PLR2004
+    assert stats.hit_rate == 0.25  # noqa: PLR2004
+
+
+def test_source_bytes_and_load_time_histogram() -> None:
+    loader = CachingDictLoader(TEMPLATES)
+    env = Environment(loader=loader)
+    env.get_template("a")
+    env.get_template("c")
+    env.get_template("c")
+
+    stats = loader.cache_stats()
+    assert stats.source_bytes == len("Hello, {{ you }}!") + len("café".encode())
+    assert stats.load_time > 0
+    assert list(stats.load_time_histogram) == [
+        *CachingLoaderMixin.load_time_buckets,
+        math.inf,
+    ]
+    assert sum(stats.load_time_histogram.values()) == 2  # noqa: PLR2004
+
+
+def test_reloads() -> None:
+    loader = CachingDictLoader(TEMPLATES)
+    env = Environment(loader=loader)
+    template = env.get_template("a")
+    template.uptodate = lambda: False
+    assert env.get_template("a") is not template
+
+    stats = loader.cache_stats()
+    assert (stats.hits, stats.misses, stats.reloads) == (0, 1, 1)
+    assert stats.uptodate_checks == 1
+
+
+def test_reset_cache_stats() -> None:
+    loader = CachingDictLoader(TEMPLATES, capacity=1)
+    env = Environment(loader=loader)
+    env.get_template("a")
+    env.get_template("b")
+    loader.reset_cache_stats()
+
+    stats = loader.cache_stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.source_bytes) == (
+        0,
+        0,
+        0,
+        0,
+    )
+    assert stats.size == 1
+
+
+def test_stats_callback() -> None:
+    events: list[CacheEvent] = []
+    loader = CachingDictLoader(TEMPLATES, capacity=1, stats_callback=events.append)
+    env = Environment(loader=loader)
+    env.get_template("a")
+    env.get_template("a")
+    env.get_template("b")
+
+    assert [(e.kind, e.key) for e in events] == [
+        ("miss", "a"),
+        ("hit", "a"),
+        ("miss", "b"),
+        ("eviction", "b"),
+    ]
+    assert events[0].source_bytes == len(TEMPLATES["a"])
+    assert events[1].load_time == 0
+
+
+def test_stats_async() -> None:
+    events: list[CacheEvent] = []
+    loader = CachingDictLoader(
+        TEMPLATES, namespace_key="uid", stats_callback=events.append
+    )
+    env = Environment(loader=loader)
+
+    async def coro() -> None:
+        await env.get_template_async("a", uid="x")
+        await env.get_template_async("a", uid="x")
+        await env.get_template_async("a", uid="y")
+
+    asyncio.run(coro())
+    assert [(e.kind, e.key) for e in events] == [
+        ("miss", "x/a"),
+        ("hit", "x/a"),
+        ("miss", "y/a"),
+    ]
+
+
+class ThreadSafeCachingDictLoader(CachingDictLoader):
+    def __init__(self, templates: dict[str, str]) -> None:
+        CachingLoaderMixin.__init__(self, thread_safe=True)
+        self.templates = templates
+
+
+def test_pickle_thread_safe_caching_loader() -> None:
+    loader = ThreadSafeCachingDictLoader(TEMPLATES)
+    Environment(loader=loader).get_template("a")
+    unpickled = pickle.loads(pickle.dumps(loader))  # noqa: S301
+    assert unpickled.cache_stats().misses == 1
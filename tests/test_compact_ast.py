@@ -0,0 +1,122 @@
+import pickle
+
+import pytest
+
+from liquid2 import DictLoader
+from liquid2 import Environment
+from liquid2 import OutputToken
+from liquid2 import TagToken
+from liquid2.builtin import FilteredExpression
+from liquid2.builtin import Path
+from liquid2.builtin.output import OutputNode
+from liquid2.builtin.tags.if_tag import IfNode
+from liquid2.exceptions import LiquidTypeError
+
+SOURCE = """\
+{% assign greeting = 'Hello' | append: ', ' %}
+{%- for product in collection.products limit: 2 -%}
+  {% if product.available and product.tags contains 'sale' %}
+    {{- greeting }}{{ product.title | upcase | default: 'untitled' }}
+  {% elsif product['price'] > 10 %}{{ product.variants[0].title }}
+  {% else %}{% render 'product', product: product %}{% endif %}
+{%- endfor %}
+{% liquid
+  # comment
+  if collection.title
+    echo collection.title | downcase
+  endif
+%}{% translate x: 'y' %}Hello, {{ x }}!{% endtranslate %}"""
+
+DATA = {
+    "collection": {
+        "title": "Shoes",
+        "products": [
+            {"title": "a", "available": True, "tags": ["sale"], "price": 5},
+            {
+                "title": "b",
+                "available": False,
+                "price": 20,
+                "variants": [{"title": "c"}],
+            },
+        ],
+    }
+}
+
+
+LOADER = DictLoader({"product": "{{ product.title }}"})
+
+
+class MockEnvironment(Environment):
+    compact_ast = True
+
+
+def test_frozen_templates_render_serialize_and_analyze_the_same() -> None:
+    env = Environment(loader=LOADER)
+    template = env.from_string(SOURCE)
+    want = (template.render(**DATA), str(template), template.analyze())
+
+    template.freeze()
+    assert (template.render(**DATA), str(template), template.analyze()) == want
+
+    # Freezing is idempotent.
+    template.freeze()
+    assert template.render(**DATA) == want[0]
+
+
+def test_freeze_discards_parsed_expression_tokens() -> None:
+    template = Environment().from_string("{{ a.b | upcase }}{% if x %}{% endif %}")
+    output, if_node = template.nodes
+    assert isinstance(output, OutputNode)
+    assert isinstance(if_node, IfNode)
+    assert isinstance(output.token, OutputToken)
+    assert isinstance(if_node.token, TagToken)
+
+    template.freeze()
+    assert not output.token.expression
+    assert not if_node.token.expression
+
+    expression = output.expression
+    assert isinstance(expression, FilteredExpression)
+    assert isinstance(expression.filters, tuple)
+    assert isinstance(expression.left, Path)
+    assert expression.left.path == ("a", "b")
+    assert expression.left.path is expression.left.static_path
+    assert isinstance(if_node.consequence.nodes, tuple)
+
+
+def test_names_are_shared_between_frozen_templates() -> None:
+    env = MockEnvironment()
+    a = env.from_string("{{ 'x' | " + "upcase" + " }}{{ product.title }}")
+    b = env.from_string("{{ product.title }}{{ 'y' | " + "up" + "case }}")
+    a_filter, a_path = a.nodes
+    b_path, b_filter = b.nodes
+    assert isinstance(a_filter, OutputNode)
+    assert isinstance(b_filter, OutputNode)
+    assert isinstance(a_filter.expression, FilteredExpression)
+    assert isinstance(b_filter.expression, FilteredExpression)
+    assert a_filter.expression.filters[0].name is b_filter.expression.filters[0].name
+    assert isinstance(a_path, OutputNode)
+    assert isinstance(b_path, OutputNode)
+    assert isinstance(a_path.expression, FilteredExpression)
+    assert isinstance(b_path.expression, FilteredExpression)
+    a_segments = a_path.expression.left.path  # type: ignore
+    b_segments = b_path.expression.left.path  # type: ignore
+    assert all(x is y for x, y in zip(a_segments, b_segments, strict=True))
+
+
+def test_errors_from_frozen_templates() -> None:
+    source = "Hello\n{{ x | divided_by: 0 }}"
+    template = MockEnvironment().from_string(source)
+
+    with pytest.raises(LiquidTypeError) as info:
+        template.render(x=1)
+
+    token = info.value.token
+    assert token is not None
+    assert source[token.start : token.stop] == "divided_by"
+
+
+def test_pickle_frozen_template() -> None:
+    template = MockEnvironment(loader=LOADER).from_string(SOURCE)
+    unpickled = pickle.loads(pickle.dumps(template))  # noqa: S301
+    assert unpickled.render(**DATA) == template.render(**DATA)
@@ -0,0 +1,230 @@
+import asyncio
+from io import StringIO
+from typing import Callable
+
+import pytest
+
+from liquid2 import Environment
+from liquid2 import RenderContext
+from liquid2 import Template
+from liquid2 import TokenT
+from liquid2.builtin import ConstantExpression
+from liquid2.builtin import FilteredExpression
+from liquid2.builtin.output import OutputNode
+from liquid2.exceptions import LiquidTypeError
+from liquid2.exceptions import UnknownFilterError
+from liquid2.filter import pure
+from liquid2.filter import with_context
+from liquid2.optimize import FoldedNode
+from liquid2.optimize import StaticBlockNode
+
+
+class MockEnvironment(Environment):
+    constant_folding = True
+
+
+def _render(template: Template, **data: object) -> str:
+    result = template.render(**data)
+
+    async def coro() -> str:
+        return await template.render_async(**data)
+
+    assert asyncio.run(coro()) == result
+    return result
+
+
+SOURCES = [
+    "{{ 'Add to cart' | upcase }}",
+    "{{ 'a,b,c' | split: ',' | join: '-' | append: x }}",
+    "{{ 'a,b,c' | split: ',' | first | append: x }}",
+    "{% if true %}a{% elsif x %}b{% else %}c{% endif %}",
+    "{% if false %}a{% elsif 1 > 2 %}b{% else %}c{% endif %}",
+    "{% if false %}a{% elsif x %}b{% else %}c{% endif %}",
+    "{% unless true %}a{% else %}b{% endunless %}",
+    "{% case 'x' %}{% when 'y' %}a{% else %}b{% endcase %}",
+    "{% case 'x' %}{% when 'x' %}a{% when 'x', 'y' %}b{% else %}c{% endcase %}",
+    "{% for i in (1..3) %}{{ i }}{% endfor %}",
+    "{% assign y = 'hello' | capitalize %}{{ y }}",
+    "{{ 'hi' if true else 'bye' | upcase }}",
+    "{{ '${\"a\" | upcase}-b' }}",
+    "{{ x | default: 'x' | upcase }}",
+    "a {{- 'b' -}} c",
+]
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_same_output_and_serialization(source: str) -> None:
+    env = Environment()
+    folding_env = MockEnvironment()
+    template = env.from_string(source)
+    folded = folding_env.from_string(source)
+    assert _render(folded, x="!") == _render(template, x="!")
+    assert str(folded) == str(template)
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_same_static_analysis(source: str) -> None:
+    analysis = Environment().from_string(source).analyze()
+    folded_analysis = MockEnvironment().from_string(source).analyze()
+    assert folded_analysis.variables == analysis.variables
+    assert folded_analysis.filters == analysis.filters
+    assert folded_analysis.tags == analysis.tags
+
+
+def test_fold_pure_filters() -> None:
+    env = MockEnvironment()
+    template = env.from_string("{{ 'Add to cart' | upcase }}")
+    node = template.nodes[0]
+    assert isinstance(node, OutputNode)
+    assert isinstance(node.expression, ConstantExpression)
+    assert node.expression.value == "ADD TO CART"
+
+
+def test_fold_leading_pure_filters() -> None:
+    env = MockEnvironment()
+    template = env.from_string("{{ 'a,b' | split: ',' | first | append: x }}")
+    node = template.nodes[0]
+    assert isinstance(node, OutputNode)
+    assert isinstance(node.expression, FilteredExpression)
+    assert isinstance(node.expression.left, ConstantExpression)
+    assert node.expression.left.value == "a"
+    assert node.expression.filters
+    assert [f.name for f in node.expression.filters] == ["append"]
+
+
+def test_mutable_values_are_not_folded() -> None:
+    env = MockEnvironment()
+    template = env.from_string("{% assign x = 'a,b' | split: ',' %}")
+    (expression,) = template.nodes[0].expressions()
+    assert not isinstance(expression, ConstantExpression)
+
+
+def test_pure_filters_are_called_once() -> None:
+    calls: list[str] = []
+
+    @pure
+    def shout(val: str) -> str:
+        calls.append(val)
+        return val.upper() + "!"
+
+    env = MockEnvironment()
+    env.filters["shout"] = shout
+    template = env.from_string("{{ 'hi' | shout }}")
+    assert calls == ["hi"]
+    assert _render(template) == "HI!"
+    assert _render(template) == "HI!"
+    assert calls == ["hi"]
+
+
+def test_impure_filters_are_not_folded() -> None:
+    calls: list[str] = []
+
+    def shout(val: str) -> str:
+        calls.append(val)
+        return val.upper() + "!"
+
+    @pure
+    @with_context
+    def shout_with_context(val: str, *, context: object) -> str:  # noqa: ARG001
+        calls.append(val)
+        return val.upper() + "!"
+
+    env = MockEnvironment()
+    env.filters["shout"] = shout
+    env.filters["shout_with_context"] = shout_with_context
+    template = env.from_string("{{ 'hi' | shout }}{{ 'bye' | shout_with_context }}")
+    assert calls == []
+    assert _render(template) == "HI!BYE!"
+
+
+def test_errors_are_raised_at_render_time() -> None:
+    env = MockEnvironment()
+    template = env.from_string("{{ 1 | divided_by: 0 }}")
+
+    with pytest.raises(LiquidTypeError):
+        template.render()
+
+
+def test_dead_branches() -> None:
+    env = MockEnvironment()
+    template = env.from_string(
+        "{% if false %}a{% elsif 2 > 1 %}b{% else %}c{% endif %}"
+        "{% unless true %}a{% endunless %}"
+        "{% case 1 %}{% when 2 %}a{% else %}b{% endcase %}"
+    )
+
+    assert all(isinstance(node, FoldedNode) for node in template.nodes)
+    assert _render(template) == "bb"
+
+
+def test_non_constant_branches_are_kept() -> None:
+    env = MockEnvironment()
+    template = env.from_string(
+        "{% if x %}a{% elsif true %}b{% endif %}"
+        "{% case 1 %}{% when 1 %}a{% when 1 %}b{% endcase %}"
+    )
+
+    assert not any(isinstance(node, FoldedNode) for node in template.nodes)
+    assert _render(template, x=True) == "aab"
+
+
+def test_merge_static_nodes() -> None:
+    env = MockEnvironment()
+    template = env.from_string(
+        "Hello, {{ 'world' | capitalize }}! {% if x %}{{ 'a' }} {{ 'b' }}{% endif %}"
+    )
+    node = template.nodes[0]
+    assert isinstance(node, StaticBlockNode)
+    assert node.text == "Hello, World! "
+    assert len(template.nodes) == 2  # noqa: PLR2004
+    assert _render(template, x=True) == "Hello, World! a b"
+
+
+def test_fold_with_auto_escape() -> None:
+    source = "{{ '<b>' | append: '</b>' }}{{ x | append: '<i>' }}{{ '<i>' | escape }}"
+    template = Environment(auto_escape=True).from_string(source)
+    folded = MockEnvironment(auto_escape=True).from_string(source)
+    assert _render(folded, x="<p>") == _render(template, x="<p>")
+    assert _render(folded, x="<p>") == "<b></b>&lt;p&gt;<i>&lt;i&gt;"
+
+
+REPLACED_FILTER_SOURCES = [
+    "{{ 'hello' | upcase }}",
+    "Hello, {{ 'world' | upcase }}!",
+    "{{ 'a' | upcase | append: x }}",
+    "{% if '${'a' | upcase}' == 'A' %}a{% else %}b{% endif %}",
+    "{% unless '${'a' | upcase}' == 'A' %}a{% else %}b{% endunless %}",
+    "{% case '${'a' | upcase}' %}{% when 'a' %}a{% else %}b{% endcase %}",
+    "{% assign y = 'hello' | upcase %}{{ y }}",
+]
+
+
+@pytest.mark.parametrize("source", REPLACED_FILTER_SOURCES)
+def test_replace_folded_filter_after_parsing(source: str) -> None:
+    env = Environment()
+    folded_env = MockEnvironment()
+    template = env.from_string(source)
+    folded = folded_env.from_string(source)
+
+    env.filters["upcase"] = lambda _: "REPLACED"
+    folded_env.filters["upcase"] = lambda _: "REPLACED"
+    assert _render(folded, x="!") == _render(template, x="!")
+
+
+class DenyingRenderContext(RenderContext):
+    """A render context that doesn't allow any filters."""
+
+    def filter(self, name: str, *, token: TokenT) -> Callable[..., object]:
+        raise UnknownFilterError(f"filter '{name}' is not allowed", token=token)
+
+
+@pytest.mark.parametrize("source", REPLACED_FILTER_SOURCES)
+def test_render_context_can_deny_folded_filters(source: str) -> None:
+    template = MockEnvironment().from_string(source)
+    context = DenyingRenderContext(template, global_data={"x": "!"})
+
+    with pytest.raises(UnknownFilterError):
+        template.render_with_context(context, StringIO())
+
+    with pytest.raises(UnknownFilterError):
+        asyncio.run(template.render_with_context_async(context, StringIO()))
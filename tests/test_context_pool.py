@@ -0,0 +1,117 @@
+import asyncio
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+from liquid2 import DictLoader
+from liquid2 import Environment
+from liquid2 import RenderContext
+from liquid2.context import RenderContextPool
+
+
+class MockEnvironment(Environment):
+    context_pool_size = 4
+
+
+def test_contexts_are_not_pooled_by_default() -> None:
+    env = Environment()
+    template = env.from_string("Hello, {{ you }}!")
+    assert template.render(you="World") == "Hello, World!"
+    assert len(env.context_pool) == 0
+
+
+def test_reuse_render_context() -> None:
+    env = MockEnvironment()
+    template = env.from_string("Hello, {{ you }}!")
+    assert template.render(you="World") == "Hello, World!"
+    assert len(env.context_pool) == 1
+    assert template.render(you="Liquid") == "Hello, Liquid!"
+    assert len(env.context_pool) == 1
+
+
+def test_reuse_render_context_async() -> None:
+    env = MockEnvironment()
+    template = env.from_string("Hello, {{ you }}!")
+
+    async def coro() -> str:
+        return await template.render_async(you="World")
+
+    assert asyncio.run(coro()) == "Hello, World!"
+    assert len(env.context_pool) == 1
+
+
+def test_pooled_contexts_do_not_leak_state() -> None:
+    env = MockEnvironment(
+        loader=DictLoader({"base": "{% block content %}{% endblock %}"})
+    )
+    template = env.from_string(
+        "{% macro 'm' %}m{% endmacro %}"
+        "{% assign x = x | default: 0 | plus: 1 %}{{ x }}"
+        "{% increment y %}{% cycle 'a', 'b' %}"
+        "{% for i in (1..3) %}{% break %}{% endfor %}"
+        "{% for i in (1..3) %}{{ i }}{% endfor %}"
+        "{% call 'm' %}"
+    )
+
+    assert template.render() == "10a123m"
+    assert template.render() == "10a123m"
+
+    child = env.from_string(
+        "{% extends 'base' %}{% block content %}{{ you }}{% endblock %}"
+    )
+    assert child.render(you="World") == "World"
+    assert child.render(you="Liquid") == "Liquid"
+
+
+def test_pooled_contexts_release_render_data() -> None:
+    env = MockEnvironment()
+    template = env.from_string("{% assign x = you %}{{ x }}")
+    assert template.render(you="World") == "World"
+
+    context = env.context_pool.acquire(template)
+    assert dict(context.locals) == {}
+    assert "you" not in context.globals
+
+
+def test_pool_size_is_bounded() -> None:
+    env = Environment()
+    template = env.from_string("")
+    pool = RenderContextPool(2)
+    contexts = [pool.acquire(template) for _ in range(3)]
+    for context in contexts:
+        pool.release(context)
+    assert len(pool) == 2
+
+
+def test_share_pool_between_threads() -> None:
+    env = MockEnvironment()
+    template = env.from_string(
+        "{% for i in (1..n) %}{% cycle 'a', 'b' %}{% increment x %}{% endfor %}"
+    )
+
+    def render(n: int) -> str:
+        return template.render(n=n)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(render, [i % 5 for i in range(200)]))
+
+    assert results == [render(i % 5) for i in range(200)]
+    assert len(env.context_pool) <= MockEnvironment.context_pool_size
+
+
+def test_tag_namespaces_are_created_on_demand() -> None:
+    env = Environment()
+    context = RenderContext(env.from_string(""))
+    assert dict(context.tag_namespace) == {}
+    assert context.cycle(1, 2) == 0
+    assert set(context.tag_namespace) == {"cycles"}
+    assert context.tag_namespace.get("macros") is None
+    assert context.tag_namespace["extends"]["foo"] == []
+
+
+def test_pickle_environment_with_context_pool() -> None:
+    env = MockEnvironment()
+    env.from_string("Hello").render()
+    assert len(env.context_pool) == 1
+    unpickled = pickle.loads(pickle.dumps(env))  # noqa: S301
+    assert unpickled.context_pool.size == MockEnvironment.context_pool_size
+    assert len(unpickled.context_pool) == 0
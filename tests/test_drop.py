@@ -1,11 +1,19 @@
+import asyncio
 import operator
+from dataclasses import dataclass
+from functools import cached_property
 from typing import Generic
 from typing import NamedTuple
 from typing import TypeVar
 
 import pytest
 
+from liquid2 import Drop
+from liquid2 import Environment
+from liquid2 import StrictUndefined
 from liquid2 import parse
+from liquid2.exceptions import LiquidTypeError
+from liquid2.exceptions import UndefinedError
 
 T = TypeVar("T")
 
@@ -156,3 +164,72 @@ def test_drop(case: Case) -> None:
     template = parse(case.template)
     result = template.render(**case.context)
     assert result == case.expect
+
+
+@dataclass
+class MockProduct(Drop):
+    __liquid_attributes__ = ("title", "price", "label", "missing")
+
+    title: str
+    price: float
+    cost: float = 0
+
+    @cached_property
+    def label(self) -> str:
+        return self.title.upper()
+
+
+class MockSaleProduct(MockProduct):
+    __liquid_attributes__ = ("on_sale",)
+
+    @property
+    def on_sale(self) -> bool:
+        return True
+
+
+def test_attribute_drop() -> None:
+    template = parse(
+        "{{ p.title }} {{ p.label }} {{ p.price | times: 2 }}"
+        "|{{ p.cost }}|{{ p.missing }}|{{ p.size }}"
+    )
+    data = {"p": MockProduct("shoe", 9.5)}
+    assert template.render(**data) == "shoe SHOE 19.0|||"
+
+    async def coro() -> str:
+        return await template.render_async(**data)
+
+    assert asyncio.run(coro()) == "shoe SHOE 19.0|||"
+
+
+def test_inherited_drop_attributes() -> None:
+    template = parse("{{ p.title }} {{ p.on_sale }} {{ p.cost }}")
+    assert template.render(p=MockSaleProduct("hat", 5, 10)) == "hat true "
+
+
+def test_drop_attributes_are_cached_per_class() -> None:
+    assert set(MockProduct._liquid_accessors) == {  # noqa: SLF001
+        "title",
+        "price",
+        "label",
+        "missing",
+    }
+    assert set(MockSaleProduct._liquid_accessors) == {  # noqa: SLF001
+        "title",
+        "price",
+        "label",
+        "missing",
+        "on_sale",
+    }
+
+
+def test_strict_undefined_drop_attribute() -> None:
+    env = Environment(undefined=StrictUndefined)
+    template = env.from_string("{{ p.cost }}")
+    with pytest.raises(UndefinedError, match="p.cost is undefined"):
+        template.render(p=MockProduct("shoe", 9.5))
+
+
+def test_drops_are_not_iterable() -> None:
+    template = parse("{% for x in p %}{{ x }}{% endfor %}")
+    with pytest.raises(LiquidTypeError, match="expected an iterable"):
+        template.render(p=MockProduct("shoe", 9.5))
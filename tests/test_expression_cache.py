@@ -0,0 +1,118 @@
+import asyncio
+import pickle
+
+import pytest
+
+from liquid2 import Environment
+from liquid2.builtin.output import OutputNode
+from liquid2.builtin.tags.if_tag import IfNode
+from liquid2.exceptions import LiquidSyntaxError
+from liquid2.exceptions import LiquidTypeError
+
+
+class MockEnvironment(Environment):
+    expression_cache_size = 100
+
+
+def test_expressions_are_not_shared_by_default() -> None:
+    env = Environment()
+    assert env.expression_cache is None
+    a = env.from_string("{{ x | upcase }}")
+    b = env.from_string("{{ x | upcase }}")
+    assert isinstance(a.nodes[0], OutputNode)
+    assert isinstance(b.nodes[0], OutputNode)
+    assert a.nodes[0].expression is not b.nodes[0].expression
+
+
+def test_share_output_expressions() -> None:
+    env = MockEnvironment()
+    a = env.from_string("{{ x | upcase }}")
+    b = env.from_string("Hello, {{ x | upcase }}!\n{{x|upcase}}")
+    assert isinstance(a.nodes[0], OutputNode)
+    assert isinstance(b.nodes[1], OutputNode)
+    assert isinstance(b.nodes[3], OutputNode)
+    assert a.nodes[0].expression is b.nodes[1].expression
+    # Markup must match exactly.
+    assert a.nodes[0].expression is not b.nodes[3].expression
+    assert b.render(x="you") == "Hello, YOU!\nYOU"
+
+
+def test_share_tag_expressions() -> None:
+    env = MockEnvironment()
+    a = env.from_string("{% if x > 1 %}a{% else %}b{% endif %}")
+    b = env.from_string("{% if x > 1 %}c{% endif %}")
+    assert isinstance(a.nodes[0], IfNode)
+    assert isinstance(b.nodes[0], IfNode)
+    assert a.nodes[0].condition is b.nodes[0].condition
+    assert a.render(x=2) == "a"
+    assert b.render(x=0) == ""
+
+    template = env.from_string(
+        "{% assign y = x | plus: 1 %}{% assign y = x | plus: 1 %}"
+        "{% echo y %}{% unless y > 2 %}!{% endunless %}"
+    )
+    assert template.render(x=1) == "2!"
+
+
+def test_render_errors_are_positioned_in_their_template() -> None:
+    env = MockEnvironment()
+    source = "Hello\n\n  {{ x | plus: 1 | divided_by: 0 }}"
+    env.from_string("{{ x | plus: 1 | divided_by: 0 }}")
+    template = env.from_string(source)
+
+    with pytest.raises(LiquidTypeError) as info:
+        template.render(x=1)
+
+    err = info.value
+    assert err.token is not None
+    assert err.token.source == source
+    assert source[err.token.start : err.token.stop] == "divided_by"
+    context = err.context()
+    assert context is not None
+    assert context[:2] == (3, 19)  # noqa: PLR2004
+
+
+def test_render_errors_are_positioned_in_their_template_async() -> None:
+    env = MockEnvironment()
+    env.from_string("{{ x | divided_by: 0 }}")
+    template = env.from_string("\n{{ x | divided_by: 0 }}")
+
+    async def coro() -> str:
+        return await template.render_async(x=1)
+
+    with pytest.raises(LiquidTypeError) as info:
+        asyncio.run(coro())
+
+    assert info.value.token is not None
+    assert info.value.token.start == 8  # noqa: PLR2004
+
+
+def test_syntax_errors_are_positioned_in_their_template() -> None:
+    env = MockEnvironment()
+    source = "Hello\n{{ x | 1 }}"
+
+    with pytest.raises(LiquidSyntaxError) as info:
+        env.from_string(source)
+
+    err = info.value
+    assert err.token is not None
+    assert err.token.source == source
+    context = err.context()
+    assert context is not None
+    assert context[:2] == (2, 7)  # noqa: PLR2004
+
+
+def test_static_analysis_of_shared_expressions() -> None:
+    source = "{{ a.b | upcase }}\n{% assign c = a.b | upcase %}{{ a.b | upcase }}"
+    expected = Environment().from_string(source).analyze()
+    env = MockEnvironment()
+    env.from_string("{{ a.b | upcase }}")
+    env.from_string("{% assign c = a.b | upcase %}")
+    assert env.from_string(source).analyze() == expected
+
+
+def test_pickle_environment_with_expression_cache() -> None:
+    env = MockEnvironment()
+    env.from_string("{{ x }}")
+    unpickled = pickle.loads(pickle.dumps(env))  # noqa: S301
+    assert unpickled.from_string("{{ x }}").render(x=1) == "1"
@@ -2,20 +2,28 @@
 
 from __future__ import annotations
 
+import asyncio
+from io import StringIO
 from typing import TYPE_CHECKING
+from typing import Any
 
 import pytest
 
 from liquid2 import Environment
+from liquid2 import RenderContext
 from liquid2 import Token
 from liquid2 import TokenType
 from liquid2.builtin.expressions import Path
 from liquid2.exceptions import LiquidTypeError
+from liquid2.exceptions import UnknownFilterError
 from liquid2.filter import int_arg
 from liquid2.filter import with_context
+from liquid2.filter import with_environment
 
 if TYPE_CHECKING:
-    from liquid2.context import RenderContext
+    from typing import Callable
+
+    from liquid2 import TokenT
 
 
 @with_context
@@ -40,3 +48,95 @@ def test_int_arg_sting_value_error() -> None:
 
 def test_int_arg_sting_value_error_with_default() -> None:
     assert int_arg("foo", default=42) == 42
+
+
+@with_context
+@with_environment
+def mock_context_and_environment_filter(
+    val: str, *, context: RenderContext, environment: Environment
+) -> str:
+    """Mock filter function making use of `with_context` and `with_environment`."""
+    assert context.env is environment
+    return f"{val}{context.resolve('you')}"
+
+
+def test_with_context_and_environment() -> None:
+    env = Environment()
+    env.filters["mock"] = mock_context_and_environment_filter
+    template = env.from_string(r"{{ 'Hello, ' | mock }}!")
+    assert template.render(you="World") == "Hello, World!"
+
+
+def test_replace_filter_after_rendering() -> None:
+    env = Environment()
+    template = env.from_string(r"{{ 'Hello' | append: ', ' | append: you }}!")
+    assert template.render(you="World") == "Hello, World!"
+
+    env.filters["append"] = lambda val, arg: f"{val}{arg}{arg}"
+    assert template.render(you="World") == "Hello, , WorldWorld!"
+
+    del env.filters["append"]
+    with pytest.raises(UnknownFilterError):
+        template.render(you="World")
+
+
+def test_literal_filter_arguments_are_evaluated_once() -> None:
+    calls: list[tuple[object, ...]] = []
+
+    def mock(val: str, *args: object, **kwargs: object) -> str:
+        calls.append((*args, *kwargs.items()))
+        return val
+
+    env = Environment()
+    env.filters["mock"] = mock
+    template = env.from_string(r"{{ 'Hello' | mock: 'a', 1, b: true }}")
+    assert template.render() == "Hello"
+    assert template.render() == "Hello"
+    assert calls == [("a", 1, ("b", True)), ("a", 1, ("b", True))]
+
+
+class AuditingRenderContext(RenderContext):
+    """A render context that records filter lookups."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.filter_names: list[str] = []
+
+    def filter(self, name: str, *, token: TokenT) -> Callable[..., object]:
+        self.filter_names.append(name)
+        return super().filter(name, token=token)
+
+
+def test_overridden_render_context_filter_method() -> None:
+    env = Environment()
+    env.filters["mock"] = mock_filter
+    template = env.from_string(r"{{ 'Hello, ' | mock: 'you' | append: '!' }}")
+    context = AuditingRenderContext(template, global_data={"you": "World"})
+    buf = StringIO()
+    template.render_with_context(context, buf)
+    assert buf.getvalue() == "Hello, World!"
+    assert context.filter_names == ["mock", "append"]
+
+
+def test_overridden_render_context_filter_method_async() -> None:
+    env = Environment()
+    template = env.from_string(r"{{ 'Hello' | append: ', ' | append: you }}!")
+    context = AuditingRenderContext(template, global_data={"you": "World"})
+    buf = StringIO()
+    asyncio.run(template.render_with_context_async(context, buf))
+    assert buf.getvalue() == "Hello, World!"
+    assert context.filter_names == ["append", "append"]
+
+
+def test_filter_type_error_message() -> None:
+    env = Environment()
+    env.filters["mock"] = lambda val: val
+    template = env.from_string(r"{{ 'Hello' | mock: 1 }}")
+
+    with pytest.raises(LiquidTypeError) as sync_err:
+        template.render()
+    assert not str(sync_err.value).startswith("mock: ")
+
+    with pytest.raises(LiquidTypeError) as async_err:
+        asyncio.run(template.render_async())
+    assert "mock: " in str(async_err.value)
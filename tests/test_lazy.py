@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+
+from liquid2 import Environment
+from liquid2 import LazyMapping
+from liquid2 import StrictUndefined
+from liquid2 import lazy
+from liquid2 import lazy_async
+from liquid2 import parse
+from liquid2.exceptions import LiquidTypeError
+from liquid2.exceptions import UndefinedError
+
+
+class MockLoader:
+    def __init__(self, value: object) -> None:
+        self.value = value
+        self.calls = 0
+
+    def __call__(self) -> object:
+        self.calls += 1
+        return self.value
+
+    async def load(self) -> object:
+        self.calls += 1
+        return self.value
+
+
+def test_lazy_values_are_not_computed_if_unused() -> None:
+    loader = MockLoader(["a", "b"])
+    template = parse("{% if show %}{{ items | join: ', ' }}{% endif %}")
+    assert template.render(show=False, items=lazy(loader)) == ""
+    assert loader.calls == 0
+
+
+def test_lazy_values_are_computed_once() -> None:
+    loader = MockLoader({"title": "Shoe", "tags": ["x", "y"]})
+    template = parse(
+        "{{ product.title }} {{ product.tags.size }} {{ product.tags.first }}"
+        "{% if product %} {{ product.tags[1] }}{% endif %}"
+    )
+    assert template.render(product=lazy(loader)) == "Shoe 2 x y"
+    assert loader.calls == 1
+
+
+def test_lazy_value_as_the_last_path_segment() -> None:
+    loader = MockLoader(["a", "b"])
+    template = parse("{% for x in data.items %}{{ x }}{% endfor %}{{ data.items }}")
+    assert template.render(data={"items": lazy(loader)}) == "abab"
+    assert loader.calls == 1
+
+
+def test_lazy_mapping() -> None:
+    title = MockLoader("Shoe")
+    reviews = MockLoader({"average": 4.5})
+    product = LazyMapping({"title": title, "reviews": reviews})
+    template = parse("{{ product.title }}{{ product.title }}")
+    assert template.render(product=product) == "ShoeShoe"
+    assert title.calls == 1
+    assert reviews.calls == 0
+
+
+def test_async_lazy_values() -> None:
+    reviews = MockLoader({"average": 4.5})
+    title = MockLoader("Shoe")
+    data = {
+        "reviews": lazy_async(reviews.load),
+        "product": LazyMapping({"title": lazy_async(title.load)}),
+    }
+    template = parse("{{ product.title }} {{ reviews.average }} {{ reviews.average }}")
+
+    async def coro() -> str:
+        return await template.render_async(**data)
+
+    assert asyncio.run(coro()) == "Shoe 4.5 4.5"
+    assert reviews.calls == 1
+    assert title.calls == 1
+
+
+def test_async_lazy_values_require_async_rendering() -> None:
+    template = parse("{{ reviews.average }}")
+    with pytest.raises(LiquidTypeError, match="render_async"):
+        template.render(reviews=lazy_async(MockLoader({}).load))
+
+
+def test_undefined_lazy_value_segment() -> None:
+    env = Environment(undefined=StrictUndefined)
+    template = env.from_string("{{ product.nosuchthing }}")
+    with pytest.raises(UndefinedError, match="product.nosuchthing is undefined"):
+        template.render(product=lazy(MockLoader({})))
+
+
+@pytest.mark.parametrize(
+    ("source", "want"),
+    [
+        ("{{ items | map: 't' | join: ',' }}", "b,a"),
+        ("{{ items | where: 't', 'a' | map: 'n' | join }}", "2"),
+        ("{{ items | reject: 't', 'a' | map: 'n' | join }}", "1"),
+        ("{{ items | sort: 't' | map: 'n' | join: '' }}", "21"),
+        ("{{ items | sort_natural: 't' | map: 'n' | join: '' }}", "21"),
+        ("{{ items | find: 't', 'a' | map: 'n' }}", "2"),
+        ("{{ items | find_index: 't', 'a' }}", "1"),
+        ("{{ items | has: 't', 'b' }}", "true"),
+        ("{{ items | sum: 'n' }}", "3"),
+    ],
+)
+def test_lazy_values_in_filter_item_lookups(source: str, want: str) -> None:
+    items = [
+        {"t": lazy(lambda: "b"), "n": lazy(lambda: 1)},
+        {"t": lazy(lambda: "a"), "n": 2},
+    ]
+    assert parse(source).render(items=items) == want
+
+
+def test_lazy_values_in_json_filter() -> None:
+    data = {"a": lazy(lambda: [1, 2]), "b": LazyMapping({"c": lambda: "d"})}
+    assert parse("{{ data | json }}").render(data=data) == (
+        '{"a": [1, 2], "b": {"c": "d"}}'
+    )
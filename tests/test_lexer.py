@@ -1,9 +1,14 @@
 import operator
+from contextlib import suppress
 from dataclasses import dataclass
 
 import pytest
 
 from liquid2 import DEFAULT_ENVIRONMENT
+from liquid2 import Environment
+from liquid2.exceptions import LiquidSyntaxError
+from liquid2.lexer import Lexer
+from liquid2.lexer import _compile
 
 
 @dataclass
@@ -217,6 +222,16 @@ TEST_CASES = [
         source="{% assign x = a | foo: (1..4) %}",
         want="{% assign x = a | foo: (1..4) %}",
     ),
+    Case(
+        name="inline css and javascript braces",
+        source="<style>a { b: c }</style><script>f({x: {}}, '{')</script>{{ you }}{",
+        want="<style>a { b: c }</style><script>f({x: {}}, '{')</script>{{ you }}{",
+    ),
+    Case(
+        name="malformed markup is content",
+        source="{%}{#{{ you }}{% 1 %}",
+        want="{%}{#{{ you }}{% 1 %}",
+    ),
 ]
 
 
@@ -225,3 +240,108 @@ def test_lexer(case: Case) -> None:
     assert (
         "".join(str(t) for t in DEFAULT_ENVIRONMENT.tokenize(case.source)) == case.want
     )
+
+
+def test_content_tokens_between_markup() -> None:
+    tokens = DEFAULT_ENVIRONMENT.tokenize("a { b {{ c }}{%}\n")
+    assert [(t.start, t.stop) for t in tokens] == [(0, 6), (6, 13), (13, 17)]
+    assert [str(t) for t in tokens] == ["a { b ", "{{ c }}", "{%}\n"]
+
+
+def test_trim_trailing_newline() -> None:
+    template = DEFAULT_ENVIRONMENT.from_string("{{ 'a' -}} \n")
+    assert template.render() == "a"
+
+
+FAST_PATH_CASES = [
+    "{{ a.b[0]['c d'][\"e\"].size }}",
+    "{{ a[ -1 ][ 'b' ] }}",
+    "{{ a.b | f: c.d, e: 'x' }}",
+    "{% for x in (a.b..c[1]) %}{% endfor %}",
+    "{{ a[b.c].d }}",
+    "{{ a. b }}",
+    "{{ a['it\\'s'] }}",
+    "{{ 'plain $ string' }}{{ \"\" }}{{ '' }}",
+    "{{ 'a\\'b' }}{{ \"a\\\"b\" }}",
+    "{{ 'Hello, ${you.name}!' }}",
+]
+
+
+@pytest.mark.parametrize("source", FAST_PATH_CASES)
+def test_fast_path_tokens_match_state_machine(
+    source: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    env = Environment()
+    want = repr(env.tokenize(source))
+    # Disable plain string and simple path fast paths.
+    monkeypatch.setattr(
+        Lexer, "TOKEN_RULES", _compile(Lexer.NUMBERS, Lexer.SYMBOLS, Lexer.WORD)
+    )
+    monkeypatch.setattr(Lexer, "accept_simple_path", lambda *_: False)
+    assert repr(env.tokenize(source)) == want
+
+
+@pytest.mark.parametrize("source", ["{{x[0]", "{{a.b-c", "{%ifx[0])b.c"])
+def test_simple_path_at_end_of_source(source: str) -> None:
+    with pytest.raises(LiquidSyntaxError) as err:
+        Environment().tokenize(source)
+    assert err.value.message == "unexpected end of path"
+
+
+COMMENT_CASES = [
+    ("{# a #}", ("DEFAULT", "DEFAULT"), " a ", "#"),
+    ("{#- a -#}", ("MINUS", "MINUS"), " a ", "#"),
+    ("{#~ a +#}", ("TILDE", "PLUS"), " a ", "#"),
+    ("{#-#}", ("MINUS", "DEFAULT"), "", "#"),
+    ("{## a #} b ##}", ("DEFAULT", "DEFAULT"), " a #} b ", "##"),
+    ("{##- a -##}", ("MINUS", "MINUS"), " a ", "##"),
+    # Fewer closing hashes than opening hashes.
+    ("{##x#}", ("DEFAULT", "DEFAULT"), "#x", "#"),
+    ("{###-x##}", ("DEFAULT", "DEFAULT"), "#-x", "##"),
+    ("{% # a %}", ("DEFAULT", "DEFAULT"), " a ", ""),
+    ("{%- # a -%}", ("MINUS", "MINUS"), " a ", ""),
+    ("{% #-%}", ("DEFAULT", "MINUS"), "", ""),
+]
+
+
+@pytest.mark.parametrize(("source", "wc", "text", "hashes"), COMMENT_CASES)
+def test_comment_tokens(
+    source: str, wc: tuple[str, str], text: str, hashes: str
+) -> None:
+    tokens = DEFAULT_ENVIRONMENT.tokenize(f"x{source}y")
+    assert len(tokens) == 3  # noqa: PLR2004
+    comment = tokens[1]
+    assert str(comment) == source
+    assert (comment.wc[0].name, comment.wc[1].name) == wc  # type: ignore
+    assert comment.text == text  # type: ignore
+    assert comment.hashes == hashes  # type: ignore
+    assert [(t.start, t.stop) for t in tokens] == [
+        (0, 1),
+        (1, len(source) + 1),
+        (len(source) + 1, len(source) + 2),
+    ]
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        pytest.param("{#" * 50_000, id="unclosed comments"),
+        pytest.param("{# x " * 20_000, id="unclosed comments with text"),
+        pytest.param("{" + "#" * 100_000 + "x#}", id="long comment hashes"),
+        pytest.param("{% #" * 25_000, id="unclosed inline comments"),
+        pytest.param("{% raw %}" * 10_000, id="raw without endraw"),
+        pytest.param(
+            "{% comment %}" + "{%comment " * 10_000, id="unclosed block comment"
+        ),
+    ],
+)
+def test_unclosed_markup_is_scanned_once(source: str) -> None:
+    # These used to rescan the rest of the source for every opening delimiter,
+    # taking minutes rather than milliseconds.
+    with suppress(LiquidSyntaxError):
+        Environment().tokenize(source)
+
+
+def test_raw_tag_without_endraw_is_a_tag() -> None:
+    tokens = DEFAULT_ENVIRONMENT.tokenize("{% raw %}{{ a }}")
+    assert [type(t).__name__ for t in tokens] == ["TagToken", "OutputToken"]
@@ -0,0 +1,44 @@
+import pytest
+
+from liquid2.utils import LineIndex
+from liquid2.utils import line_index
+
+SOURCES = [
+    "",
+    "a",
+    "a\n",
+    "\n\n",
+    "Hello\nthere\r\nyou\rfolks\n\nbye",
+    "a\x0bb\x0cc\x1cd\x85e f g\n",
+]
+
+
+def _splitlines_location(source: str, index: int) -> tuple[int, int]:
+    cumulative_length = 0
+    for i, line in enumerate(source.splitlines(keepends=True)):
+        cumulative_length += len(line)
+        if index < cumulative_length:
+            return i + 1, index - (cumulative_length - len(line))
+    raise ValueError
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_line_index_agrees_with_splitlines(source: str) -> None:
+    index = LineIndex(source)
+    lines = source.splitlines(keepends=True)
+    assert len(index) == len(lines)
+    assert [index.line(i + 1) for i in range(len(index))] == lines
+    for i in range(len(source)):
+        assert index.location(i) == _splitlines_location(source, i)
+
+
+def test_index_out_of_bounds() -> None:
+    index = LineIndex("a\nb")
+    with pytest.raises(ValueError, match="out of bounds"):
+        index.line_number(3)
+
+
+def test_line_indexes_are_reused() -> None:
+    source = "a\nb\nc"
+    assert line_index(source) is line_index(source)
+    assert line_index(source).line_number(4) == 3  # noqa: PLR2004
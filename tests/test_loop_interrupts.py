@@ -0,0 +1,205 @@
+import asyncio
+from typing import Iterable
+from typing import TextIO
+
+import pytest
+
+from liquid2 import BlockNode
+from liquid2 import DictLoader
+from liquid2 import Environment
+from liquid2 import Node
+from liquid2 import RenderContext
+from liquid2 import Tag
+from liquid2 import TokenStream
+from liquid2.builtin.tags.for_tag import BreakNode
+from liquid2.builtin.tags.for_tag import ContinueNode
+from liquid2.exceptions import BreakLoop
+from liquid2.exceptions import ContinueLoop
+from liquid2.exceptions import LiquidSyntaxError
+
+
+class TwiceNode(Node):
+    """A custom loop that knows nothing about `RenderContext.interrupt`."""
+
+    __slots__ = ("block",)
+
+    def __init__(self, token: object, block: BlockNode) -> None:
+        super().__init__(token)  # type: ignore
+        self.block = block
+        self.blank = block.blank
+
+    def __str__(self) -> str:
+        return f"{{% twice %}}{self.block}{{% endtwice %}}"
+
+    def render_to_output(self, context: RenderContext, buffer: TextIO) -> int:
+        count = 0
+        for _ in range(2):
+            try:
+                count += self.block.render(context, buffer)
+            except ContinueLoop:
+                continue
+            except BreakLoop:
+                break
+        return count
+
+    def children(
+        self,
+        static_context: RenderContext,  # noqa: ARG002
+        *,
+        include_partials: bool = True,  # noqa: ARG002
+    ) -> Iterable[Node]:
+        yield self.block
+
+
+class TwiceTag(Tag):
+    block = True
+
+    def parse(self, stream: TokenStream) -> Node:
+        token = stream.next()
+        block = BlockNode(
+            stream.current(), self.env.parser.parse_block(stream, ("endtwice",))
+        )
+        stream.expect_tag("endtwice")
+        return TwiceNode(token, block)
+
+
+class MockEnvironment(Environment):
+    def setup_tags_and_filters(self) -> None:
+        super().setup_tags_and_filters()
+        self.tags["twice"] = TwiceTag(self)
+
+
+def _render(env: Environment, source: str) -> str:
+    template = env.from_string(source)
+    result = template.render()
+
+    async def coro() -> str:
+        return await template.render_async()
+
+    assert asyncio.run(coro()) == result
+    return result
+
+
+def _interrupt_nodes(nodes: Iterable[Node], context: RenderContext) -> list[Node]:
+    found: list[Node] = []
+    for node in nodes:
+        if isinstance(node, (BreakNode, ContinueNode)):
+            found.append(node)
+        found.extend(_interrupt_nodes(node.children(context), context))
+    return found
+
+
+def test_break_and_continue_nested_in_conditions_signal_their_loop() -> None:
+    env = Environment()
+    template = env.from_string(
+        "{% for i in (1..3) %}"
+        "{% if i == 1 %}{% continue %}{% endif %}"
+        "{% unless i < 3 %}{% break %}{% endunless %}"
+        "{% case i %}{% when 2 %}{% liquid continue %}{% endcase %}"
+        "{% endfor %}"
+    )
+    context = RenderContext(template)
+    nodes = _interrupt_nodes(template.nodes, context)
+    assert len(nodes) == 3  # noqa: PLR2004
+    assert all(node.signal for node in nodes)  # type: ignore
+
+
+def test_break_outside_a_loop_raises() -> None:
+    env = Environment()
+    template = env.from_string("{% if true %}{% break %}{% endif %}")
+    (node,) = _interrupt_nodes(template.nodes, RenderContext(template))
+    assert not node.signal  # type: ignore
+
+    with pytest.raises(LiquidSyntaxError, match="unexpected 'break'"):
+        template.render()
+
+
+def test_interrupts_stop_rendering_the_current_iteration() -> None:
+    env = Environment()
+    source = (
+        "{% for i in (1..6) %}"
+        "{% if i == 2 %}{% continue %}{% endif %}"
+        "{% case i %}{% when 4 %}{% continue %}{% when 4 %}x{% endcase %}"
+        "{% unless i < 5 %}{% break %}{% endunless %}"
+        "{{ i }}"
+        "{% endfor %}"
+    )
+    assert _render(env, source) == "13"
+
+
+def test_interrupt_in_blank_block() -> None:
+    env = Environment()
+    source = (
+        "{% for i in (1..4) %}"
+        "{% if i == 3 %} {% break %} {% assign x = i %}{% endif %}"
+        "{% assign y = i %}"
+        "{% endfor %}"
+        "{{ x }}-{{ y }}"
+    )
+    assert _render(env, source) == "-2"
+
+
+def test_nested_loops() -> None:
+    env = Environment()
+    source = (
+        "{% for i in (1..3) %}"
+        "{% for j in (1..3) %}"
+        "{% if j == 2 %}{% break %}{% endif %}{{ i }}{{ j }} "
+        "{% endfor %}"
+        "{% if i == 2 %}{% break %}{% endif %}"
+        "{% endfor %}"
+    )
+    assert _render(env, source) == "11 21 "
+
+
+def test_break_inside_non_propagating_tags_still_raises() -> None:
+    env = Environment()
+    source = (
+        "{% for i in (1..3) %}"
+        "{% capture x %}{{ i }}{% break %}{% endcapture %}"
+        "{% with y: i %}{{ y }}{% if y == 2 %}{% break %}{% endif %}{% endwith %}"
+        "{% endfor %}"
+        "{{ x }}"
+    )
+    assert _render(env, source) == ""
+
+
+def test_custom_loop_inside_a_for_loop() -> None:
+    env = MockEnvironment()
+    source = (
+        "{% for i in (1..3) %}"
+        "{% twice %}{{ i }}{% if i == 2 %}{% break %}{% endif %}{% endtwice %}"
+        "{% endfor %}"
+    )
+    assert _render(env, source) == "11233"
+
+
+def test_break_from_included_template() -> None:
+    env = Environment(
+        loader=DictLoader({"foo": "{% if i == 2 %}{% break %}{% endif %}"})
+    )
+    source = "{% for i in (1..3) %}{{ i }}{% include 'foo' %}{% endfor %}"
+    assert _render(env, source) == "12"
+
+
+def test_break_from_rendered_template_is_an_error() -> None:
+    env = Environment(loader=DictLoader({"foo": "{% break %}"}))
+    template = env.from_string("{% for i in (1..3) %}{% render 'foo' %}{% endfor %}")
+    with pytest.raises(LiquidSyntaxError, match="unexpected 'break'"):
+        template.render()
+
+
+def test_parse_time_render_context_is_reused(monkeypatch: pytest.MonkeyPatch) -> None:
+    env = Environment()
+    env.from_string("{% for x in y %}{% endfor %}")
+
+    def fail(*_: object, **__: object) -> None:
+        raise AssertionError("unexpected render context")
+
+    monkeypatch.setattr(RenderContext, "__init__", fail)
+    template = env.from_string(
+        "{% for x in y %}{% for z in x %}{% if z %}{% break %}{% endif %}"
+        "{% endfor %}{% endfor %}"
+    )
+    monkeypatch.undo()
+    assert template.render(y=[[1]]) == ""
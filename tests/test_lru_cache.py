@@ -214,3 +214,39 @@ def test_thread_safe_values() -> None:
     assert list(cache.values()) == [11, 99]
     cache["baz"] = 88
     assert list(cache.values()) == [88, 11]
+
+
+def test_hit_miss_and_eviction_counters() -> None:
+    cache = LRUCache[str, int](2)
+    cache["foo"] = 47
+    cache["bar"] = 99
+    assert cache["foo"] == 47
+    assert cache.get("nosuchthing") is None
+    cache["baz"] = 88
+    cache["foo"] = 11
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 1)
+
+
+def test_thread_safe_counters() -> None:
+    cache = ThreadSafeLRUCache[str, int](1)
+    cache["foo"] = 47
+    assert cache["foo"] == 47
+    cache["bar"] = 99
+    assert cache.get("foo") is None
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 1)
+
+
+def test_clear() -> None:
+    cache = LRUCache[str, int](2)
+    cache["foo"] = 47
+    cache.clear()
+    assert len(cache) == 0
+    assert "foo" not in cache
+
+
+def test_thread_safe_clear() -> None:
+    cache = ThreadSafeLRUCache[str, int](2)
+    cache["foo"] = 47
+    cache.clear()
+    assert len(cache) == 0
+    assert "foo" not in cache
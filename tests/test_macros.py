@@ -244,3 +244,24 @@ def test_excess_commas() -> None:
 
     with pytest.raises(LiquidSyntaxError):
         assert asyncio.run(coro())
+
+
+def test_redefine_macro_between_calls() -> None:
+    source = (
+        "{% for i in (1..2) %}"
+        "{% if i == 1 %}"
+        "{% macro 'func' a, b %}{{ a }}-{{ b }} {% endmacro %}"
+        "{% else %}"
+        "{% macro 'func' b, a %}{{ a }}-{{ b }} {% endmacro %}"
+        "{% endif %}"
+        "{% call 'func' 1, 2 %}"
+        "{% endfor %}"
+    )
+
+    want = "1-2 2-1 "
+
+    async def coro() -> str:
+        return await render_async(source)
+
+    assert render(source) == want
+    assert asyncio.run(coro()) == want
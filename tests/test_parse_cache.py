@@ -0,0 +1,85 @@
+import pickle
+
+import pytest
+
+from liquid2 import DEFAULT_ENVIRONMENT
+from liquid2 import Environment
+from liquid2 import WhitespaceControl
+from liquid2 import render
+from liquid2.exceptions import LiquidSyntaxError
+
+
+class MockEnvironment(Environment):
+    parse_cache_size = 2
+
+
+def test_templates_are_not_cached_by_default() -> None:
+    env = Environment()
+    assert env.parse_cache is None
+    a = env.from_string("Hello, {{ you }}!")
+    b = env.from_string("Hello, {{ you }}!")
+    assert a.nodes is not b.nodes
+
+
+def test_share_nodes_between_templates() -> None:
+    env = MockEnvironment()
+    source = "Hello, {{ you }}!"
+    a = env.from_string(source, globals={"you": "World"})
+    b = env.from_string(source, overlay_data={"you": "Liquid"})
+    assert a.nodes is b.nodes
+    assert a.render() == "Hello, World!"
+    assert b.render() == "Hello, Liquid!"
+    assert env.parse_cache is not None
+    assert env.parse_cache.hits == 1
+    assert env.parse_cache.misses == 1
+
+
+def test_name_and_path_are_part_of_the_key() -> None:
+    env = MockEnvironment()
+    a = env.from_string("{{ x }}", name="a")
+    b = env.from_string("{{ x }}", name="b")
+    c = env.from_string("{{ x }}", name="b", path="templates/b")
+    assert a.nodes is not b.nodes
+    assert b.nodes is not c.nodes
+    assert env.from_string("{{ x }}", name="b").name == "b"
+
+
+def test_parser_settings_are_part_of_the_key() -> None:
+    env = MockEnvironment()
+    assert env.from_string("{{ x }}\n").render(x=1) == "1\n"
+    env.default_trim = WhitespaceControl.MINUS
+    assert env.from_string("{{ x }}\n").render(x=1) == "1"
+
+
+def test_least_recently_used_templates_are_discarded() -> None:
+    env = MockEnvironment()
+    a = env.from_string("a")
+    env.from_string("b")
+    env.from_string("c")
+    assert env.from_string("a").nodes is not a.nodes
+
+
+def test_syntax_errors_are_not_cached() -> None:
+    env = MockEnvironment()
+    for _ in range(2):
+        with pytest.raises(LiquidSyntaxError) as info:
+            env.from_string("{{ x | }}", name="bad")
+        assert info.value.template_name == "bad"
+    assert env.parse_cache is not None
+    assert len(env.parse_cache) == 0
+
+
+def test_convenience_functions_use_the_parse_cache() -> None:
+    assert DEFAULT_ENVIRONMENT.parse_cache is not None
+    source = "{{ 'parse cache' | upcase }} {{ x }}"
+    assert render(source, x=1) == "PARSE CACHE 1"
+    hits = DEFAULT_ENVIRONMENT.parse_cache.hits
+    assert render(source, x=2) == "PARSE CACHE 2"
+    assert DEFAULT_ENVIRONMENT.parse_cache.hits == hits + 1
+
+
+def test_pickle_environment_with_parse_cache() -> None:
+    env = MockEnvironment()
+    env.from_string("{{ x }}")
+    unpickled = pickle.loads(pickle.dumps(env))  # noqa: S301
+    assert unpickled.from_string("{{ x }}").render(x=1) == "1"
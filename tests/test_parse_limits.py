@@ -0,0 +1,176 @@
+import pickle
+import threading
+
+import pytest
+
+from liquid2 import Environment
+from liquid2.exceptions import BlockDepthLimitError
+from liquid2.exceptions import ExpressionDepthLimitError
+from liquid2.exceptions import NodeLimitError
+from liquid2.exceptions import ParseLimitError
+from liquid2.exceptions import ResourceLimitError
+from liquid2.exceptions import SourceSizeLimitError
+from liquid2.exceptions import TokenLimitError
+
+
+class MockEnvironment(Environment):
+    source_size_limit = 1000
+    token_limit = 50
+    block_depth_limit = 3
+    expression_depth_limit = 4
+    node_limit = 20
+
+
+def test_parse_limits_are_disabled_by_default() -> None:
+    env = Environment()
+    source = (
+        "{% if a %}" * 50 + "{% if ((a)) and not b %}x{% endif %}" + "{% endif %}" * 50
+    )
+    assert env.from_string(source).render(a=True) == "x"
+
+
+def test_source_size_limit() -> None:
+    env = MockEnvironment()
+    env.from_string("a" * 1000)
+
+    with pytest.raises(SourceSizeLimitError) as info:
+        env.from_string("a" * 1001)
+
+    assert isinstance(info.value, ParseLimitError)
+    assert isinstance(info.value, ResourceLimitError)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "{{ a | append: b }}" * 11,
+        "{# x #}" * 100,
+        "{% liquid\n" + "echo a\n" * 50 + "%}",
+        "{{ 'a${b}c${d}' }}" * 20,
+    ],
+)
+def test_token_limit(source: str) -> None:
+    class TokenLimitEnvironment(Environment):
+        token_limit = 50
+
+    env = TokenLimitEnvironment()
+
+    with pytest.raises(TokenLimitError) as info:
+        env.from_string(source)
+
+    # Scanning stops as soon as the limit is reached.
+    assert info.value.token is not None
+    assert info.value.token.start < len(source)
+
+
+def test_block_depth_limit() -> None:
+    env = MockEnvironment()
+    env.from_string(
+        "{% if a %}{% for b in c %}{% unless d %}{% endunless %}{% endfor %}{% endif %}"
+    )
+
+    with pytest.raises(BlockDepthLimitError) as info:
+        env.from_string("{% if a %}" * 4 + "x" + "{% endif %}" * 4)
+
+    err = info.value
+    assert err.token is not None
+    assert err.token.start == 40  # noqa: PLR2004
+
+
+def test_block_depth_limit_in_liquid_tags() -> None:
+    env = MockEnvironment()
+
+    with pytest.raises(BlockDepthLimitError):
+        env.from_string(
+            "{% if a %}{% if b %}{% liquid\nif c\nif d\necho e\nendif\nendif %}"
+            "{% endif %}{% endif %}"
+        )
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "{% if ((((a)))) %}{% endif %}",
+        "{% if not not not not a %}{% endif %}",
+        "{% if a and b and c and d and e %}{% endif %}",
+        "{{ a[b[c[d[e]]]] }}",
+        "{{ 'a${ 'b${ 'c${ 'd${ e }' }' }' }' }}",
+    ],
+)
+def test_expression_depth_limit(source: str) -> None:
+    env = MockEnvironment()
+
+    with pytest.raises(ExpressionDepthLimitError):
+        env.from_string(source)
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "{% if (((a))) %}{% endif %}",
+        "{% if not not not a %}{% endif %}",
+        "{% if a and b and c and d %}{% endif %}",
+        "{{ a[b[c[d]]] }}",
+        "{{ 'a${ 'b${ 'c${ d }' }' }' }}",
+    ],
+)
+def test_expressions_within_depth_limit(source: str) -> None:
+    MockEnvironment().from_string(source)
+
+
+def test_node_limit() -> None:
+    env = MockEnvironment()
+    env.from_string("{{ a }}" * 20)
+
+    with pytest.raises(NodeLimitError):
+        env.from_string("{{ a }}" * 21)
+
+    # Nodes in nested blocks count too.
+    with pytest.raises(NodeLimitError):
+        env.from_string(("{% if a %}" + "{{ b }}" * 10 + "{% endif %}") * 2)
+
+
+def test_pathological_templates_without_recursion_errors() -> None:
+    class LimitedEnvironment(Environment):
+        block_depth_limit = 100
+        expression_depth_limit = 100
+
+    env = LimitedEnvironment()
+
+    with pytest.raises(BlockDepthLimitError):
+        env.from_string("{% if a %}" * 5000 + "{% endif %}" * 5000)
+
+    with pytest.raises(ExpressionDepthLimitError):
+        env.from_string("{% if " + " or ".join(["a"] * 5000) + " %}{% endif %}")
+
+    with pytest.raises(ExpressionDepthLimitError):
+        env.from_string("{{ a" + "[b" * 5000 + "]" * 5000 + " }}")
+
+
+def test_parse_state_is_per_thread() -> None:
+    env = MockEnvironment()
+    errors: list[Exception] = []
+
+    def parse() -> None:
+        try:
+            for _ in range(50):
+                env.from_string(
+                    "{% if a %}{% if b %}{% if c %}x{% endif %}{% endif %}{% endif %}"
+                )
+        except Exception as err:  # noqa: BLE001
+            errors.append(err)
+
+    threads = [threading.Thread(target=parse) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+
+def test_pickle_environment_with_parse_limits() -> None:
+    env = pickle.loads(pickle.dumps(MockEnvironment()))  # noqa: S301
+
+    with pytest.raises(BlockDepthLimitError):
+        env.from_string("{% if a %}" * 4 + "{% endif %}" * 4)
@@ -0,0 +1,60 @@
+from io import StringIO
+from typing import Any
+
+from liquid2 import Environment
+from liquid2 import RenderContext
+from liquid2.builtin import FilteredExpression
+from liquid2.builtin import Path
+from liquid2.builtin.output import OutputNode
+
+
+class MockKey:
+    def __liquid__(self) -> str:
+        return "b"
+
+
+class MockRenderContext(RenderContext):
+    def get_item(self, obj: Any, key: Any) -> Any:
+        if key == "upper":
+            return str(obj).upper()
+        return super().get_item(obj, key)
+
+
+def test_static_path() -> None:
+    env = Environment()
+    template = env.from_string("{{ a.b[0] }}{{ a[b] }}")
+    first, second = template.nodes
+    assert isinstance(first, OutputNode)
+    assert isinstance(second, OutputNode)
+
+    assert isinstance(first.expression, FilteredExpression)
+    assert isinstance(first.expression.left, Path)
+    assert first.expression.left.static_path == ("a", "b", 0)
+
+    assert isinstance(second.expression, FilteredExpression)
+    assert isinstance(second.expression.left, Path)
+    assert second.expression.left.static_path is None
+
+
+def test_special_keys() -> None:
+    env = Environment()
+    template = env.from_string(
+        "{{ a.first }} {{ a.last }} {{ a.size }} {{ b.size }} {{ c.first }}"
+    )
+    data = {"a": [1, 2, 3], "b": {"size": "big"}, "c": {"x": "y"}}
+    assert template.render(**data) == "1 3 3 big xy"
+
+
+def test_liquid_keys() -> None:
+    env = Environment()
+    template = env.from_string("{{ a[k] }}")
+    assert template.render(a={"b": "hello"}, k=MockKey()) == "hello"
+
+
+def test_override_get_item() -> None:
+    env = Environment()
+    template = env.from_string("{{ a.b.upper }}")
+    context = MockRenderContext(template, global_data={"a": {"b": "hello"}})
+    buf = StringIO()
+    template.render_with_context(context, buf)
+    assert buf.getvalue() == "HELLO"
@@ -15,3 +15,11 @@ def test_pickle_template() -> None:
         pickle.dumps(template)
 
     asyncio.run(coro())
+
+
+def test_unpickle_template() -> None:
+    env = Environment(loader=FileSystemLoader("tests/fixtures/001/"))
+    template = env.get_template("main.html")
+    data = {"title": "Hello", "products": []}
+    unpickled = pickle.loads(pickle.dumps(template))  # noqa: S301
+    assert unpickled.render(**data) == template.render(**data)
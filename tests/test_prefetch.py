@@ -0,0 +1,169 @@
+import asyncio
+import gc
+import pickle
+from typing import Any
+from typing import ClassVar
+from typing import Sequence
+
+from liquid2 import DictLoader
+from liquid2 import Drop
+from liquid2 import Environment
+from liquid2 import RenderContext
+from liquid2.builtin.tags.for_tag import ForNode
+from liquid2.builtin.tags.render_tag import RenderNode
+from liquid2.prefetch import loop_keys
+
+
+class MockProduct(Drop):
+    """A drop that loads inventory and reviews for all siblings at once."""
+
+    __liquid_attributes__ = ("title", "inventory", "reviews")
+
+    batches: ClassVar[list[tuple[str, list[str]]]] = []
+    queries: ClassVar[int] = 0
+
+    def __init__(self, title: str) -> None:
+        self.title = title
+        self.cache: dict[str, Any] = {}
+
+    def __liquid_batch__(self, key: str, siblings: Sequence["MockProduct"]) -> None:
+        self.batches.append((key, [p.title for p in siblings]))
+        for product in siblings:
+            product.cache[key] = product._load(key)  # noqa: SLF001
+
+    def _load(self, key: str) -> object:
+        if key == "inventory":
+            return len(self.title)
+        if key == "reviews":
+            return ["good", "bad"]
+        return None
+
+    def _get(self, key: str) -> object:
+        if key not in self.cache:
+            MockProduct.queries += 1
+            self.cache[key] = self._load(key)
+        return self.cache[key]
+
+    @property
+    def inventory(self) -> object:
+        return self._get("inventory")
+
+    @property
+    def reviews(self) -> object:
+        return self._get("reviews")
+
+
+class MockAsyncProduct(MockProduct):
+    async def __liquid_batch_async__(
+        self, key: str, siblings: Sequence["MockProduct"]
+    ) -> None:
+        self.__liquid_batch__(key, siblings)
+
+
+def _products() -> list[MockProduct]:
+    MockProduct.batches = []
+    MockProduct.queries = 0
+    return [MockProduct("shoe"), MockProduct("hat"), MockProduct("scarf")]
+
+
+def test_loop_keys() -> None:
+    env = Environment()
+    template = env.from_string(
+        "{% for p in products %}"
+        "{{ p.title }}{{ p.reviews.size }}{% if p.inventory > 1 %}{{ p }}{% endif %}"
+        "{{ q.other }}{{ x[p.title] }}{{ p[0] }}{{ p.title }}"
+        "{% endfor %}"
+    )
+    node = template.nodes[0]
+    assert isinstance(node, ForNode)
+    assert loop_keys("p", [node.block], RenderContext(template)) == (
+        "title",
+        "reviews",
+        "inventory",
+    )
+
+
+def test_batch_load_for_loop() -> None:
+    env = Environment()
+    template = env.from_string(
+        "{% for p in products limit: 2 %}"
+        "{{ p.title }}:{{ p.inventory }}:{{ p.reviews.size }} "
+        "{% endfor %}"
+    )
+    products = _products()
+    assert template.render(products=products) == "shoe:4:2 hat:3:2 "
+    assert MockProduct.batches == [
+        ("title", ["shoe", "hat"]),
+        ("inventory", ["shoe", "hat"]),
+        ("reviews", ["shoe", "hat"]),
+    ]
+    assert MockProduct.queries == 0
+
+
+def test_batch_load_render_tag() -> None:
+    env = Environment(
+        loader=DictLoader({"product": "{{ product.inventory }} "}),
+    )
+    template = env.from_string("{% render 'product' for products %}")
+    assert template.render(products=_products()) == "4 3 5 "
+    assert MockProduct.batches == [("inventory", ["shoe", "hat", "scarf"])]
+    assert MockProduct.queries == 0
+
+
+def test_batch_load_async() -> None:
+    env = Environment(
+        loader=DictLoader({"product": "{{ item.reviews.size }} "}),
+    )
+    template = env.from_string(
+        "{% for p in products %}{{ p.inventory }} {% endfor %}"
+        "{% render 'product' for products as item %}"
+    )
+    MockProduct.batches = []
+    MockProduct.queries = 0
+    products = [MockAsyncProduct("shoe"), MockAsyncProduct("hat")]
+
+    async def coro() -> str:
+        return await template.render_async(products=products)
+
+    assert asyncio.run(coro()) == "4 3 2 2 "
+    assert MockProduct.batches == [
+        ("inventory", ["shoe", "hat"]),
+        ("reviews", ["shoe", "hat"]),
+    ]
+    assert MockProduct.queries == 0
+
+
+def test_items_without_batch_protocol() -> None:
+    env = Environment()
+    template = env.from_string("{% for p in products %}{{ p.title }}{% endfor %}")
+    data: dict[str, object] = {"products": [{"title": "a"}, {"title": "b"}]}
+    assert template.render(**data) == "ab"
+
+
+def test_render_tag_items_without_batch_protocol() -> None:
+    env = Environment(loader=DictLoader({"product": "{{ product.title }}"}))
+    template = env.from_string("{% render 'product' for products %}")
+    data: dict[str, object] = {"products": [{"title": "a"}, {"title": "b"}]}
+    assert template.render(**data) == "ab"
+    node = template.nodes[0]
+    assert isinstance(node, RenderNode)
+    assert node._batch_keys is None  # noqa: SLF001
+
+
+def test_render_tag_does_not_keep_partial_templates_alive() -> None:
+    # A non-caching loader gives us a new partial template for every render.
+    env = Environment(loader=DictLoader({"product": "{{ product.inventory }} "}))
+    template = env.from_string("{% render 'product' for products %}")
+    assert template.render(products=_products()) == "4 3 5 "
+
+    node = template.nodes[0]
+    assert isinstance(node, RenderNode)
+    assert node._batch_keys is not None  # noqa: SLF001
+    gc.collect()
+    assert node._batch_keys[0]() is None  # noqa: SLF001
+
+    assert template.render(products=_products()) == "4 3 5 "
+    assert MockProduct.batches == [("inventory", ["shoe", "hat", "scarf"])]
+
+    unpickled = pickle.loads(pickle.dumps(template))  # noqa: S301
+    assert unpickled.render(products=_products()) == "4 3 5 "
@@ -0,0 +1,261 @@
+import asyncio
+import logging
+from io import StringIO
+
+import pytest
+
+from liquid2 import DictLoader
+from liquid2 import Environment
+from liquid2 import RenderContext
+from liquid2.profiler import RenderProfiler
+from liquid2.profiler import SlowRender
+
+
+class MockClock:
+    """A clock that advances by one second every time it is read."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        self.now += 1
+        return self.now
+
+
+def _env(profiler: RenderProfiler | None = None) -> Environment:
+    env = Environment(
+        loader=DictLoader(
+            {
+                "product": "{{ product | upcase }}",
+                "header": "{% if true %}{{ 'hi' }}{% endif %}",
+            }
+        )
+    )
+    env.profiler = profiler
+    return env
+
+
+def test_profiling_is_disabled_by_default() -> None:
+    env = _env()
+    template = env.from_string("{{ 'a' | upcase }}")
+    assert RenderContext(template).profiler is None
+
+
+def test_node_filter_partial_and_load_records() -> None:
+    profiler = RenderProfiler(clock=MockClock())
+    env = _env(profiler)
+    template = env.from_string(
+        "{% for p in products %}\n{% render 'product' with p %}{% endfor %}",
+        name="index",
+    )
+    assert template.render(products=["a", "b"]) == "\nA\nB"
+
+    records = {(r.kind, r.label): r for r in profiler.records}
+    assert set(records) == {
+        ("node", "index:1 for"),
+        ("node", "index:1 content"),
+        ("node", "index:2 render"),
+        ("load", "load:product"),
+        ("partial", "partial:product"),
+        ("node", "product:1 output"),
+        ("filter", "filter:upcase"),
+    }
+
+    render = records[("node", "index:2 render")]
+    assert render.calls == 2  # noqa: PLR2004
+    assert render.template_name == "index"
+    assert render.span == (24, 53)
+    assert render.line == 2  # noqa: PLR2004
+
+    upcase = records[("filter", "filter:upcase")]
+    assert upcase.calls == 2  # noqa: PLR2004
+    # One tick between entering and exiting each call.
+    assert upcase.total_time == 2  # noqa: PLR2004
+    assert upcase.self_time == 2  # noqa: PLR2004
+
+    output = records[("node", "product:1 output")]
+    assert output.total_time > output.self_time
+
+
+def test_report() -> None:
+    profiler = RenderProfiler(clock=MockClock())
+    env = _env(profiler)
+    template = env.from_string("{{ 'a' | upcase }}{% render 'header' %}")
+    template.render()
+
+    report = profiler.report()
+    assert [r.self_time for r in report] == sorted(
+        (r.self_time for r in report), reverse=True
+    )
+    assert [r.name for r in profiler.report("filter")] == ["upcase"]
+    assert len(profiler.report(limit=2)) == 2  # noqa: PLR2004
+
+    profiler.clear()
+    assert profiler.records == []
+    assert profiler.collapsed_stacks() == ""
+
+
+def test_collapsed_stacks() -> None:
+    profiler = RenderProfiler(clock=MockClock())
+    env = _env(profiler)
+    template = env.from_string("{% render 'header' %}", name="index")
+    template.render()
+
+    lines = profiler.collapsed_stacks().splitlines()
+    assert "index:1 render;load:header 1000000" in lines
+    assert "index:1 render;partial:header;header:1 if;header:1 output 1000000" in lines
+    assert all(";" not in line.rsplit(" ", 1)[1] for line in lines)
+
+
+def test_profile_async() -> None:
+    profiler = RenderProfiler(clock=MockClock())
+    env = _env(profiler)
+    template = env.from_string("{% render 'product' with x %}", name="index")
+
+    async def coro() -> str:
+        return await template.render_async(x="a")
+
+    assert asyncio.run(coro()) == "A"
+    assert {r.label for r in profiler.records} == {
+        "index:1 render",
+        "load:product",
+        "partial:product",
+        "product:1 output",
+        "filter:upcase",
+    }
+
+
+def test_profile_a_single_render() -> None:
+    profiler = RenderProfiler(clock=MockClock())
+    env = _env()
+    template = env.from_string("{{ 'a' | upcase }}")
+    context = RenderContext(template)
+    context.profiler = profiler
+    buf = StringIO()
+    template.render_with_context(context, buf)
+    assert buf.getvalue() == "A"
+    assert len(profiler.records) == 2  # noqa: PLR2004
+
+
+def _slow_env(reports: list[SlowRender], sample_rate: float = 1.0) -> Environment:
+    env = _env()
+    env.slow_render_threshold = 0.0
+    env.slow_render_sample_rate = sample_rate
+    env.slow_render_callback = reports.append
+    return env
+
+
+def test_slow_render_report() -> None:
+    reports: list[SlowRender] = []
+    env = _slow_env(reports)
+    template = env.from_string(
+        "{% for p in products %}{% render 'product' with p %}"
+        "{% for x in (1..3) %}{% break %}{% endfor %}"
+        "{% endfor %}",
+        name="index",
+    )
+    assert template.render(products=["a", "b"]) == "AB"
+
+    assert len(reports) == 1
+    report = reports[0]
+    assert report.template_name == "index"
+    assert report.sampled is True
+    assert report.duration > report.threshold
+    assert [r.label for r in report.partials] == ["partial:product"]
+    assert [(r.label, r.iterations) for r in report.loops] == [
+        ("index:1 for", 2),
+        # Two loops of one iteration each, thanks to `break`.
+        ("index:1 for", 2),
+    ]
+    assert report.nodes
+    assert all(r.kind == "node" for r in report.nodes)
+    assert report.stack[0] == "index:1 for"
+
+    # The profiler is removed from the context after rendering.
+    assert RenderContext(template).profiler is None
+
+
+def test_slow_render_top_nodes() -> None:
+    reports: list[SlowRender] = []
+    env = _slow_env(reports)
+    env.slow_render_top_nodes = 1
+    env.from_string("{{ 'a' }}{{ 'b' }}").render()
+    assert len(reports[0].nodes) == 1
+
+
+def test_unsampled_slow_render() -> None:
+    reports: list[SlowRender] = []
+    env = _slow_env(reports, sample_rate=0.0)
+    env.from_string("{% for x in (1..3) %}{{ x }}{% endfor %}").render()
+    assert len(reports) == 1
+    assert reports[0].sampled is False
+    assert reports[0].nodes == []
+    assert reports[0].loops == []
+
+
+def test_fast_renders_are_not_reported() -> None:
+    reports: list[SlowRender] = []
+    env = _slow_env(reports)
+    env.slow_render_threshold = 60
+    env.from_string("{{ 'a' }}").render()
+    assert reports == []
+
+
+def test_slow_render_async() -> None:
+    reports: list[SlowRender] = []
+    env = _slow_env(reports)
+    template = env.from_string("{% render 'header' %}", name="index")
+
+    async def coro() -> str:
+        return await template.render_async()
+
+    assert asyncio.run(coro()) == "hi"
+    assert [r.label for r in reports[0].partials] == ["partial:header"]
+    assert reports[0].stack[0] == "index:1 render"
+
+
+REPORTS: list[SlowRender] = []
+
+
+def log_slow_render(report: SlowRender) -> None:
+    REPORTS.append(report)
+
+
+def test_slow_render_callback_as_a_class_attribute() -> None:
+    class MockEnvironment(Environment):
+        slow_render_threshold = 0.0
+        slow_render_callback = log_slow_render
+
+    REPORTS.clear()
+    env = MockEnvironment()
+    assert env.from_string("{{ 'a' }}", name="a").render() == "a"
+    assert [r.template_name for r in REPORTS] == ["a"]
+
+
+def test_slow_render_callback_errors_are_logged(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    def callback(_: SlowRender) -> None:
+        raise RuntimeError("oops")
+
+    env = Environment()
+    env.slow_render_threshold = 0.0
+    env.slow_render_callback = callback
+
+    with caplog.at_level(logging.ERROR, logger="liquid2.profiler"):
+        assert env.from_string("{{ 'a' }}", name="a").render() == "a"
+
+    assert "slow render callback failed for 'a'" in caplog.text
+    assert "RuntimeError: oops" in caplog.text
+
+
+def test_loop_iterations_are_profiled() -> None:
+    profiler = RenderProfiler(clock=MockClock())
+    env = _env(profiler)
+    template = env.from_string(
+        "{% for x in (1..3) %}{% for y in (1..2) %}{% endfor %}{% endfor %}",
+        name="index",
+    )
+    template.render()
+    loops = {r.span: r.iterations for r in profiler.records if r.iterations}
+    assert sorted(loops.values()) == [3, 6]
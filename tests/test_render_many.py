@@ -0,0 +1,82 @@
+import pickle
+
+import pytest
+
+from liquid2 import CachingDictLoader
+from liquid2 import Environment
+from liquid2.exceptions import LiquidTypeError
+from liquid2.exceptions import TemplateNotFoundError
+
+
+def _env() -> Environment:
+    return Environment(
+        loader=CachingDictLoader(
+            {
+                "main": "Hello, {{ you }}!{% render 'footer' %}",
+                "footer": " Bye.",
+                "broken": "{{ 12 | divided_by: you }}",
+            }
+        )
+    )
+
+
+def test_render_many_in_process() -> None:
+    env = _env()
+    data = [{"you": "World"}, {"you": "Liquid"}]
+    results = list(env.render_many("main", data, workers=1))
+    assert [r.position for r in results] == [0, 1]
+    assert [r.output for r in results] == [
+        "Hello, World! Bye.",
+        "Hello, Liquid! Bye.",
+    ]
+    assert all(r.error is None for r in results)
+
+
+def test_render_many_with_worker_processes() -> None:
+    env = _env()
+    data = ({"you": str(i)} for i in range(50))
+    results = list(env.render_many("main", data, workers=2, chunksize=3))
+    assert [r.position for r in results] == list(range(50))
+    assert [r.output for r in results] == [f"Hello, {i}! Bye." for i in range(50)]
+
+
+def test_render_many_unordered() -> None:
+    env = _env()
+    data = [{"you": str(i)} for i in range(20)]
+    results = list(env.render_many("main", data, workers=2, ordered=False))
+    assert sorted(r.position for r in results) == list(range(20))
+    assert all(r.output == f"Hello, {r.position}! Bye." for r in results)
+
+
+def test_render_many_reports_errors_per_item() -> None:
+    env = _env()
+    data = [{"you": 2}, {"you": 0}, {"you": 3}]
+    results = list(env.render_many("broken", data, workers=2))
+    assert [r.output for r in results] == ["6", None, "4"]
+    assert results[0].error is None
+    assert isinstance(results[1].error, LiquidTypeError)
+    assert results[1].error.template_name == "broken"
+    assert results[2].error is None
+
+
+def test_render_many_template_not_found() -> None:
+    env = _env()
+    with pytest.raises(TemplateNotFoundError):
+        env.render_many("nosuchthing", [])
+
+
+def test_render_many_invalid_chunksize() -> None:
+    env = _env()
+    with pytest.raises(ValueError, match="chunksize"):
+        list(env.render_many("main", [{}], chunksize=0))
+
+
+def test_liquid_errors_can_be_unpickled() -> None:
+    env = _env()
+    with pytest.raises(LiquidTypeError) as exc_info:
+        env.get_template("broken").render(you=0)
+
+    err = pickle.loads(pickle.dumps(exc_info.value))  # noqa: S301
+    assert isinstance(err, LiquidTypeError)
+    assert str(err) == str(exc_info.value)
+    assert err.template_name == "broken"
@@ -1,9 +1,11 @@
 import platform
+from io import StringIO
 
 import pytest
 
 from liquid2 import DictLoader
 from liquid2 import Environment
+from liquid2 import RenderContext
 from liquid2.exceptions import ContextDepthError
 from liquid2.exceptions import LocalNamespaceLimitError
 from liquid2.exceptions import LoopIterationLimitError
@@ -266,6 +268,26 @@ def test_copied_context_carries_parent_length() -> None:
         template.render()
 
 
+def test_copied_context_skips_carries_without_limits() -> None:
+    class MockContext(RenderContext):
+        def get_size_of_locals(self) -> int:
+            raise AssertionError("unexpected local namespace size")
+
+    env = Environment(loader=DictLoader({"foo": "{{ x }}"}))
+    template = env.from_string(
+        "{% assign x = 1 %}{% for i in (1..2) %}{% render 'foo', x: i %}{% endfor %}"
+    )
+
+    context = MockContext(template)
+    child = context.copy(template.nodes[0].token, namespace={})
+    assert child.loop_iteration_carry == 1
+    assert child.local_namespace_carry == 0
+
+    buf = StringIO()
+    template.render_with_context(context, buf)
+    assert buf.getvalue() == "12"
+
+
 def test_sizeof_local_namespace_with_unhashable_values() -> None:
     class MockEnv(Environment):
         local_namespace_limit = 200
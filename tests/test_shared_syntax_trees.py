@@ -0,0 +1,110 @@
+import gc
+import pickle
+
+from liquid2 import CachingDictLoader
+from liquid2 import Environment
+from liquid2 import WhitespaceControl
+
+
+class MockEnvironment(Environment):
+    share_syntax_trees = True
+
+
+TEMPLATES = {
+    "index.liquid": "{% render 'snippet.liquid' %}",
+    "snippet.liquid": "Hello, {{ you }}!",
+}
+
+
+def test_syntax_trees_are_not_shared_by_default() -> None:
+    env = Environment()
+    assert env.syntax_trees is None
+    a = env.from_string("Hello, {{ you }}!", name="a")
+    b = env.from_string("Hello, {{ you }}!", name="b")
+    assert a.nodes is not b.nodes
+
+
+def test_share_syntax_trees_between_names_and_paths() -> None:
+    env = MockEnvironment()
+    source = "Hello, {{ you }}!"
+    a = env.from_string(source, name="a", globals={"you": "World"})
+    b = env.from_string(source, name="b", path="themes/b", overlay_data={"you": "x"})
+    assert a.nodes is b.nodes
+    assert (a.name, b.name, b.path) == ("a", "b", "themes/b")
+    assert a.render() == "Hello, World!"
+    assert b.render() == "Hello, x!"
+    assert env.syntax_trees is not None
+    assert env.syntax_trees.hits == 1
+    assert env.syntax_trees.misses == 1
+
+
+def test_parser_settings_are_part_of_the_key() -> None:
+    env = MockEnvironment()
+    a = env.from_string("{{ x }}\n")
+    env.default_trim = WhitespaceControl.MINUS
+    b = env.from_string("{{ x }}\n")
+    assert a.nodes is not b.nodes
+    assert b.render(x=1) == "1"
+
+
+def test_share_syntax_trees_between_loader_namespaces() -> None:
+    loader = CachingDictLoader(TEMPLATES, namespace_key="uid")
+    env = MockEnvironment(loader=loader)
+
+    templates = [env.get_template("index.liquid", uid=uid) for uid in range(5)]
+
+    assert len(loader.cache) == 5  # noqa: PLR2004
+    assert all(t.nodes is templates[0].nodes for t in templates)
+    assert templates[3].render(you="World") == "Hello, World!"
+    assert env.syntax_trees is not None
+    assert len(env.syntax_trees) == 2  # noqa: PLR2004
+
+
+def test_syntax_trees_are_discarded_when_no_template_uses_them() -> None:
+    loader = CachingDictLoader(TEMPLATES, namespace_key="uid", capacity=2)
+    env = MockEnvironment(loader=loader)
+    store = env.syntax_trees
+    assert store is not None
+
+    env.get_template("snippet.liquid", uid="a")
+    env.get_template("snippet.liquid", uid="b")
+    assert len(store) == 1
+
+    # Evicting one of two templates using a tree keeps the tree.
+    env.get_template("index.liquid", uid="a")
+    gc.collect()
+    assert len(store) == 2  # noqa: PLR2004
+
+    # Evicting the last template using a tree discards it.
+    env.get_template("index.liquid", uid="b")
+    gc.collect()
+    assert len(store) == 1
+    assert len(loader.cache) == 2  # noqa: PLR2004
+
+
+def test_share_syntax_trees_with_the_parse_cache() -> None:
+    class ParseCacheEnvironment(MockEnvironment):
+        parse_cache_size = 10
+
+    env = ParseCacheEnvironment()
+    a = env.from_string("{{ x }}", name="a")
+    b = env.from_string("{{ x }}", name="b")
+    assert a.nodes is b.nodes
+
+
+def test_clear_syntax_trees() -> None:
+    env = MockEnvironment()
+    a = env.from_string("{{ x }}")
+    assert env.syntax_trees is not None
+    env.syntax_trees.clear()
+    assert env.from_string("{{ x }}").nodes is not a.nodes
+
+
+def test_pickle_templates_with_shared_syntax_trees() -> None:
+    env = MockEnvironment()
+    template = env.from_string("Hello, {{ you }}!")
+    unpickled_env, unpickled = pickle.loads(pickle.dumps((env, template)))  # noqa: S301
+    assert unpickled.render(you="World") == "Hello, World!"
+    assert unpickled_env.syntax_trees is not None
+    assert len(unpickled_env.syntax_trees) == 0
+    assert unpickled_env.from_string("{{ x }}").render(x=1) == "1"
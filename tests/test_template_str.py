@@ -1,6 +1,7 @@
 """Test that templates can be serialized back to a string."""
 
 from liquid2 import parse
+from liquid2.builtin.content import ContentNode
 
 
 def test_content_str() -> None:
@@ -8,6 +9,15 @@ def test_content_str() -> None:
     assert str(template) == "Hello\n"
 
 
+def test_trimmed_content_str() -> None:
+    template = parse("{{ a -}}\n  Hello\n {%~ if b %}{% endif %}")
+    content = template.nodes[1]
+    assert isinstance(content, ContentNode)
+    assert content.trimmed == "Hello\n "
+    assert template.render(a="", b=False) == "Hello\n "
+    assert str(template) == "{{ a -}}\n  Hello\n {%~ if b %}{% endif %}"
+
+
 def test_comment_str() -> None:
     template = parse("{# this is a comment #}")
     assert str(template) == "{# this is a comment #}"
@@ -8,9 +8,14 @@ from dataclasses import field
 import pytest
 
 from liquid2 import Environment
+from liquid2 import RenderContext
 from liquid2 import StrictUndefined
+from liquid2 import Undefined
 from liquid2 import parse
+from liquid2.builtin import FilteredExpression
+from liquid2.builtin.output import OutputNode
 from liquid2.exceptions import UndefinedError
+from liquid2.undefined import DebugUndefined
 
 
 @dataclass(kw_only=True)
@@ -269,3 +274,51 @@ def test_strict_undefined_magic() -> None:
 
     with pytest.raises(UndefinedError):
         reversed(undefined)  # type: ignore
+
+
+def test_lazy_undefined_hint() -> None:
+    calls: list[int] = []
+
+    def hint() -> str:
+        calls.append(1)
+        return "foo is undefined"
+
+    undefined = StrictUndefined("foo", token=None, hint=hint)
+    assert undefined.hint == "foo is undefined"
+    assert undefined.hint == "foo is undefined"
+    assert calls == [1]
+
+    with pytest.raises(UndefinedError, match="foo is undefined"):
+        str(undefined)
+
+
+def test_undefined_hint_is_formatted_on_access() -> None:
+    env = Environment()
+    template = env.from_string("{{ a.b.c }}")
+    context = RenderContext(template, global_data={"a": {"b": {}}})
+    undefined = context.get(["a", "b", "c"], token=None)
+    assert isinstance(undefined, Undefined)
+    assert not isinstance(undefined._hint, str)  # noqa: SLF001
+    assert undefined.hint == "a.b.c is undefined"
+
+
+def test_default_undefined_is_shared_per_path() -> None:
+    env = Environment()
+    template = env.from_string("{{ a.b }}{{ a.b }}")
+    first, second = template.nodes
+    assert isinstance(first, OutputNode)
+    assert isinstance(second, OutputNode)
+    assert isinstance(first.expression, FilteredExpression)
+    assert isinstance(second.expression, FilteredExpression)
+
+    context = RenderContext(template)
+    assert first.expression.evaluate(context) is first.expression.evaluate(context)
+    assert first.expression.evaluate(context) is not second.expression.evaluate(context)
+
+
+def test_debug_undefined_hints_from_the_same_path() -> None:
+    env = Environment(undefined=DebugUndefined)
+    template = env.from_string("{% for x in y %}{{ x.a.b }},{% endfor %}")
+    assert template.render(y=[{}, {"a": {}}]) == (
+        "undefined: x.a is undefined,undefined: x.a.b is undefined,"
+    )
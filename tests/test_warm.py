@@ -0,0 +1,190 @@
+from pathlib import Path
+
+import pytest
+
+from liquid2 import CachingDictLoader
+from liquid2 import CachingFileSystemLoader
+from liquid2 import ChoiceLoader
+from liquid2 import DictLoader
+from liquid2 import Environment
+from liquid2 import FileSystemLoader
+from liquid2 import PackageLoader
+from liquid2.__main__ import main
+from liquid2.builtin.output import OutputNode
+from liquid2.exceptions import LiquidSyntaxError
+from liquid2.exceptions import TemplateNotFoundError
+from liquid2.loader import BaseLoader
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+TEMPLATES = {
+    "index.liquid": "Hello, {{ you }}!{% render 'footer.liquid' %}",
+    "footer.liquid": " Bye.",
+    "sections/a.liquid": "{% if x %}a{% endif %}",
+    "sections/b.liquid": "{{ 'b' | upcase }}",
+    "broken.liquid": "{% if x %}oops",
+}
+
+
+def test_list_dict_loader_templates() -> None:
+    loader = DictLoader({"b": "", "a": ""})
+    assert loader.list_templates() == ["a", "b"]
+
+
+def test_list_file_system_loader_templates() -> None:
+    loader = FileSystemLoader(FIXTURES / "001")
+    assert loader.list_templates() == [
+        "footer.html",
+        "header.html",
+        "main.html",
+        "snippets/featured_content.html",
+    ]
+
+    loader = FileSystemLoader(FIXTURES / "mock_package", ext=".liquid")
+    assert loader.list_templates() == [
+        "other.liquid",
+        "templates/more_templates/thing.liquid",
+        "templates/some.liquid",
+    ]
+
+
+def test_list_package_loader_templates(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.syspath_prepend(str(FIXTURES))
+    loader = PackageLoader("mock_package", package_path="templates")
+    assert loader.list_templates() == ["more_templates/thing.liquid", "some.liquid"]
+
+
+def test_list_choice_loader_templates() -> None:
+    loader = ChoiceLoader(
+        [DictLoader({"main.html": "", "a": ""}), FileSystemLoader(FIXTURES / "001")]
+    )
+    assert loader.list_templates() == [
+        "a",
+        "footer.html",
+        "header.html",
+        "main.html",
+        "snippets/featured_content.html",
+    ]
+
+
+def test_loaders_that_can_not_list_templates() -> None:
+    class MockLoader(BaseLoader):
+        def get_source(self, env, template_name, **kwargs):  # type: ignore # noqa: ANN001, ANN003, ANN202, ARG002
+            raise TemplateNotFoundError(template_name)
+
+    env = Environment(loader=MockLoader())
+
+    with pytest.raises(NotImplementedError):
+        env.warm()
+
+    assert env.warm([], workers=1) == {}
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_warm_caching_loader(workers: int) -> None:
+    loader = CachingDictLoader(TEMPLATES)
+    env = Environment(loader=loader)
+    errors = env.warm(workers=workers)
+
+    assert list(errors) == ["broken.liquid"]
+    assert isinstance(errors["broken.liquid"], LiquidSyntaxError)
+
+    stats = loader.cache_stats()
+    assert stats.misses == 4  # noqa: PLR2004
+    assert stats.size == 4  # noqa: PLR2004
+
+    template = env.get_template("index.liquid")
+    assert template.render(you="World") == "Hello, World! Bye."
+    assert loader.cache_stats().hits == 2  # noqa: PLR2004
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_warm_with_glob_pattern(workers: int) -> None:
+    loader = CachingFileSystemLoader(FIXTURES / "001")
+    env = Environment(loader=loader)
+    assert env.warm("*.html", workers=workers) == {}
+    assert loader.cache_stats().size == 4  # noqa: PLR2004
+
+    loader = CachingDictLoader(TEMPLATES)
+    env = Environment(loader=loader)
+    assert env.warm("sections/*", workers=workers) == {}
+    assert loader.cache_stats().size == 2  # noqa: PLR2004
+
+    # Cached templates are checked for changes as usual.
+    template = env.get_template("sections/a.liquid")
+    assert template.is_up_to_date()
+
+
+def test_warm_compact_ast() -> None:
+    loader = CachingDictLoader(TEMPLATES)
+    env = Environment(loader=loader)
+    env.compact_ast = True
+    env.warm(["index.liquid", "sections/b.liquid"], workers=2)
+    template = env.get_template("sections/b.liquid")
+    output = template.nodes[0]
+    assert isinstance(output, OutputNode)
+    assert not output.token.expression
+    assert template.render() == "B"
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_warm_namespaced_caching_loader(workers: int) -> None:
+    loader = CachingDictLoader(TEMPLATES, namespace_key="uid")
+    env = Environment(loader=loader)
+    assert env.warm("sections/*", workers=workers, uid="t1") == {}
+    assert sorted(loader.cache.keys()) == [
+        "t1/sections/a.liquid",
+        "t1/sections/b.liquid",
+    ]
+
+    env.get_template("sections/b.liquid", uid="t1")
+    stats = loader.cache_stats()
+    assert (stats.hits, stats.misses) == (1, 2)
+
+
+class SharingEnvironment(Environment):
+    share_syntax_trees = True
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_warm_shares_syntax_trees(workers: int) -> None:
+    source = "Hello, {{ you }}!"
+    loader = CachingDictLoader({"a.liquid": source, "b.liquid": source})
+    env = SharingEnvironment(loader=loader)
+    assert env.warm(workers=workers) == {}
+
+    a = env.get_template("a.liquid")
+    b = env.get_template("b.liquid")
+    assert a.nodes is b.nodes
+    assert env.syntax_trees is not None
+    assert len(env.syntax_trees) == 1
+    assert env.from_string(source).nodes is a.nodes
+    assert b.render(you="World") == "Hello, World!"
+
+
+def test_warm_without_a_cache() -> None:
+    env = Environment(loader=DictLoader(TEMPLATES))
+    errors = env.warm(["index.liquid", "broken.liquid", "nosuchthing"], workers=2)
+    assert sorted(errors) == ["broken.liquid", "nosuchthing"]
+    assert isinstance(errors["nosuchthing"], TemplateNotFoundError)
+
+
+def test_precompile_command(capsys: pytest.CaptureFixture[str]) -> None:
+    path = str(FIXTURES / "001")
+    assert main(["precompile", path, "--pattern", "*.html", "--workers", "1"]) == 0
+    assert capsys.readouterr().out.startswith("parsed 4 templates with 0 errors")
+
+    path = str(FIXTURES / "mock_package")
+    assert main(["precompile", path, "--workers", "2"]) == 0
+    assert capsys.readouterr().out.startswith("parsed 3 templates with 0 errors")
+
+
+def test_precompile_command_with_errors(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    (tmp_path / "ok.liquid").write_text("{{ x }}")
+    (tmp_path / "broken.liquid").write_text("{% if x %}oops")
+    assert main(["precompile", str(tmp_path), "--workers", "1"]) == 1
+    out, err = capsys.readouterr()
+    assert out.startswith("parsed 2 templates with 1 error ")
+    assert err.startswith("broken.liquid: ")